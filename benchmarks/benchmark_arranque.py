@@ -0,0 +1,115 @@
+"""
+Benchmark de arranque del scoring
+1. Desglose de `python -X importtime` de prediccion_diaria.py y del modelo
+2. Tiempo hasta la primera predicción en un proceso nuevo, con una espera
+   que simula el query: pickle del XGBClassifier vs bundle nativo (carga
+   directa y en segundo plano)
+
+Uso:
+    python benchmarks/benchmark_arranque.py --repeticiones 5 --espera 1.0
+"""
+
+import sys
+import os
+import json
+import argparse
+import statistics
+import subprocess
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+CARGAS = {
+    'pickle XGBClassifier': (
+        "import pickle\n"
+        "from artefacto_modelo import MODEL_PATH, COLUMNS_PATH\n"
+        "modelo = pickle.load(open(MODEL_PATH, 'rb'))\n"
+        "columnas = pickle.load(open(COLUMNS_PATH, 'rb'))\n"
+    ),
+    'bundle (carga directa)': (
+        "from artefacto_modelo import cargar_modelo_scoring\n"
+        "modelo, columnas = cargar_modelo_scoring(diferido=False)\n"
+    ),
+    'bundle (segundo plano)': (
+        "from artefacto_modelo import cargar_modelo_scoring\n"
+        "modelo, columnas = cargar_modelo_scoring()\n"
+    ),
+}
+
+PLANTILLA = """
+import sys, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, {scripts!r})
+import warnings
+warnings.filterwarnings('ignore')
+import prediccion_diaria
+{carga}
+t1 = time.perf_counter()
+time.sleep({espera})
+import pandas as pd
+modelo.predict_proba(pd.DataFrame([[0.0] * len(columnas)], columns=columnas))
+t2 = time.perf_counter()
+print(json.dumps({{'listo': t1 - t0, 'primera_prediccion': t2 - t0}}))
+"""
+
+
+def desglose_importtime(modulo, top=10):
+    """
+    Imports directos más costosos de `modulo` según `-X importtime`
+
+    importtime escribe cada módulo después de sus dependencias, con un
+    espacio de sangría en el primer nivel y dos más por cada nivel.
+
+    Returns:
+    --------
+    tuple
+        (ms acumulados de `modulo`, lista [(ms, nombre)] de sus imports directos)
+    """
+    salida = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'], cwd=SCRIPTS_DIR,
+                            capture_output=True, text=True).stderr
+    hijos = []
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        sangria = len(nombre) - len(nombre.lstrip())
+        if sangria == 3:
+            hijos.append((int(acumulado) / 1000, nombre.strip()))
+        elif sangria == 1:
+            if nombre.strip() == modulo:
+                return int(acumulado) / 1000, sorted(hijos, reverse=True)[:top]
+            hijos = []
+    return 0.0, []
+
+
+def medir(carga, espera):
+    codigo = PLANTILLA.format(scripts=SCRIPTS_DIR, carga=carga, espera=espera)
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de arranque del scoring')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--espera', type=float, default=1.0, help='Segundos que simulan el query')
+    args = parser.parse_args()
+
+    for modulo in ['prediccion_diaria', 'xgboost']:
+        total, hijos = desglose_importtime(modulo)
+        print(f"\n📦 -X importtime: import {modulo} ({total:,.1f} ms)")
+        for ms, nombre in hijos:
+            print(f"   {ms:>9.1f} ms  {nombre}")
+
+    print("\n" + "="*70)
+    print(f"{'Carga':<26}{'listo (s)':>14}{'1a predicción (s)':>22}")
+    print(f"{'':<26}{'':>14}{f'(query simulado {args.espera:.1f} s)':>28}")
+    print("="*70)
+    for nombre, carga in CARGAS.items():
+        medidas = [medir(carga, args.espera) for _ in range(args.repeticiones)]
+        listo = statistics.median(m['listo'] for m in medidas)
+        primera = statistics.median(m['primera_prediccion'] for m in medidas)
+        print(f"{nombre:<26}{listo:>14.3f}{primera:>22.3f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark del backfill en varios procesos
+Genera un trimestre de asignaciones sintéticas (benchmarks/datos_sinteticos.py)
+en un Parquet ordenado por fecha y lo re-puntúa con backfill_scoring.py con
+1, 2, 4... procesos (hasta las CPUs de la máquina). Reporta tiempo, speedup y
+eficiencia por número de procesos y verifica que el dataset Parquet de cada
+corrida tenga exactamente las probabilidades y scores de puntuar todo el
+trimestre de una vez en un proceso
+
+Uso:
+    python benchmarks/benchmark_backfill.py --filas-mes 500000
+    python benchmarks/benchmark_backfill.py --filas-mes 1000000 --procesos 1 4 8
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from esquema import columnas_requeridas
+from artefacto_modelo import cargar_modelo_scoring
+from inferencia import InferenciaTabla
+from pipeline_features import crear_pipeline
+from prediccion_diaria import preprocesar_datos, generar_predicciones
+from analisis_parquet import leer_consolidado
+from backfill_scoring import particiones_fecha, ejecutar_backfill
+from datos_sinteticos import generar_asignaciones_coalesce
+
+# Un trimestre: cada fecha de ejecución genera su mes hasta el día anterior
+FECHAS_EJECUCION = ['2026-01-31', '2026-02-28', '2026-03-31']
+COLUMNAS_ORDEN = ['fecha_asignacion', 'codigo_unico_vacante', 'probabilidad_conversion']
+
+
+def generar_trimestre(filas_mes, semilla, ruta):
+    partes = [generar_asignaciones_coalesce(filas_mes, semilla + i, fecha)[columnas_requeridas()]
+              for i, fecha in enumerate(FECHAS_EJECUCION)]
+    df = pd.concat(partes, ignore_index=True).sort_values('fecha_asignacion', kind='stable', ignore_index=True)
+    # Row groups chicos: cada partición lee solo los de su rango de fechas
+    df.to_parquet(ruta, index=False, row_group_size=100_000)
+    return df
+
+
+def ordenar(df):
+    return df.sort_values(COLUMNAS_ORDEN, kind='stable', ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del backfill en varios procesos')
+    parser.add_argument('--filas-mes', type=int, default=300_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--dias-particion', type=int, default=7)
+    parser.add_argument('--procesos', type=int, nargs='+', default=None,
+                        help='Números de procesos a medir (por defecto 1, 2, 4... hasta las CPUs)')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    procesos = args.procesos or sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i <= cpus], cpus})
+    modelo, columnas_modelo = cargar_modelo_scoring(diferido=False)
+    if modelo is None:
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, 'trimestre.parquet')
+        print(f"\n📦 Generando {3 * args.filas_mes:,} asignaciones sintéticas (un trimestre)...")
+        df = generar_trimestre(args.filas_mes, args.semilla, entrada)
+
+        # Referencia: todo el trimestre de una vez, en este proceso
+        referencia = generar_predicciones(preprocesar_datos(df, crear_pipeline(), verbose=False),
+                                          InferenciaTabla(modelo, columnas_modelo), columnas_modelo, verbose=False)
+        referencia = ordenar(referencia[COLUMNAS_ORDEN + ['score_priorizacion']])
+        del df
+
+        particiones = particiones_fecha('2026-01-01', '2026-04-01', args.dias_particion)
+        tiempos = {}
+        identicos = True
+        for n in procesos:
+            ruta = os.path.join(directorio, f'backfill_{n}')
+            inicio = time.perf_counter()
+            resumen = ejecutar_backfill(particiones, modelo, columnas_modelo, entrada=entrada, max_workers=n,
+                                        ruta_parquet=ruta, fecha='2026-04-01')
+            tiempos[n] = time.perf_counter() - inicio
+
+            resultado = ordenar(leer_consolidado(ruta=ruta, columnas=COLUMNAS_ORDEN + ['score_priorizacion']))
+            mismo = (not resumen['errores'] and len(resultado) == len(referencia)
+                     and np.array_equal(resultado['probabilidad_conversion'].to_numpy(),
+                                        referencia['probabilidad_conversion'].to_numpy())
+                     and resultado['score_priorizacion'].astype(str).equals(
+                         referencia['score_priorizacion'].astype(str)))
+            identicos &= mismo
+            print(f"{'✅' if mismo else '❌'} {n} procesos: {resumen['filas']:,} filas idénticas a la referencia"
+                  if mismo else f"❌ {n} procesos: el resultado no coincide con la referencia")
+
+    print("\n" + "="*60)
+    print(f"{len(referencia):,} asignaciones, {len(particiones)} particiones, {cpus} CPUs")
+    print("="*60)
+    print(f"{'Procesos':<10}{'s':>10}{'filas/s':>14}{'speedup':>10}{'eficiencia':>12}")
+    base = procesos[0]
+    for n in procesos:
+        # Speedup contra el menor número de procesos medido; eficiencia = speedup / (n / base)
+        speedup = tiempos[base] / tiempos[n]
+        print(f"{n:<10}{tiempos[n]:>10.2f}{len(referencia) / tiempos[n]:>14,.0f}{speedup:>9.2f}x"
+              f"{speedup * base / n:>11.0%}")
+    if max(procesos) > cpus:
+        print(f"⚠️ Más procesos que CPUs ({cpus}): el speedup no puede crecer más allá de {cpus}x")
+    print()
+    if not identicos:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark de la búsqueda de hiperparámetros
+Sobre una tabla de entrenamiento sintética compara:
+- Pruebas de CV reconstruyendo la matriz de XGBoost en cada prueba (como un
+  GridSearchCV sobre XGBClassifier) contra los QuantileDMatrix por pliegue
+  armados una vez (scripts/busqueda_hiperparametros.py)
+- Successive halving completo con y sin presupuesto de tiempo
+
+Uso:
+    python benchmarks/benchmark_busqueda.py --filas 200000 --configuraciones 9
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+import busqueda_hiperparametros as bh
+from entrenamiento import construir_matriz, columnas_auxiliares, split_ventana, guardar_matriz, cargar_x
+from benchmark_entrenamiento import generar_tabla
+
+
+def cv_reconstruyendo(archivo, configuraciones, max_arboles, n_pliegues):
+    """Cada prueba arma de nuevo los DMatrix de cada pliegue"""
+    import xgboost as xgb
+    from sklearn.model_selection import StratifiedKFold
+
+    train, _ = split_ventana(archivo)
+    X = cargar_x(archivo)[train]
+    with np.load(archivo) as datos:
+        y = datos['y'][train]
+    aucs = []
+    for parametros in configuraciones:
+        por_pliegue = []
+        for idx_train, idx_valid in StratifiedKFold(n_splits=n_pliegues, shuffle=True, random_state=42).split(X, y):
+            d_train = xgb.DMatrix(X[idx_train], y[idx_train])
+            d_valid = xgb.DMatrix(X[idx_valid], y[idx_valid])
+            booster = xgb.train({**bh.PARAMETROS_FIJOS, **parametros}, d_train, num_boost_round=max_arboles,
+                                evals=[(d_valid, 'valid')], early_stopping_rounds=bh.EARLY_STOPPING,
+                                verbose_eval=False)
+            por_pliegue.append(booster.best_score)
+        aucs.append(float(np.mean(por_pliegue)))
+    return aucs
+
+
+def cv_cacheado(archivo, configuraciones, max_arboles, n_pliegues):
+    bh._inicializar_proceso(archivo, n_pliegues, None, os.cpu_count() or 1)
+    return [bh.evaluar_configuracion(i, p, max_arboles)['auc'] for i, p in enumerate(configuraciones)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la búsqueda de hiperparámetros')
+    parser.add_argument('--filas', type=int, default=200_000)
+    parser.add_argument('--configuraciones', type=int, default=9)
+    parser.add_argument('--arboles', type=int, default=100)
+    parser.add_argument('--pliegues', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"\n📦 Generando {args.filas:,} filas sintéticas...")
+    df = generar_tabla(args.filas)
+    X, y, columnas = construir_matriz(df)
+    configuraciones = bh.muestrear_configuraciones(args.configuraciones)
+
+    with tempfile.TemporaryDirectory() as ruta:
+        archivo = os.path.join(ruta, 'matriz.npz')
+        guardar_matriz(archivo, X, y, columnas, columnas_auxiliares(df))
+
+        t0 = time.perf_counter()
+        auc_reconstruyendo = cv_reconstruyendo(archivo, configuraciones, args.arboles, args.pliegues)
+        t_reconstruyendo = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        auc_cacheado = cv_cacheado(archivo, configuraciones, args.arboles, args.pliegues)
+        t_cacheado = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        mejor, pruebas = bh.successive_halving(archivo, configuraciones, arboles_min=args.arboles // 3,
+                                               n_pliegues=args.pliegues)
+        t_halving = time.perf_counter() - t0
+
+        presupuesto = t_halving / 3
+        t0 = time.perf_counter()
+        mejor_acotado, pruebas_acotadas = bh.successive_halving(archivo, configuraciones,
+                                                                arboles_min=args.arboles // 3,
+                                                                n_pliegues=args.pliegues,
+                                                                presupuesto_segundos=presupuesto)
+        t_acotado = time.perf_counter() - t0
+
+    diferencia = max(abs(a - b) for a, b in zip(auc_reconstruyendo, auc_cacheado))
+
+    print("\n" + "="*60)
+    print(f"{args.filas:,} filas x {len(columnas)} columnas, {args.configuraciones} configuraciones, "
+          f"{args.pliegues} pliegues")
+    print("="*60)
+    print(f"{'CV reconstruyendo DMatrix por prueba':<44}{t_reconstruyendo:>10.2f} s")
+    print(f"{'CV con QuantileDMatrix por pliegue (1 vez)':<44}{t_cacheado:>10.2f} s")
+    print(f"{'Successive halving':<44}{t_halving:>10.2f} s  ({len(pruebas)} pruebas, AUC={mejor['auc']:.4f})")
+    print(f"{f'Successive halving (presupuesto {presupuesto:.0f} s)':<44}{t_acotado:>10.2f} s  "
+          f"({len(pruebas_acotadas)} pruebas"
+          + (f", AUC={mejor_acotado['auc']:.4f})" if mejor_acotado else ", sin resultado)"))
+    print(f"\n📏 Máxima diferencia de AUC CV entre ambos caminos: {diferencia:.4f} (discretización de features)")
+    print(f"💻 CPUs disponibles: {os.cpu_count()}\n")
+
+
+if __name__ == "__main__":
+    main()
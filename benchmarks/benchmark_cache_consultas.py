@@ -0,0 +1,65 @@
+"""
+Benchmark de la caché de queries
+Carga asignaciones sintéticas en una BD SQLite en memoria (como sustituto de
+MySQL, sin la latencia de red) y compara query_to_dataframe contra la BD y
+leyendo de la caché local, verificando que el DataFrame sea el mismo
+
+Uso:
+    python benchmarks/benchmark_cache_consultas.py --filas 200000
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+from sqlalchemy import create_engine
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+import database
+from cache_consultas import CacheConsultas
+from benchmark_categorizacion import generar_datos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la caché de queries')
+    parser.add_argument('--filas', type=int, default=200_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    generar_datos(args.filas, args.semilla).to_sql('asignaciones', engine, index=False, chunksize=50_000)
+    query = "SELECT * FROM asignaciones"
+
+    with tempfile.TemporaryDirectory() as ruta:
+        database._cache_consultas = CacheConsultas(ttl=3600, ruta=ruta)
+
+        t0 = time.perf_counter()
+        df_bd = database.query_to_dataframe(query, engine, cache=False)
+        t_bd = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        database.query_to_dataframe(query, engine, cache='refrescar')
+        t_guardar = time.perf_counter() - t0 - t_bd
+
+        t0 = time.perf_counter()
+        df_cache = database.query_to_dataframe(query, engine, cache=True)
+        t_cache = time.perf_counter() - t0
+        tamano = sum(os.path.getsize(os.path.join(ruta, f)) for f in os.listdir(ruta))
+
+    print("\n" + "="*60)
+    print(f"{args.filas:,} filas, {df_bd.shape[1]} columnas")
+    print("="*60)
+    print(f"{'Query a la BD (SQLite local)':<40}{t_bd:>10.3f} s")
+    print(f"{'Guardar en caché (aprox.)':<40}{max(t_guardar, 0):>10.3f} s")
+    print(f"{'Lectura desde caché':<40}{t_cache:>10.3f} s")
+    print(f"{'Tamaño en disco':<40}{tamano / 1024 ** 2:>10.1f} MB")
+
+    iguales = df_bd.equals(df_cache)
+    print(f"\n{'✅' if iguales else '❌'} Mismo DataFrame que la BD\n")
+    if not iguales:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark de categorización
+Compara el camino fila a fila (Series.apply evaluando regla por regla) contra
+el motor vectorizado de scripts/categorizacion.py sobre datos sintéticos y
+verifica que las etiquetas sean idénticas
+
+Uso:
+    python benchmarks/benchmark_categorizacion.py --filas 1000000
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from categorizacion import cargar_reglas
+
+
+# =====================================================
+# DATOS SINTÉTICOS
+# =====================================================
+
+CARGOS = ['Auxiliar de bodega', 'Auxiliar administrativo', 'Operario de producción', 'Asesor comercial',
+          'Agente call center', 'Vigilante', 'Auxiliar de servicios generales', 'Cocinero', 'Conductor',
+          'Técnico electricista', 'Enfermera jefe', 'Cajero', 'Digitador', 'Auxiliar de archivo',
+          'Mesero', 'Domiciliario', 'Analista', 'Auxiliar logistica', 'Guarda de seguridad']
+EMPRESAS = ['CASALIMPIA S.A.', 'SECURITAS COLOMBIA', 'MANPOWER DE COLOMBIA', 'TIENDAS D1', 'ATENTO COLOMBIA',
+            'HERMECO S.A.', 'LADRILLERA SANTAFE', 'FRISBY S.A.', 'CONSORCIO EXPRESS', 'KERALTY',
+            'RECAUDO BOGOTA', 'CONSTRUCTORA BOLIVAR', 'THOMAS GREG & SONS', 'CALZATODO', 'COLSUBSIDIO',
+            'AGROPECUARIA LA PRADERA', 'MANEJO TECNICO DE INFORMACION', 'PRODUCTIVIDAD EMPRESARIAL SAS',
+            'INVERSIONES ABC', 'GRUPO EMPRESARIAL XYZ']
+REQUISITOS = ['Bachiller', 'Técnico en vigilancia', 'Profesional en enfermería', 'Tecnologo', 'Primaria',
+              'No aplica', 'Curso de manipulación de alimentos', 'Ingeniero industrial', '-', '', 'Noveno grado']
+HORAS = ['08:00 AM', '2:00 PM', '10:00', '03:30', '08:00 - 10:00', '-', '', 'Por confirmar', '7 am', '14:00']
+DOCUMENTOS = ['Hoja de vida', 'Cédula', 'Antecedentes y libreta militar', 'Certificado de pensión',
+              'Documento de identidad', '-', '', 'Ninguno', 'Hoja de vida, cédula, certificados']
+
+
+def generar_datos(filas, semilla=42):
+    """
+    Generar un DataFrame sintético con la forma de las columnas de texto
+
+    Cada valor base se combina con un sufijo aleatorio para obtener algunos
+    miles de valores distintos, parecido a lo que llega en un mes real.
+    """
+    rng = np.random.default_rng(semilla)
+
+    def columna(valores, variantes, prob_nulo):
+        base = rng.choice(np.array(valores, dtype=object), size=filas)
+        sufijo = rng.integers(0, variantes, size=filas)
+        serie = pd.Series([f'{b} {s}' if s else b for b, s in zip(base, sufijo)], dtype=object)
+        serie[rng.random(filas) < prob_nulo] = None
+        return serie
+
+    return pd.DataFrame({
+        'cargo': columna(CARGOS, 150, 0.02),
+        'empresa': columna(EMPRESAS, 250, 0.01),
+        'requisito_profesional': columna(REQUISITOS, 20, 0.05),
+        'hora_entrevista': columna(HORAS, 1, 0.10),
+        'documentacion_requerida': columna(DOCUMENTOS, 10, 0.05),
+    })
+
+
+# =====================================================
+# BENCHMARK
+# =====================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de categorización')
+    parser.add_argument('--filas', type=int, default=1_000_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"\n📦 Generando {args.filas:,} filas sintéticas...")
+    df = generar_datos(args.filas, args.semilla)
+
+    print("\n" + "="*70)
+    print(f"{'Columna':<26}{'Únicos':>8}{'apply (s)':>12}{'vectorizado (s)':>17}{'x':>7}")
+    print("="*70)
+
+    reglas = cargar_reglas()
+    total_fila, total_vector, iguales = 0.0, 0.0, True
+    for feature, categorizador in reglas.categorizadores.items():
+        columna = reglas.columnas[feature]
+        t0 = time.perf_counter()
+        esperado = df[columna].apply(categorizador.categorizar_valor)
+        t_fila = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        obtenido = categorizador.categorizar(df[columna])
+        t_vector = time.perf_counter() - t0
+
+        total_fila += t_fila
+        total_vector += t_vector
+        ok = esperado.equals(obtenido)
+        iguales &= ok
+        print(f"{columna:<26}{df[columna].nunique():>8,}{t_fila:>12.3f}{t_vector:>17.3f}"
+              f"{t_fila / t_vector:>6.1f}x {'✅' if ok else '❌'}")
+
+    print("-"*70)
+    print(f"{'TOTAL':<34}{total_fila:>12.3f}{total_vector:>17.3f}{total_fila / total_vector:>6.1f}x")
+
+    if not iguales:
+        print("\n❌ Las etiquetas no coinciden con el camino fila a fila")
+        sys.exit(1)
+    print("\n✅ Etiquetas idénticas al camino fila a fila\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Benchmark de punta a punta de la predicción diaria
+Corre las etapas de prediccion_diaria.py sobre asignaciones sintéticas
+(benchmarks/datos_sinteticos.py), sin base de datos:
+
+- carga: lectura del resultado del query desde la caché local (Parquet,
+  como en una re-ejecución del día) + compactar_tipos
+- categorizar: pipeline de features (rango, categorías, contacto, temporales)
+- codificar: one-hot a las columnas del modelo
+- predecir: tabla de inferencia (fría en cada repetición) + scores
+- exportar: Excel/CSV de exportar_archivos + histórico Parquet
+
+Guarda la mediana de cada etapa en JSON y, con --comparar, la contrasta con
+un resultado anterior (sale con código 1 si alguna etapa empeora más que
+--tolerancia)
+
+Uso:
+    python benchmarks/benchmark_diario.py --filas 100000
+    python benchmarks/benchmark_diario.py --filas 1000000 --comparar benchmarks/resultados/base.json
+"""
+
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from cache_consultas import CacheConsultas
+from esquema import columnas_requeridas, compactar_tipos
+from artefacto_modelo import cargar_modelo_scoring
+from inferencia import InferenciaTabla
+from pipeline_features import MetricasPipeline, crear_pipeline
+from instrumentacion import rss_pico_mb
+from prediccion_diaria import cargar_query_proyectado, preprocesar_datos, codificar_features, generar_predicciones
+from exportacion import MOTORES_EXCEL, MODOS_PARALELO, MAX_FILAS_EXCEL, exportar_archivos
+from analisis_parquet import escribir_consolidado_parquet
+from datos_sinteticos import generar_asignaciones_coalesce
+
+RUTA_RESULTADOS = os.path.join(os.path.dirname(__file__), 'resultados')
+VERSION_RESULTADO = 1
+ETAPAS = ['carga', 'categorizar', 'codificar', 'predecir', 'exportar']
+
+
+def entorno():
+    """Versiones y máquina, para no comparar resultados de entornos distintos sin saberlo"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except Exception:
+        commit = None
+    import xgboost
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'xgboost': xgboost.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def correr_repeticion(cache_consultas, clave, modelo, columnas_modelo, directorio, args, metricas):
+    """Una pasada por todas las etapas; retorna {etapa: (segundos, rss_pico_mb)}"""
+    tiempos = {}
+
+    def medir(etapa, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos[etapa] = (time.perf_counter() - inicio, rss_pico_mb())
+        return resultado
+
+    df = medir('carga', lambda: compactar_tipos(cache_consultas.obtener(clave)))
+    pipeline = crear_pipeline(metricas=metricas)
+    df = medir('categorizar', lambda: preprocesar_datos(df, pipeline, verbose=False))
+    df_encoded = medir('codificar', lambda: codificar_features(df, columnas_modelo))
+    tabla = InferenciaTabla(modelo, columnas_modelo)
+    df = medir('predecir', lambda: generar_predicciones(df, tabla, columnas_modelo, verbose=False,
+                                                          df_encoded=df_encoded))
+
+    def exportar():
+        if len(df) <= MAX_FILAS_EXCEL:
+            exportar_archivos(df, motor=args.excel, paralelo=args.paralelo,
+                              directorios=(directorio, directorio, directorio))
+        escribir_consolidado_parquet(df, '2026-01-31', ruta=os.path.join(directorio, 'parquet'))
+    medir('exportar', exportar)
+    return tiempos
+
+
+def resumir(repeticiones, filas):
+    etapas = {}
+    for etapa in ETAPAS:
+        segundos = [r[etapa][0] for r in repeticiones]
+        mediana = float(np.median(segundos))
+        etapas[etapa] = {
+            'segundos': round(mediana, 4),
+            'segundos_todos': [round(s, 4) for s in segundos],
+            'filas_por_segundo': round(filas / mediana) if mediana else None,
+            'rss_pico_mb': max((r[etapa][1] or 0) for r in repeticiones) or None,
+        }
+    etapas['total'] = {'segundos': round(sum(e['segundos'] for e in etapas.values()), 4)}
+    return etapas
+
+
+def comparar(resultado, ruta_base, tolerancia):
+    """Imprimir la razón actual / base por etapa; retorna las etapas que empeoraron"""
+    with open(ruta_base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    if base.get('filas') != resultado['filas']:
+        print(f"⚠️ La base es de {base.get('filas'):,} filas y esta corrida de {resultado['filas']:,}")
+    if base.get('entorno', {}).get('cpus') != resultado['entorno']['cpus']:
+        print("⚠️ La base se midió con otro número de CPUs")
+
+    print(f"\n📏 Contra {os.path.normpath(ruta_base)} (commit {base.get('entorno', {}).get('commit')}):")
+    peores = []
+    for etapa in ETAPAS + ['total']:
+        antes = base['etapas'].get(etapa, {}).get('segundos')
+        ahora = resultado['etapas'][etapa]['segundos']
+        if not antes:
+            continue
+        razon = ahora / antes
+        if razon > 1 + tolerancia:
+            estado = '❌'
+            if etapa != 'total':
+                peores.append(etapa)
+        else:
+            estado = '✅' if razon >= 1 - tolerancia else '🚀'
+        print(f"   {estado} {etapa:<12}{antes:>10.3f} s -> {ahora:>8.3f} s  ({razon:.2f}x)")
+    return peores
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de punta a punta de la predicción diaria')
+    parser.add_argument('--filas', type=int, default=100_000, help='Asignaciones sintéticas (10k a 5M)')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--excel', choices=MOTORES_EXCEL, default='openpyxl')
+    parser.add_argument('--paralelo', choices=MODOS_PARALELO, default='no')
+    parser.add_argument('--salida', default=None,
+                        help='JSON de resultados (por defecto benchmarks/resultados/diario_<filas>_<fecha>.json)')
+    parser.add_argument('--comparar', default=None, help='JSON de una corrida anterior')
+    parser.add_argument('--tolerancia', type=float, default=0.15,
+                        help='Empeoramiento permitido por etapa contra --comparar (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    modelo, columnas_modelo = cargar_modelo_scoring(diferido=False)
+    if modelo is None:
+        sys.exit(1)
+
+    print(f"\n📦 Generando {args.filas:,} asignaciones sintéticas...")
+    t0 = time.perf_counter()
+    df = generar_asignaciones_coalesce(args.filas, args.semilla)[columnas_requeridas()]
+    print(f"   {time.perf_counter() - t0:.1f} s")
+    if args.filas > MAX_FILAS_EXCEL:
+        print(f"⚠️ Más de {MAX_FILAS_EXCEL:,} filas no caben en una hoja de Excel: exportar mide solo el Parquet")
+
+    repeticiones = []
+    metricas = MetricasPipeline()
+    with tempfile.TemporaryDirectory() as directorio:
+        # Resultado del query diario en la caché local, como lo deja la primera corrida del día
+        cache_consultas = CacheConsultas(ttl=24 * 3600, max_mb=10_000, ruta=os.path.join(directorio, 'consultas'))
+        clave = CacheConsultas.clave(cargar_query_proyectado('query_asignaciones_diarias.sql'), {'semilla': args.semilla})
+        cache_consultas.guardar(clave, df)
+        del df
+
+        for i in range(args.repeticiones):
+            print(f"\n⏱️ Repetición {i + 1}/{args.repeticiones}")
+            repeticiones.append(correr_repeticion(cache_consultas, clave, modelo, columnas_modelo, directorio,
+                                                  args, metricas))
+
+    resultado = {
+        'version': VERSION_RESULTADO,
+        'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'filas': args.filas,
+        'semilla': args.semilla,
+        'repeticiones': args.repeticiones,
+        'excel': args.excel,
+        'paralelo': args.paralelo,
+        'entorno': entorno(),
+        'etapas': resumir(repeticiones, args.filas),
+        'pipeline': metricas.resumen(),
+    }
+
+    print("\n" + "="*72)
+    print(f"{args.filas:,} asignaciones, mediana de {args.repeticiones} repeticiones")
+    print("="*72)
+    print(f"{'Etapa':<14}{'s':>10}{'filas/s':>14}{'RSS pico MB':>14}")
+    for etapa in ETAPAS:
+        e = resultado['etapas'][etapa]
+        print(f"{etapa:<14}{e['segundos']:>10.3f}{e['filas_por_segundo'] or 0:>14,}{e['rss_pico_mb'] or 0:>14,.0f}")
+    print(f"{'total':<14}{resultado['etapas']['total']['segundos']:>10.3f}")
+
+    salida = args.salida or os.path.join(RUTA_RESULTADOS, f"diario_{args.filas}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados: {os.path.normpath(salida)}")
+
+    if args.comparar:
+        peores = comparar(resultado, args.comparar, args.tolerancia)
+        if peores:
+            print(f"\n❌ Más lento que la base (> {args.tolerancia:.0%}): {', '.join(peores)}\n")
+            sys.exit(1)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark del reentrenamiento
+Sobre una tabla de entrenamiento sintética compara:
+- Construir la matriz como el notebook (get_dummies drop_first) contra
+  construir_matriz de scripts/entrenamiento.py y contra leerla de la caché
+  (X en .npy abierta con mmap)
+- Entrenar los candidatos en secuencia contra en procesos paralelos
+Verifica que la matriz sea idéntica a la del notebook
+
+Uso:
+    python benchmarks/benchmark_entrenamiento.py --filas 200000
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from entrenamiento import CANDIDATOS, construir_matriz, entrenar_candidatos, guardar_matriz, cargar_x, ruta_x
+from pipeline_features import VariablesTemporales
+
+NIVELES = {
+    'tipo_de_gestion': ['Convocatoria', 'FERIA MOVIL', 'TRADICIONAL', 'Tradicional', 'TRADICONAL'],
+    'rango_vacantes': ['1-100', '100-200', '200-300', '300+'],
+    'categoria_cargo': ['bodega_logistica', 'cajero', 'call_center', 'limpieza_aseo', 'otros', 'seguridad'],
+    'categoria_empresa': ['limpieza', 'otras', 'retail', 'salud', 'seguridad', 'servicios_temporales'],
+    'categoria_requisito': ['bachiller', 'basica', 'otros', 'sin_especificar', 'tecnico'],
+    'franja_hora_entrevista': ['manana', 'multiple', 'sin_hora', 'tarde'],
+    'categoria_documentacion': ['basica', 'completa', 'media', 'otros', 'sin_especificar'],
+}
+
+
+def generar_tabla(filas, semilla=42):
+    """Filas con la forma de tb_modelo_conversion_intermediacion (columnas del QUERY_ENTRENAMIENTO)"""
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({feature: rng.choice(niveles, size=filas) for feature, niveles in NIVELES.items()})
+    df['tiene_contacto_empresa'] = rng.integers(0, 2, size=filas)
+    df['fecha_asignacion'] = pd.Timestamp('2025-09-01') + pd.to_timedelta(rng.integers(0, 150, size=filas), unit='D')
+    logit = (0.8 * (df['categoria_cargo'] == 'seguridad') - 0.6 * (df['rango_vacantes'] == '300+')
+             + 0.4 * df['tiene_contacto_empresa'] - 0.2)
+    df['conversion'] = (rng.random(filas) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+def matriz_notebook(df):
+    """Camino del notebook (secciones 3.2 y 3.3)"""
+    df = VariablesTemporales().transform(df.copy())
+    return pd.get_dummies(df[CATEGORICAL_FEATURES + NUMERIC_FEATURES], columns=CATEGORICAL_FEATURES,
+                          drop_first=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del reentrenamiento')
+    parser.add_argument('--filas', type=int, default=200_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"\n📦 Generando {args.filas:,} filas sintéticas...")
+    df = generar_tabla(args.filas, args.semilla)
+
+    t0 = time.perf_counter()
+    referencia = matriz_notebook(df)
+    t_notebook = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    X, y, columnas = construir_matriz(df)
+    t_construir = time.perf_counter() - t0
+
+    iguales = list(referencia.columns) == columnas and np.array_equal(referencia.to_numpy(np.float32), X)
+
+    with tempfile.TemporaryDirectory() as ruta:
+        archivo = os.path.join(ruta, 'matriz.npz')
+        t0 = time.perf_counter()
+        guardar_matriz(archivo, X, y, columnas)
+        t_guardar = time.perf_counter() - t0
+        tamano = os.path.getsize(archivo) + os.path.getsize(ruta_x(archivo))
+
+        t0 = time.perf_counter()
+        X_cache = np.array(cargar_x(archivo))
+        t_leer = time.perf_counter() - t0
+
+        candidatos = list(CANDIDATOS)
+        t0 = time.perf_counter()
+        secuencial = entrenar_candidatos(archivo, candidatos, max_workers=1)
+        t_secuencial = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        paralelo = entrenar_candidatos(archivo, candidatos)
+        t_paralelo = time.perf_counter() - t0
+
+    mismos_auc = [r['auc'] for r in secuencial] == [r['auc'] for r in paralelo]
+
+    print("\n" + "="*60)
+    print(f"{args.filas:,} filas x {len(columnas)} columnas")
+    print("="*60)
+    print(f"{'Matriz: get_dummies (notebook)':<40}{t_notebook:>10.2f} s")
+    print(f"{'Matriz: construir_matriz':<40}{t_construir:>10.2f} s")
+    print(f"{'Matriz: guardar (caché)':<40}{t_guardar:>10.2f} s  ({tamano / 1024 ** 2:.1f} MB)")
+    print(f"{'Matriz: leer X completa (caché)':<40}{t_leer:>10.2f} s")
+    print(f"{'Candidatos en secuencia':<40}{t_secuencial:>10.2f} s")
+    print(f"{'Candidatos en paralelo':<40}{t_paralelo:>10.2f} s")
+    print(f"\n💻 CPUs disponibles: {os.cpu_count()}")
+
+    ok = iguales and mismos_auc and np.array_equal(X, X_cache)
+    print(f"\n{'✅' if iguales else '❌'} Matriz idéntica a la del notebook")
+    print(f"{'✅' if mismos_auc else '❌'} Mismos AUC en secuencia y en paralelo\n")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark de exportación
+Compara la exportación anterior (secuencial, filtrando por score dos veces,
+to_excel con openpyxl) contra exportar_archivos con sus escritores y modos de
+paralelismo, sobre un resultado sintético. Verifica que los CSV sean
+idénticos byte a byte y que los Excel tengan el mismo contenido
+
+Uso:
+    python benchmarks/benchmark_exportacion.py --filas 100000
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from esquema import COLUMNAS_EXPORTACION
+from exportacion import SCORES, exportar_archivos, resolver_motor
+
+
+def generar_resultado(filas, semilla=42):
+    """Resultado sintético con las columnas de exportación"""
+    rng = np.random.default_rng(semilla)
+    probabilidades = rng.random(filas).astype(np.float32)
+    df = pd.DataFrame({
+        'tipo_de_gestion': rng.choice(['Convocatoria', 'TRADICIONAL', 'FERIA MOVIL'], size=filas),
+        'codigo_vacante': rng.integers(100_000, 999_999, size=filas).astype(str),
+        'cargo': rng.choice(['Auxiliar de bodega', 'Asesor comercial', 'Vigilante', 'Cajero'], size=filas),
+        'empresa': rng.choice(['CASALIMPIA S.A.', 'SECURITAS COLOMBIA', 'TIENDAS D1'], size=filas),
+        'fecha_entrevista': pd.Timestamp('2026-01-15') + pd.to_timedelta(rng.integers(0, 30, size=filas), unit='D'),
+        'hora_entrevista': rng.choice(['08:00 AM', '2:00 PM', None], size=filas),
+        'no_documento': rng.integers(10_000_000, 1_100_000_000, size=filas).astype(str),
+        'nombres': rng.choice(['ANA MARIA', 'JUAN DAVID', 'LUISA'], size=filas),
+        'apellidos': rng.choice(['PEREZ GOMEZ', 'RAMIREZ', 'TORRES DIAZ'], size=filas),
+        'phone': rng.integers(3_000_000_000, 3_999_999_999, size=filas).astype(str),
+        'email': rng.choice(['correo@ejemplo.com', None], size=filas),
+        'codigo_unico_vacante': np.arange(filas).astype(str),
+        'probabilidad_conversion': probabilidades,
+    })
+    df['score_priorizacion'] = np.where(probabilidades < 0.40, 'Bajo', np.where(probabilidades < 0.55, 'Medio', 'Alto'))
+    return df[COLUMNAS_EXPORTACION]
+
+
+def exportar_anterior(df_resultado, directorios):
+    """Versión anterior de exportar_archivos (secuencial)"""
+    fecha_str = pd.Timestamp.now().strftime('%Y%m%d')
+    output_dir, analisis_dir, vicidial_dir = directorios
+    columnas = COLUMNAS_EXPORTACION
+    archivos = []
+    for score in SCORES:
+        df_score = df_resultado[df_resultado['score_priorizacion'] == score][columnas]
+        if len(df_score) > 0:
+            filepath = os.path.join(output_dir, f'COLSAGEM - Score_{score}_{fecha_str}.xlsx')
+            df_score.to_excel(filepath, index=False, engine='openpyxl')
+            archivos.append(filepath)
+    filepath_consol = os.path.join(analisis_dir, f'Consolidado_Analisis_{fecha_str}.xlsx')
+    df_resultado[columnas].to_excel(filepath_consol, index=False, engine='openpyxl')
+    archivos.append(filepath_consol)
+    for score in SCORES:
+        df_score_csv = df_resultado[df_resultado['score_priorizacion'] == score][columnas]
+        if len(df_score_csv) > 0:
+            filepath_csv = os.path.join(vicidial_dir, f'COLSAGEM - Score_{score}_{fecha_str}.csv')
+            df_score_csv.to_csv(filepath_csv, index=False, encoding='utf-8')
+            archivos.append(filepath_csv)
+    return archivos
+
+
+def crear_directorios(base, nombre):
+    directorios = tuple(os.path.join(base, nombre, d) for d in ('predicciones', 'analisis', 'vicidial'))
+    for d in directorios:
+        os.makedirs(d)
+    return directorios
+
+
+def mismo_contenido(archivos_a, archivos_b):
+    for a, b in zip(archivos_a, archivos_b):
+        if a.endswith('.csv'):
+            with open(a, 'rb') as fa, open(b, 'rb') as fb:
+                if fa.read() != fb.read():
+                    return False
+        elif not pd.read_excel(a).equals(pd.read_excel(b)):
+            return False
+    return len(archivos_a) == len(archivos_b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de exportación')
+    parser.add_argument('--filas', type=int, default=100_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--sin-verificar', action='store_true', help='No releer los Excel para comparar')
+    args = parser.parse_args()
+
+    print(f"\n📦 Generando {args.filas:,} filas sintéticas...")
+    df_resultado = generar_resultado(args.filas, args.semilla)
+
+    variantes = [('openpyxl', 'no'), ('openpyxl', 'procesos'), ('streaming', 'no'),
+                 ('streaming', 'procesos'), ('streaming', 'hilos')]
+    if resolver_motor('xlsxwriter') == 'xlsxwriter':
+        variantes.append(('xlsxwriter', 'procesos'))
+
+    with tempfile.TemporaryDirectory() as base:
+        t0 = time.perf_counter()
+        referencia = exportar_anterior(df_resultado, crear_directorios(base, 'anterior'))
+        t_anterior = time.perf_counter() - t0
+
+        tiempos = []
+        for motor, paralelo in variantes:
+            print(f"\n▶️ motor={motor}, paralelo={paralelo}")
+            t0 = time.perf_counter()
+            archivos = exportar_archivos(df_resultado, motor=motor, paralelo=paralelo,
+                                         directorios=crear_directorios(base, f'{motor}_{paralelo}'))
+            t = time.perf_counter() - t0
+            ok = None if args.sin_verificar else mismo_contenido(referencia, archivos)
+            tiempos.append((f'{motor} / {paralelo}', t, ok))
+
+    print("\n" + "="*62)
+    print(f"{'Exportación':<30}{'s':>10}{'x':>8}{'contenido':>14}")
+    print("="*62)
+    print(f"{'anterior (secuencial)':<30}{t_anterior:>10.2f}{1:>7.1f}x")
+    for nombre, t, ok in tiempos:
+        estado = '-' if ok is None else ('✅' if ok else '❌')
+        print(f"{nombre:<30}{t:>10.2f}{t_anterior / t:>7.1f}x{estado:>13}")
+    print(f"\n💻 CPUs disponibles: {os.cpu_count()}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark de inferencia por tabla
+Compara modelo.predict_proba sobre el frame completo contra InferenciaTabla
+(un score por combinación distinta de features) y verifica que las
+probabilidades sean idénticas
+
+Las features son de la vacante más la fecha de asignación, así que los datos
+sintéticos reparten las filas entre `--vacantes` vacantes (unas con muchos
+más candidatos que otras) y fechas del mes
+
+Uso:
+    python benchmarks/benchmark_inferencia.py --filas 1000000 --vacantes 5000 --lotes 4
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from artefacto_modelo import cargar_modelo_scoring
+from prediccion_diaria import preprocesar_datos
+from codificador import CodificadorOneHot
+from inferencia import InferenciaTabla
+from verificar_codificador import generar_asignaciones
+
+
+def generar_por_vacante(filas, vacantes, semilla=42):
+    """Asignaciones sintéticas: filas repartidas entre vacantes (Zipf) con fecha del mes"""
+    rng = np.random.default_rng(semilla)
+    df_vacantes = generar_asignaciones(vacantes, semilla)
+    pesos = 1.0 / np.arange(1, vacantes + 1)
+    df = df_vacantes.iloc[rng.choice(vacantes, size=filas, p=pesos / pesos.sum())].reset_index(drop=True)
+    df['fecha_asignacion'] = pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 31, size=filas), unit='D')
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de inferencia por tabla')
+    parser.add_argument('--filas', type=int, default=1_000_000)
+    parser.add_argument('--vacantes', type=int, default=5_000)
+    parser.add_argument('--lotes', type=int, default=4, help='Bloques en que se puntúa (como --chunksize)')
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    modelo, columnas_modelo = cargar_modelo_scoring(diferido=False)
+    if modelo is None:
+        sys.exit(1)
+
+    print(f"\n📦 Generando {args.filas:,} filas sintéticas ({args.vacantes:,} vacantes)...")
+    df_procesado = preprocesar_datos(generar_por_vacante(args.filas, args.vacantes, args.semilla))
+    X = CodificadorOneHot(columnas_modelo).transformar_df(df_procesado)
+
+    t0 = time.perf_counter()
+    esperado = modelo.predict_proba(X)
+    t_directo = time.perf_counter() - t0
+
+    tabla = InferenciaTabla(modelo, columnas_modelo)
+    t0 = time.perf_counter()
+    frio = np.concatenate([tabla.predict_proba(X.iloc[lote])
+                           for lote in np.array_split(np.arange(len(X)), args.lotes)])
+    t_frio = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    caliente = tabla.predict_proba(X)
+    t_caliente = time.perf_counter() - t0
+
+    print("\n" + "="*66)
+    print(f"{'Camino':<36}{'s':>10}{'filas/s':>14}{'x':>6}")
+    print("="*66)
+    for nombre, t in [('predict_proba (frame completo)', t_directo),
+                      (f'tabla, vacía ({args.lotes} lotes)', t_frio),
+                      ('tabla, ya poblada', t_caliente)]:
+        print(f"{nombre:<36}{t:>10.3f}{len(X) / t:>14,.0f}{t_directo / t:>5.1f}x")
+    tabla.imprimir_estadisticas()
+
+    iguales = np.array_equal(esperado, frio) and np.array_equal(esperado, caliente)
+    if not iguales:
+        print("\n❌ Las probabilidades no coinciden con predict_proba")
+        sys.exit(1)
+    print("\n✅ Probabilidades idénticas a predict_proba\n")
+
+
+if __name__ == "__main__":
+    main()
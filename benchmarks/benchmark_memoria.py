@@ -0,0 +1,58 @@
+"""
+Reporte de memoria del query diario
+Compara el query original (SELECT c.*) contra la versión proyectada con las
+columnas del scoring y tipos compactos: columnas, memoria, bytes por fila y
+tiempo de lectura
+
+Uso:
+    python benchmarks/benchmark_memoria.py
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from database import get_engine, query_to_dataframe
+from esquema import columnas_requeridas, proyectar_columnas, parametros_periodo, compactar_tipos, reporte_memoria
+
+
+def main():
+    print("\n" + "="*50)
+    print("📊 REPORTE DE MEMORIA - QUERY DIARIO")
+    print("="*50 + "\n")
+
+    engine = get_engine()
+    if engine is None:
+        return
+
+    sql_path = os.path.join(os.path.dirname(__file__), '..', 'sql', 'query_asignaciones_diarias.sql')
+    with open(sql_path, 'r', encoding='utf-8') as f:
+        query = f.read()
+
+    t0 = time.perf_counter()
+    df_completo = query_to_dataframe(query, engine, params=parametros_periodo(), cache=False)
+    t_completo = time.perf_counter() - t0
+    if df_completo is None or len(df_completo) == 0:
+        print("⚠️ Sin asignaciones")
+        return
+
+    t0 = time.perf_counter()
+    df_proyectado = query_to_dataframe(proyectar_columnas(query, columnas_requeridas()), engine,
+                                       params=parametros_periodo(), cache=False)
+    t_proyectado = time.perf_counter() - t0
+    df_compacto = compactar_tipos(df_proyectado.copy())
+
+    print(f"\n⏱️ Lectura SELECT c.*:    {t_completo:.2f} s")
+    print(f"⏱️ Lectura proyectada:    {t_proyectado:.2f} s\n")
+    reporte_memoria('SELECT c.*', df_completo, 'proyectada', df_proyectado)
+    reporte_memoria('SELECT c.*', df_completo, 'proyectada + compacta', df_compacto)
+
+    print("\n📋 Tipos compactos:")
+    for col, dtype in df_compacto.dtypes.items():
+        print(f"   - {col}: {dtype}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
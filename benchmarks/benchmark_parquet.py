@@ -0,0 +1,96 @@
+"""
+Benchmark del histórico Parquet
+Escribe `--dias` consolidados sintéticos como Excel (uno por día, como
+data/analisis/) y como dataset Parquet particionado, y compara el tiempo de
+escritura y el de cargar el rango completo y un subconjunto (un score, dos
+columnas)
+
+Uso:
+    python benchmarks/benchmark_parquet.py --dias 10 --filas 5000
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from analisis_parquet import COLUMNAS_PARQUET, escribir_consolidado_parquet, leer_consolidado
+from benchmark_exportacion import generar_resultado
+
+
+def generar_consolidado(filas, semilla):
+    """Resultado sintético con columnas de exportación y features"""
+    rng = np.random.default_rng(semilla)
+    df = generar_resultado(filas, semilla)
+    df['fecha_asignacion'] = pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 31, size=filas), unit='D')
+    for feature in CATEGORICAL_FEATURES[1:]:
+        df[feature] = rng.choice(['nivel_a', 'nivel_b', 'nivel_c', 'otros'], size=filas)
+    for feature in NUMERIC_FEATURES:
+        df[feature] = rng.integers(0, 7, size=filas).astype('int8')
+    return df[COLUMNAS_PARQUET]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del histórico Parquet')
+    parser.add_argument('--dias', type=int, default=10)
+    parser.add_argument('--filas', type=int, default=5_000, help='Filas por día')
+    args = parser.parse_args()
+
+    fechas = pd.date_range('2026-01-01', periods=args.dias, freq='D')
+    consolidados = [generar_consolidado(args.filas, i) for i in range(args.dias)]
+
+    with tempfile.TemporaryDirectory() as base:
+        ruta_parquet = os.path.join(base, 'parquet')
+
+        t0 = time.perf_counter()
+        for fecha, df in zip(fechas, consolidados):
+            df.to_excel(os.path.join(base, f"Consolidado_Analisis_{fecha:%Y%m%d}.xlsx"), index=False, engine='openpyxl')
+        t_excel = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for fecha, df in zip(fechas, consolidados):
+            escribir_consolidado_parquet(df, fecha, ruta=ruta_parquet)
+        t_parquet = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        excel = pd.concat([pd.read_excel(os.path.join(base, f"Consolidado_Analisis_{fecha:%Y%m%d}.xlsx"))
+                           for fecha in fechas], ignore_index=True)
+        t_leer_excel = time.perf_counter() - t0
+        excel_alto = excel.loc[excel['score_priorizacion'] == 'Alto', ['empresa', 'probabilidad_conversion']]
+
+        t0 = time.perf_counter()
+        completo = leer_consolidado(fechas[0], fechas[-1], ruta=ruta_parquet)
+        t_leer_parquet = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        alto = leer_consolidado(fechas[0], fechas[-1], scores=['Alto'],
+                                columnas=['empresa', 'probabilidad_conversion'], ruta=ruta_parquet)
+        t_leer_subconjunto = time.perf_counter() - t0
+
+        tam_excel = sum(os.path.getsize(os.path.join(base, f)) for f in os.listdir(base) if f.endswith('.xlsx'))
+        tam_parquet = sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(ruta_parquet) for f in fs)
+
+    print("\n" + "="*60)
+    print(f"{args.dias} días x {args.filas:,} filas")
+    print("="*60)
+    print(f"{'Escritura Excel':<40}{t_excel:>10.2f} s")
+    print(f"{'Escritura Parquet':<40}{t_parquet:>10.2f} s")
+    print(f"{'Lectura rango completo (Excel)':<40}{t_leer_excel:>10.2f} s")
+    print(f"{'Lectura rango completo (Parquet)':<40}{t_leer_parquet:>10.2f} s")
+    print(f"{'Lectura Alto, 2 columnas (Parquet)':<40}{t_leer_subconjunto:>10.2f} s")
+    print(f"{'Tamaño Excel / Parquet':<40}{tam_excel / 1024 ** 2:>7.1f} MB / {tam_parquet / 1024 ** 2:.1f} MB")
+
+    iguales = (len(completo) == len(excel) and len(alto) == len(excel_alto)
+               and np.allclose(np.sort(alto['probabilidad_conversion']), np.sort(excel_alto['probabilidad_conversion'])))
+    print(f"\n{'✅' if iguales else '❌'} Mismas filas que los Excel\n")
+    if not iguales:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
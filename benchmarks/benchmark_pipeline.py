@@ -0,0 +1,108 @@
+"""
+Benchmark del pipeline de features
+Compara el preprocesamiento anterior de prediccion_diaria.py (df.copy() al
+preprocesar y otra vez al agregar las predicciones) contra el pipeline
+compartido de scripts/pipeline_features.py, que agrega las columnas sobre el
+mismo DataFrame. Mide tiempo y pico de memoria (tracemalloc) y verifica que
+features, probabilidades y scores sean idénticos
+
+Uso:
+    python benchmarks/benchmark_pipeline.py --filas 500000
+"""
+
+import sys
+import os
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from categorizacion import cargar_reglas, categorizar_rango_vacantes
+from codificador import obtener_codificador
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from prediccion_diaria import cargar_modelo, preprocesar_datos, generar_predicciones
+from pipeline_features import MetricasPipeline, crear_pipeline
+from verificar_codificador import generar_asignaciones
+
+
+def camino_anterior(df, modelo, columnas_modelo):
+    """preprocesar_datos + generar_predicciones antes del pipeline (dos copias del frame)"""
+    df_procesado = df.copy()
+    df_procesado['numero_de_vacantes'] = pd.to_numeric(df_procesado['numero_de_vacantes'], errors='coerce')
+    df_procesado['rango_vacantes'] = categorizar_rango_vacantes(df_procesado['numero_de_vacantes'], como_categoria=True)
+    cargar_reglas().categorizar(df_procesado, None, como_categoria=True)
+    df_procesado['tiene_contacto_empresa'] = df_procesado['persona_contacto_empresa'].notna().astype('int8')
+    df_procesado['fecha_asignacion'] = pd.to_datetime(df_procesado['fecha_asignacion'])
+    df_procesado['dia_semana'] = df_procesado['fecha_asignacion'].dt.dayofweek.astype('int8')
+    df_procesado['mes'] = df_procesado['fecha_asignacion'].dt.month.astype('int8')
+    df_procesado['es_fin_semana'] = (df_procesado['dia_semana'] >= 5).astype('int8')
+
+    probabilidades = modelo.predict_proba(obtener_codificador(columnas_modelo).transformar_df(df_procesado))[:, 1]
+    df_resultado = df_procesado.copy()
+    df_resultado['probabilidad_conversion'] = probabilidades
+    df_resultado['score_priorizacion'] = ['Bajo' if p < 0.40 else 'Medio' if p < 0.55 else 'Alto'
+                                          for p in probabilidades]
+    return df_resultado
+
+
+def camino_pipeline(df, modelo, columnas_modelo, metricas=None):
+    pipeline = crear_pipeline(metricas=metricas)
+    return generar_predicciones(preprocesar_datos(df, pipeline, verbose=False), modelo, columnas_modelo,
+                                verbose=False)
+
+
+def medir(funcion, *args):
+    """(resultado, segundos, pico MB sobre lo ya asignado)"""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    resultado = funcion(*args)
+    segundos = time.perf_counter() - t0
+    pico = (tracemalloc.get_traced_memory()[1] - base) / 1024 ** 2
+    tracemalloc.stop()
+    return resultado, segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline de features')
+    parser.add_argument('--filas', type=int, default=500_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    modelo, columnas_modelo = cargar_modelo()
+    if modelo is None:
+        sys.exit(1)
+
+    print(f"\n📦 Generando {args.filas:,} filas sintéticas...")
+    df = generar_asignaciones(args.filas, args.semilla)
+    # Calentar: booster en segundo plano, reglas y codificador
+    camino_pipeline(df.head(1000).copy(), modelo, columnas_modelo)
+
+    anterior, t_anterior, pico_anterior = medir(camino_anterior, df.copy(), modelo, columnas_modelo)
+    metricas = MetricasPipeline()
+    nuevo, t_nuevo, pico_nuevo = medir(camino_pipeline, df.copy(), modelo, columnas_modelo, metricas)
+
+    columnas = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+    mismas_features = all(anterior[c].astype(str).equals(nuevo[c].astype(str)) for c in columnas)
+    mismas_prob = np.array_equal(anterior['probabilidad_conversion'].to_numpy(),
+                                 nuevo['probabilidad_conversion'].to_numpy())
+    mismos_scores = anterior['score_priorizacion'].astype(str).equals(nuevo['score_priorizacion'].astype(str))
+
+    print("\n" + "="*60)
+    print(f"{args.filas:,} filas, preprocesar + predecir")
+    print("="*60)
+    print(f"{'Anterior (df.copy() x2)':<32}{t_anterior:>10.2f} s{pico_anterior:>12,.1f} MB pico")
+    print(f"{'Pipeline compartido':<32}{t_nuevo:>10.2f} s{pico_nuevo:>12,.1f} MB pico")
+    metricas.imprimir()
+
+    print(f"\n{'✅' if mismas_features else '❌'} Features idénticas")
+    print(f"{'✅' if mismas_prob else '❌'} Probabilidades bit a bit")
+    print(f"{'✅' if mismos_scores else '❌'} Scores de priorización\n")
+    if not (mismas_features and mismas_prob and mismos_scores):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
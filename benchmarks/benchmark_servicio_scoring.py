@@ -0,0 +1,163 @@
+"""
+Prueba de carga del servicio de scoring
+Levanta scripts/servicio_scoring.py en otro proceso (o usa --url) y lo carga
+con --clientes conexiones concurrentes, cada una enviando una asignación
+sintética por solicitud durante --segundos. Reporta latencia p50/p99 y
+solicitudes/s, con micro-lotes y sin ellos (--max-lote 1)
+
+Uso:
+    python benchmarks/benchmark_servicio_scoring.py --clientes 32 --segundos 10
+    python benchmarks/benchmark_servicio_scoring.py --url http://127.0.0.1:8765 --clientes 64
+"""
+
+import sys
+import os
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlparse
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from verificar_codificador import generar_asignaciones
+
+RUTA_SERVICIO = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'servicio_scoring.py')
+
+
+def generar_cuerpos(n, semilla=42):
+    """Asignaciones sintéticas serializadas, una por solicitud"""
+    df = generar_asignaciones(n, semilla)
+    df['fecha_asignacion'] = df['fecha_asignacion'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    df['codigo_unico_vacante'] = [f'V{i}' for i in range(n)]
+    registros = df.astype(object).where(df.notna(), None).to_dict('records')
+    return [json.dumps(r).encode('utf-8') for r in registros]
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def levantar_servicio(max_lote, espera_ms):
+    """Proceso del servicio; retorna (proceso, url) cuando /salud responde"""
+    puerto = puerto_libre()
+    proceso = subprocess.Popen([sys.executable, RUTA_SERVICIO, '--puerto', str(puerto), '--max-lote', str(max_lote),
+                                '--espera-ms', str(espera_ms)], stdout=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{puerto}'
+    limite = time.monotonic() + 120
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError('el servicio terminó al iniciar')
+        try:
+            conexion = http.client.HTTPConnection('127.0.0.1', puerto, timeout=1)
+            conexion.request('GET', '/salud')
+            if conexion.getresponse().status == 200:
+                return proceso, url
+        except OSError:
+            time.sleep(0.2)
+    proceso.kill()
+    raise RuntimeError('el servicio no respondió')
+
+
+def cargar(url, cuerpos, clientes, segundos):
+    """
+    `clientes` hilos con conexión keep-alive, cada uno enviando solicitudes en serie
+
+    Returns:
+    --------
+    tuple
+        (latencias en ms, errores, segundos reales)
+    """
+    destino = urlparse(url)
+    latencias, errores = [], [0]
+    bloqueo = threading.Lock()
+    fin = time.monotonic() + segundos
+
+    def cliente(i):
+        conexion = http.client.HTTPConnection(destino.hostname, destino.port, timeout=60)
+        propias, j = [], i
+        while time.monotonic() < fin:
+            cuerpo = cuerpos[j % len(cuerpos)]
+            j += clientes
+            t0 = time.perf_counter()
+            try:
+                conexion.request('POST', '/puntuar', body=cuerpo, headers={'Content-Type': 'application/json'})
+                respuesta = conexion.getresponse()
+                respuesta.read()
+                if respuesta.status != 200:
+                    raise RuntimeError(respuesta.status)
+                propias.append((time.perf_counter() - t0) * 1000)
+            except Exception:
+                with bloqueo:
+                    errores[0] += 1
+                conexion.close()
+                conexion = http.client.HTTPConnection(destino.hostname, destino.port, timeout=60)
+        conexion.close()
+        with bloqueo:
+            latencias.extend(propias)
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return np.array(latencias), errores[0], time.perf_counter() - inicio
+
+
+def salud(url):
+    destino = urlparse(url)
+    conexion = http.client.HTTPConnection(destino.hostname, destino.port, timeout=5)
+    conexion.request('GET', '/salud')
+    return json.loads(conexion.getresponse().read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga del servicio de scoring')
+    parser.add_argument('--url', default=None, help='Servicio ya levantado (si no, se levanta uno por escenario)')
+    parser.add_argument('--clientes', type=int, default=32)
+    parser.add_argument('--segundos', type=float, default=10)
+    parser.add_argument('--asignaciones', type=int, default=5000, help='Asignaciones sintéticas distintas')
+    args = parser.parse_args()
+
+    cuerpos = generar_cuerpos(args.asignaciones)
+    if args.url:
+        escenarios = [('servicio en ' + args.url, None, None)]
+    else:
+        escenarios = [('sin micro-lotes (max-lote 1)', 1, 0), ('micro-lotes (256 filas, 2 ms)', 256, 2.0)]
+
+    filas = []
+    for nombre, max_lote, espera_ms in escenarios:
+        proceso = None
+        url = args.url
+        if url is None:
+            print(f"\n🛰️ Levantando servicio: {nombre}...")
+            proceso, url = levantar_servicio(max_lote, espera_ms)
+        try:
+            cargar(url, cuerpos, args.clientes, 1.0)  # calentamiento (tabla de inferencia, caché de categorías)
+            latencias, errores, total = cargar(url, cuerpos, args.clientes, args.segundos)
+            estadisticas = salud(url)
+        finally:
+            if proceso is not None:
+                proceso.terminate()
+                proceso.wait()
+        filas.append((nombre, latencias, errores, total, estadisticas))
+
+    print("\n" + "="*88)
+    print(f"{args.clientes} clientes concurrentes, {args.segundos:g} s, una asignación por solicitud")
+    print("="*88)
+    print(f"{'Escenario':<34}{'sol/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errores':>10}{'filas/lote':>14}")
+    for nombre, latencias, errores, total, estadisticas in filas:
+        p50, p99 = (np.percentile(latencias, [50, 99]) if len(latencias) else (np.nan, np.nan))
+        print(f"{nombre:<34}{len(latencias) / total:>10,.0f}{p50:>10.1f}{p99:>10.1f}{errores:>10}"
+              f"{estadisticas['filas_por_lote']:>14}")
+    print(f"\n💻 CPUs disponibles: {os.cpu_count()}\n")
+
+
+if __name__ == "__main__":
+    main()
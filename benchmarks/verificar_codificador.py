@@ -0,0 +1,93 @@
+"""
+Verificación del codificador one-hot
+Compara pd.get_dummies + ciclo de columnas faltantes (camino anterior) contra
+CodificadorOneHot sobre datos sintéticos: mismas columnas en el mismo orden,
+misma matriz y probabilidades idénticas bit a bit. La equivalencia con las
+columnas del entrenamiento (get_dummies con drop_first=True) la cubre
+tests/test_codificador.py
+
+Uso:
+    python benchmarks/verificar_codificador.py --filas 500000
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from prediccion_diaria import cargar_modelo, preprocesar_datos
+from codificador import CodificadorOneHot
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES, compactar_tipos
+from benchmark_categorizacion import generar_datos
+
+
+def generar_asignaciones(filas, semilla=42):
+    """Datos sintéticos con las columnas crudas que usa preprocesar_datos, con los tipos compactos de la carga"""
+    rng = np.random.default_rng(semilla)
+    df = generar_datos(filas, semilla)
+    df['tipo_de_gestion'] = rng.choice(np.array(['Convocatoria', 'FERIA MOVIL', 'TRADICIONAL', 'Tradicional',
+                                                 'TRADICONAL', 'OTRO'], dtype=object), size=filas)
+    df['numero_de_vacantes'] = rng.choice([1, 2, 5, 10, 30, 80, np.nan], size=filas)
+    df['persona_contacto_empresa'] = rng.choice(np.array(['Ana Pérez', '', None], dtype=object), size=filas)
+    df['fecha_asignacion'] = pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 31, size=filas), unit='D')
+    return compactar_tipos(df)
+
+
+def codificar_get_dummies(df_procesado, columnas_modelo):
+    """Camino anterior de generar_predicciones"""
+    df_encoded = pd.get_dummies(df_procesado[CATEGORICAL_FEATURES + NUMERIC_FEATURES],
+                                columns=CATEGORICAL_FEATURES)
+    for col in columnas_modelo:
+        if col not in df_encoded.columns:
+            df_encoded[col] = 0
+    return df_encoded[columnas_modelo]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verificación del codificador one-hot')
+    parser.add_argument('--filas', type=int, default=500_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    modelo, columnas_modelo = cargar_modelo()
+    if modelo is None:
+        sys.exit(1)
+
+    print(f"\n📦 Generando {args.filas:,} filas sintéticas...")
+    df_procesado = preprocesar_datos(generar_asignaciones(args.filas, args.semilla))
+
+    t0 = time.perf_counter()
+    anterior = codificar_get_dummies(df_procesado, columnas_modelo)
+    t_anterior = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    codificador = CodificadorOneHot(columnas_modelo)
+    t_ajuste = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    nuevo = codificador.transformar_df(df_procesado)
+    t_nuevo = time.perf_counter() - t0
+
+    print(f"\n⏱️ get_dummies + ciclo: {t_anterior:.3f} s")
+    print(f"⏱️ CodificadorOneHot:   {t_nuevo:.3f} s (ajuste {t_ajuste * 1000:.1f} ms) -> "
+          f"{t_anterior / t_nuevo:.1f}x")
+
+    mismas_columnas = list(anterior.columns) == list(nuevo.columns)
+    misma_matriz = np.array_equal(anterior.to_numpy(dtype=np.float32), nuevo.to_numpy())
+    prob_anterior = modelo.predict_proba(anterior)[:, 1]
+    prob_nuevo = modelo.predict_proba(nuevo)[:, 1]
+    mismas_prob = np.array_equal(prob_anterior, prob_nuevo)
+
+    print(f"\n{'✅' if mismas_columnas else '❌'} Columnas y orden")
+    print(f"{'✅' if misma_matriz else '❌'} Matriz codificada")
+    print(f"{'✅' if mismas_prob else '❌'} Probabilidades bit a bit "
+          f"(máx. diferencia {np.abs(prob_anterior - prob_nuevo).max():.3g})\n")
+
+    if not (mismas_columnas and misma_matriz and mismas_prob):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
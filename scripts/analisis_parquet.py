@@ -0,0 +1,157 @@
+"""
+Histórico de análisis en Parquet
+El consolidado diario (scores + features) se guarda también como dataset
+Parquet particionado por fecha de ejecución y score en data/analisis/parquet/,
+para comparar días sin abrir un Excel por día
+
+Lectura:
+    from analisis_parquet import leer_consolidado
+    df = leer_consolidado('2026-01-01', '2026-01-31', scores=['Alto'], columnas=['empresa', 'probabilidad_conversion'])
+
+    python scripts/analisis_parquet.py --desde 2026-01-01 --hasta 2026-01-31
+"""
+
+import os
+import shutil
+import argparse
+from datetime import datetime
+import pandas as pd
+
+from esquema import COLUMNAS_EXPORTACION, CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+RUTA_PARQUET = os.path.join(os.path.dirname(__file__), '..', 'data', 'analisis', 'parquet')
+
+# Columnas de partición (directorios fecha=YYYY-MM-DD/score_priorizacion=Alto/)
+COLUMNAS_PARTICION = ['fecha', 'score_priorizacion']
+COLUMNAS_PARQUET = list(dict.fromkeys(COLUMNAS_EXPORTACION + ['fecha_asignacion']
+                                      + CATEGORICAL_FEATURES + NUMERIC_FEATURES))
+
+
+def _particionado():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return ds.partitioning(pa.schema([('fecha', pa.string()), ('score_priorizacion', pa.string())]),
+                           flavor='hive')
+
+
+def _fecha_iso(fecha):
+    return pd.Timestamp(fecha).strftime('%Y-%m-%d')
+
+
+def directorio_fecha(fecha, ruta=RUTA_PARQUET):
+    """Directorio de la partición de una fecha"""
+    return os.path.join(ruta, f'fecha={_fecha_iso(fecha)}')
+
+
+def escribir_consolidado_parquet(df_resultado, fecha=None, parte=0, reemplazar=True, ruta=RUTA_PARQUET):
+    """
+    Agregar el consolidado de una ejecución al dataset
+
+    Parameters:
+    -----------
+    df_resultado : pd.DataFrame
+        Salida de generar_predicciones
+    fecha : str or date, optional
+        Fecha de la partición (por defecto hoy)
+    parte : int
+        Número de bloque; cada bloque escribe sus propios archivos
+    reemplazar : bool
+        Borrar antes la partición de la fecha (re-ejecuciones del mismo día).
+        En modo por bloques solo el primer bloque reemplaza
+
+    Returns:
+    --------
+    str
+        Directorio de la partición de la fecha, o None si pyarrow no está instalado
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError:
+        print("⚠️ pyarrow no está instalado: se omite el histórico Parquet")
+        return None
+
+    fecha = _fecha_iso(fecha or datetime.now())
+    directorio = directorio_fecha(fecha, ruta)
+    if reemplazar and os.path.exists(directorio):
+        shutil.rmtree(directorio)
+
+    df = df_resultado[COLUMNAS_PARQUET].assign(fecha=fecha)
+    df['score_priorizacion'] = df['score_priorizacion'].astype(str)
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    ds.write_dataset(tabla, ruta, format='parquet', partitioning=_particionado(),
+                     basename_template=f'parte-{parte}-{{i}}.parquet',
+                     existing_data_behavior='overwrite_or_ignore')
+    print(f"✅ Parquet: fecha={fecha} ({len(df)} registros)")
+    return directorio
+
+
+def abrir_dataset(ruta=RUTA_PARQUET):
+    """Dataset de pyarrow sobre el histórico (no lee datos hasta filtrar/materializar)"""
+    import pyarrow.dataset as ds
+    return ds.dataset(ruta, format='parquet', partitioning=_particionado())
+
+
+def leer_consolidado(desde=None, hasta=None, scores=None, columnas=None, filtro=None, ruta=RUTA_PARQUET):
+    """
+    Cargar un rango de fechas del histórico
+
+    Los filtros de fecha y score descartan directorios completos; `filtro`
+    (expresión de pyarrow.dataset, p. ej. `ds.field('mes') == 1`) se empuja
+    a los row groups. Solo se leen las columnas pedidas.
+
+    Parameters:
+    -----------
+    desde, hasta : str or date, optional
+        Rango de fechas de ejecución (inclusivo)
+    scores : list, optional
+        Subconjunto de ['Alto', 'Medio', 'Bajo']
+    columnas : list, optional
+        Columnas a cargar (por defecto todas, más fecha y score)
+
+    Returns:
+    --------
+    pd.DataFrame
+    """
+    import pyarrow.dataset as ds
+
+    if not os.path.exists(ruta):
+        print(f"⚠️ No existe el histórico Parquet: {os.path.normpath(ruta)}")
+        return pd.DataFrame(columns=columnas or COLUMNAS_PARQUET + ['fecha'])
+
+    condiciones = []
+    if desde is not None:
+        condiciones.append(ds.field('fecha') >= _fecha_iso(desde))
+    if hasta is not None:
+        condiciones.append(ds.field('fecha') <= _fecha_iso(hasta))
+    if scores:
+        condiciones.append(ds.field('score_priorizacion').isin(list(scores)))
+    if filtro is not None:
+        condiciones.append(filtro)
+
+    expresion = None
+    for condicion in condiciones:
+        expresion = condicion if expresion is None else expresion & condicion
+
+    if columnas is not None:
+        columnas = list(dict.fromkeys(list(columnas) + COLUMNAS_PARTICION))
+    tabla = abrir_dataset(ruta).to_table(columns=columnas, filter=expresion)
+    return tabla.to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumen del histórico Parquet de análisis')
+    parser.add_argument('--desde', default=None)
+    parser.add_argument('--hasta', default=None)
+    args = parser.parse_args()
+
+    df = leer_consolidado(args.desde, args.hasta, columnas=['probabilidad_conversion'])
+    if len(df) == 0:
+        print("⚠️ Sin datos en el rango")
+        return
+    resumen = df.groupby(['fecha', 'score_priorizacion'], observed=True)['probabilidad_conversion'].agg(['count', 'mean'])
+    print(resumen.unstack('score_priorizacion').to_string())
+
+
+if __name__ == "__main__":
+    main()
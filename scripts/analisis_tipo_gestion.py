@@ -1,10 +1,15 @@
 """
 Análisis por Tipo de Gestión - Diagnóstico Profundo
 Evalúa si el modelo funciona mejor segmentando por tipo
+
+Las distribuciones del training salen del perfil que guarda el
+reentrenamiento (models/perfil_entrenamiento_precontacto.json); con
+--historico se recalculan leyendo la tabla completa
 """
 
 import sys
 import os
+import argparse
 import pandas as pd
 import numpy as np
 import pickle
@@ -12,42 +17,90 @@ import warnings
 warnings.filterwarnings('ignore')
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-from database import get_engine, query_to_dataframe
+from database import get_engine, queries_en_paralelo, query_to_dataframe
+from categorizacion import cargar_reglas
+from esquema import parametros_periodo
+from drift import cargar_perfil
+from prediccion_diaria import cargar_query_proyectado
 
-def cargar_datos_training():
-    """Cargar datos de training para comparar"""
-    engine = get_engine()
-    query = """
+# Datos de training para comparar
+QUERY_TRAINING = """
     SELECT 
         tipo_de_gestion,
         categoria_empresa,
         categoria_cargo,
+        fecha_asignacion,
         conversion
     FROM tb_modelo_conversion_intermediacion
     """
-    df = query_to_dataframe(query, engine)
-    print(f"✅ Training data: {len(df):,} registros")
-    return df
 
-def cargar_query_sql(nombre_archivo):
-    sql_path = os.path.join(os.path.dirname(__file__), '..', 'sql', nombre_archivo)
-    with open(sql_path, 'r', encoding='utf-8') as f:
-        return f.read()
+def resumen_desde_perfil(perfil):
+    """Distribuciones del training a partir del perfil (sin leer la tabla)"""
+    tipos = perfil['features']['tipo_de_gestion']
+    reciente = perfil['reciente']
+    return {
+        'origen': f"perfil del entrenamiento del {perfil['fecha']}",
+        'total': perfil['filas'],
+        'tipos': pd.Series(tipos['conteos']).sort_values(ascending=False),
+        'conversiones_tipo': pd.Series(tipos['conversiones']),
+        'empresas': pd.Series(perfil['features']['categoria_empresa']['conteos']).sort_values(ascending=False),
+        'dias_recientes': reciente['dias'],
+        'total_reciente': reciente['filas'],
+        'empresas_recientes': pd.Series(reciente['features']['categoria_empresa']['conteos']).sort_values(ascending=False),
+    }
+
+def resumen_desde_tabla(df_train, dias_recientes=60):
+    """Las mismas distribuciones leyendo tb_modelo_conversion_intermediacion completa"""
+    fechas = pd.to_datetime(df_train['fecha_asignacion'])
+    df_recent = df_train[fechas >= pd.Timestamp.now() - pd.Timedelta(days=dias_recientes)]
+    return {
+        'origen': 'tb_modelo_conversion_intermediacion',
+        'total': len(df_train),
+        'tipos': df_train['tipo_de_gestion'].value_counts(),
+        'conversiones_tipo': df_train.groupby('tipo_de_gestion')['conversion'].sum(),
+        'empresas': df_train['categoria_empresa'].value_counts(),
+        'dias_recientes': dias_recientes,
+        'total_reciente': len(df_recent),
+        'empresas_recientes': df_recent['categoria_empresa'].value_counts(),
+    }
 
 def main():
+    parser = argparse.ArgumentParser(description='Análisis por tipo de gestión')
+    parser.add_argument('--historico', action='store_true',
+                        help='Leer la tabla de training completa en lugar del perfil del entrenamiento')
+    args = parser.parse_args()
+    
     print("\n" + "="*50)
     print("🔍 ANÁLISIS POR TIPO DE GESTIÓN")
     print("="*50 + "\n")
     
-    # 1. Cargar training data
-    print("📦 Cargando datos históricos...")
-    df_train = cargar_datos_training()
-    
-    # 2. Cargar datos de hoy
-    print("📊 Cargando asignaciones de hoy...")
     engine = get_engine()
-    query = cargar_query_sql('query_asignaciones_diarias.sql')
-    df_hoy = query_to_dataframe(query, engine)
+    if engine is None:
+        return
+    
+    # 1-2. Training (perfil o tabla completa) y asignaciones de hoy
+    perfil = None if args.historico else cargar_perfil()
+    # Mismo query proyectado y parámetros que la predicción diaria: misma clave en la caché de queries
+    query_hoy = cargar_query_proyectado('query_asignaciones_diarias.sql')
+    if query_hoy is None:
+        return
+    if perfil is not None:
+        print("📦 Cargando asignaciones de hoy (training desde el perfil)...")
+        training = resumen_desde_perfil(perfil)
+        df_hoy = query_to_dataframe(query_hoy, engine, params=parametros_periodo(), cache=True)
+    else:
+        print("📦 Cargando datos históricos y asignaciones de hoy...")
+        datos = queries_en_paralelo({
+            'training': QUERY_TRAINING,
+            'hoy': (query_hoy, parametros_periodo()),
+        }, engine, cache=True)
+        if datos['training'] is None:
+            return
+        training = resumen_desde_tabla(datos['training'])
+        df_hoy = datos['hoy']
+    if df_hoy is None:
+        return
+    print(f"✅ Training data: {training['total']:,} registros ({training['origen']})")
     print(f"✅ Hoy: {len(df_hoy):,} registros")
     
     # 3. Análisis de tipo de gestión
@@ -56,8 +109,8 @@ def main():
     print("="*50)
     
     print("\n🕐 En TRAINING (histórico):")
-    train_tipos = df_train['tipo_de_gestion'].value_counts()
-    train_tipos_pct = (train_tipos / len(df_train) * 100).round(1)
+    train_tipos = training['tipos']
+    train_tipos_pct = (train_tipos / training['total'] * 100).round(1)
     for tipo, count in train_tipos.head(10).items():
         pct = train_tipos_pct[tipo]
         print(f"  {tipo}: {count:,} ({pct}%)")
@@ -74,10 +127,11 @@ def main():
     print("📈 TASA DE CONVERSIÓN POR TIPO (Training)")
     print("="*50)
     
-    conversion_por_tipo = df_train.groupby('tipo_de_gestion').agg({
-        'conversion': ['sum', 'count', 'mean']
-    }).round(4)
-    conversion_por_tipo.columns = ['Conversiones', 'Total', 'Tasa']
+    conversion_por_tipo = pd.DataFrame({
+        'Conversiones': training['conversiones_tipo'].reindex(training['tipos'].index, fill_value=0),
+        'Total': training['tipos'],
+    })
+    conversion_por_tipo['Tasa'] = (conversion_por_tipo['Conversiones'] / conversion_por_tipo['Total']).round(4)
     conversion_por_tipo['Tasa_%'] = (conversion_por_tipo['Tasa'] * 100).round(2)
     conversion_por_tipo = conversion_por_tipo.sort_values('Tasa_%', ascending=False)
     
@@ -101,27 +155,16 @@ def main():
     
     print("\n📊 Top 5 Empresas:")
     print("\nTraining:")
-    train_emp = df_train['categoria_empresa'].value_counts().head(5)
-    train_emp_pct = (train_emp / len(df_train) * 100).round(1)
+    train_emp = training['empresas'].head(5)
+    train_emp_pct = (train_emp / training['total'] * 100).round(1)
     for emp, count in train_emp.items():
         print(f"  {emp}: {train_emp_pct[emp]}%")
     
-    # Categorizar empresas de hoy (simplificado)
-    def categorizar_empresa_simple(empresa):
-        if pd.isna(empresa):
-            return 'otras'
-        empresa_upper = str(empresa).upper()
-        if 'MANEJO TECNICO' in empresa_upper or 'DICO' in empresa_upper or 'ATENTO' in empresa_upper:
-            return 'bpo_callcenter'
-        elif 'PRODUCTIVIDAD' in empresa_upper or 'TEMPORIZAR' in empresa_upper or 'MANPOWER' in empresa_upper:
-            return 'servicios_temporales'
-        else:
-            return 'otras'
-    
-    df_hoy['categoria_empresa_simple'] = df_hoy['empresa'].apply(categorizar_empresa_simple)
+    # Categorizar empresas de hoy con las mismas reglas del training
+    df_hoy['categoria_empresa'] = cargar_reglas()['categoria_empresa'].categorizar(df_hoy['empresa'])
     
     print("\nHoy:")
-    hoy_emp = df_hoy['categoria_empresa_simple'].value_counts().head(5)
+    hoy_emp = df_hoy['categoria_empresa'].value_counts().head(5)
     hoy_emp_pct = (hoy_emp / len(df_hoy) * 100).round(1)
     for emp, count in hoy_emp.items():
         print(f"  {emp}: {hoy_emp_pct[emp]}%")
@@ -132,7 +175,7 @@ def main():
     print("="*50)
     
     # Calcular overlap de tipos
-    tipos_train = set(df_train['tipo_de_gestion'].unique())
+    tipos_train = set(training['tipos'].index)
     tipos_hoy = set(df_hoy['tipo_de_gestion'].unique())
     tipos_comunes = tipos_train.intersection(tipos_hoy)
     
@@ -155,8 +198,9 @@ def main():
         print("   La composición de HOY es MUY diferente al training")
         print("   BPO domina hoy pero era minoría en training")
         print("\n💡 SOLUCIONES POSIBLES:")
-        print("   1. Reentrenar SOLO con meses recientes (nov-dic)")
-        print("   2. Modelo separado por tipo de gestión")
+        print("   1. Reentrenar SOLO con meses recientes: python scripts/entrenamiento.py --ventana-meses 2")
+        print("   2. Modelo separado por tipo de gestión: python scripts/entrenamiento.py --segmentar tipo_de_gestion "
+              "--ventana-meses 2 (y prediccion_diaria.py --segmentado)")
         print("   3. Calibración por segmento")
     else:
         print("\n✅ La composición es similar")
@@ -167,35 +211,30 @@ def main():
     print("🔬 SIMULACIÓN: ¿Y si entrenamos solo con Nov-Dic?")
     print("="*50)
     
-    # Filtrar últimos 2 meses del training
-    df_train['fecha_asignacion'] = pd.to_datetime(df_train.get('fecha_asignacion', pd.Timestamp.now()))
-    cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=60)
-    
-    if 'fecha_asignacion' in df_train.columns:
-        df_recent = df_train[df_train['fecha_asignacion'] >= cutoff_date]
+    # Últimos días del training (el perfil los resume aparte)
+    dias = training['dias_recientes']
+    if training['total_reciente'] > 1000:
+        print(f"\n📊 Datos recientes disponibles: {training['total_reciente']:,}")
+        
+        recent_emp = training['empresas_recientes'].head(5)
+        recent_emp_pct = (recent_emp / training['total_reciente'] * 100).round(1)
         
-        if len(df_recent) > 1000:
-            print(f"\n📊 Datos recientes disponibles: {len(df_recent):,}")
-            
-            recent_emp = df_recent['categoria_empresa'].value_counts().head(5)
-            recent_emp_pct = (recent_emp / len(df_recent) * 100).round(1)
-            
-            print("\nTop 5 empresas en últimos 60 días:")
-            for emp, count in recent_emp.items():
-                diff = recent_emp_pct[emp] - train_emp_pct.get(emp, 0)
-                arrow = "📈" if diff > 0 else "📉"
-                print(f"  {emp}: {recent_emp_pct[emp]}% {arrow} ({diff:+.1f}pp vs. histórico)")
-            
-            # Calcular si hay más BPO recientemente
-            bpo_recent = recent_emp_pct.get('bpo_callcenter', 0)
-            bpo_train = train_emp_pct.get('bpo_callcenter', 0)
-            
-            if bpo_recent > bpo_train + 10:
-                print("\n✅ HALLAZGO IMPORTANTE:")
-                print(f"   BPO ha aumentado recientemente ({bpo_recent}% vs. {bpo_train}% histórico)")
-                print("   Reentrenar con datos recientes MEJORARÍA el modelo")
-        else:
-            print("\n⚠️ Pocos datos recientes disponibles")
+        print(f"\nTop 5 empresas en últimos {dias} días:")
+        for emp, count in recent_emp.items():
+            diff = recent_emp_pct[emp] - train_emp_pct.get(emp, 0)
+            arrow = "📈" if diff > 0 else "📉"
+            print(f"  {emp}: {recent_emp_pct[emp]}% {arrow} ({diff:+.1f}pp vs. histórico)")
+        
+        # Calcular si hay más BPO recientemente
+        bpo_recent = recent_emp_pct.get('bpo_callcenter', 0)
+        bpo_train = train_emp_pct.get('bpo_callcenter', 0)
+        
+        if bpo_recent > bpo_train + 10:
+            print("\n✅ HALLAZGO IMPORTANTE:")
+            print(f"   BPO ha aumentado recientemente ({bpo_recent}% vs. {bpo_train}% histórico)")
+            print("   Reentrenar con datos recientes MEJORARÍA el modelo")
+    else:
+        print("\n⚠️ Pocos datos recientes disponibles")
     
     print("\n" + "="*50)
     print("✅ ANÁLISIS COMPLETADO")
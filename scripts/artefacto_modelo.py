@@ -0,0 +1,196 @@
+"""
+Artefacto de scoring del modelo
+Empaqueta el booster en formato nativo de XGBoost (UBJSON) junto con las
+columnas y la metadata del codificador, y lo carga sin importar xgboost en
+el hilo principal: la importación (xgboost arrastra sklearn y scipy) y la
+carga del booster corren en segundo plano mientras el script consulta la base.
+Solo xgboost se difiere (pandas, numpy y sqlalchemy se importan al inicio);
+benchmarks/benchmark_arranque.py mide ~1 s menos hasta la primera predicción.
+
+El bundle es un artefacto generado (no se versiona): su huella incluye los
+pickles y la versión de xgboost instalada, así se regenera si cambia cualquiera
+"""
+
+import os
+import json
+import pickle
+import threading
+import importlib.metadata
+import numpy as np
+
+from estado_scoring import calcular_huella
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'modelo_conversion_precontacto.pkl')
+COLUMNS_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'model_columns_precontacto.pkl')
+RUTA_BUNDLE = os.path.join(os.path.dirname(__file__), '..', 'models', 'bundle_precontacto')
+
+ARCHIVO_BOOSTER = 'booster.ubj'
+ARCHIVO_METADATA = 'metadata.json'
+VERSION_FORMATO = 1
+
+
+def version_xgboost():
+    """Versión instalada de xgboost sin importarlo ('' si no está instalado)"""
+    try:
+        return importlib.metadata.version('xgboost')
+    except importlib.metadata.PackageNotFoundError:
+        return ''
+
+
+def huella_bundle(ruta_modelo=MODEL_PATH, ruta_columnas=COLUMNS_PATH):
+    """Huella de los pickles de origen + versión de xgboost con que se exporta/carga el booster"""
+    return calcular_huella([ruta_modelo, ruta_columnas], extra=version_xgboost())
+
+
+def exportar_bundle(ruta_modelo=MODEL_PATH, ruta_columnas=COLUMNS_PATH, ruta=RUTA_BUNDLE):
+    """
+    Generar el bundle a partir del pickle del entrenamiento
+
+    Returns:
+    --------
+    xgboost.Booster
+        El booster exportado (ya cargado, para no volver a leerlo)
+    """
+    import xgboost as xgb
+    from codificador import CodificadorOneHot
+
+    with open(ruta_modelo, 'rb') as f:
+        modelo = pickle.load(f)
+    with open(ruta_columnas, 'rb') as f:
+        columnas_modelo = pickle.load(f)
+
+    booster = modelo.get_booster()
+    mejor_iteracion = getattr(modelo, 'best_iteration', None)
+    codificador = CodificadorOneHot(columnas_modelo)
+    metadata = {
+        'version_formato': VERSION_FORMATO,
+        'huella_origen': huella_bundle(ruta_modelo, ruta_columnas),
+        'version_xgboost': xgb.__version__,
+        'objetivo': modelo.get_params().get('objective'),
+        'iteraciones': [0, mejor_iteracion + 1] if mejor_iteracion is not None else None,
+        'columnas': list(columnas_modelo),
+        'categorical_features': codificador.categorical_features,
+        'numeric_features': codificador.numeric_features,
+        'codificador': codificador.categorias,
+    }
+
+    os.makedirs(ruta, exist_ok=True)
+    booster.save_model(os.path.join(ruta, ARCHIVO_BOOSTER))
+    with open(os.path.join(ruta, ARCHIVO_METADATA), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    print(f"✅ Bundle del modelo exportado: {os.path.normpath(ruta)}")
+    return booster
+
+
+def leer_metadata(ruta=RUTA_BUNDLE):
+    """Metadata del bundle (solo json, sin importar xgboost); None si no existe"""
+    ruta_metadata = os.path.join(ruta, ARCHIVO_METADATA)
+    if not os.path.exists(ruta_metadata) or not os.path.exists(os.path.join(ruta, ARCHIVO_BOOSTER)):
+        return None
+    with open(ruta_metadata, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ModeloBooster:
+    """
+    Booster nativo con la interfaz de XGBClassifier que usa el scoring
+
+    `predict_proba` da los mismos valores que el XGBClassifier original:
+    el wrapper de sklearn también llama a `inplace_predict` y arma la
+    columna de la clase 0 como 1 - p.
+    """
+
+    def __init__(self, booster, metadata):
+        self.booster = booster
+        self.metadata = metadata
+        self.iteraciones = tuple(metadata['iteraciones']) if metadata.get('iteraciones') else (0, 0)
+
+    def predict_proba(self, X):
+        p = self.booster.inplace_predict(X, iteration_range=self.iteraciones)
+        return np.vstack((1.0 - p, p)).T
+
+
+class ModeloDiferido:
+    """
+    Modelo que termina de cargarse en un hilo
+
+    `predict_proba` espera a que el hilo termine (normalmente ya terminó,
+    porque entre la carga y la primera predicción está el query). Mientras
+    el hilo corre no se debe importar xgboost desde otro hilo (por ejemplo
+    con pickle.load de un XGBClassifier): llamar antes a `obtener()`.
+    """
+
+    def __init__(self, cargar):
+        self._modelo = None
+        self._error = None
+        self._hilo = threading.Thread(target=self._ejecutar, args=(cargar,), daemon=True)
+        self._hilo.start()
+
+    def _ejecutar(self, cargar):
+        try:
+            self._modelo = cargar()
+        except Exception as e:
+            self._error = e
+
+    def obtener(self):
+        self._hilo.join()
+        if self._error is not None:
+            print(f"❌ Error al cargar el booster: {self._error}")
+            raise self._error
+        return self._modelo
+
+    def predict_proba(self, X):
+        return self.obtener().predict_proba(X)
+
+
+def cargar_modelo_scoring(ruta=RUTA_BUNDLE, ruta_modelo=MODEL_PATH, ruta_columnas=COLUMNS_PATH, diferido=True):
+    """
+    Cargar modelo y columnas para el scoring
+
+    Lee las columnas de la metadata y deja la importación de xgboost y la
+    carga del booster a un hilo (`diferido=False` espera la carga). Si el
+    bundle no existe o no corresponde al pickle actual, se regenera.
+
+    Returns:
+    --------
+    tuple
+        (modelo con predict_proba, lista de columnas); (None, None) si hay error
+    """
+    try:
+        metadata = leer_metadata(ruta)
+        vigente = (metadata is not None and metadata.get('version_formato') == VERSION_FORMATO
+                   and metadata.get('huella_origen') == huella_bundle(ruta_modelo, ruta_columnas))
+
+        if vigente:
+            def cargar():
+                import xgboost as xgb
+                booster = xgb.Booster()
+                booster.load_model(os.path.join(ruta, ARCHIVO_BOOSTER))
+                return ModeloBooster(booster, metadata)
+            columnas_modelo = metadata['columnas']
+        else:
+            print("⚠️ Bundle del modelo ausente o desactualizado: se regenera desde el pickle")
+            with open(ruta_columnas, 'rb') as f:
+                columnas_modelo = pickle.load(f)
+
+            def cargar():
+                booster = exportar_bundle(ruta_modelo, ruta_columnas, ruta)
+                return ModeloBooster(booster, leer_metadata(ruta))
+
+        modelo = ModeloDiferido(cargar)
+        if not diferido:
+            modelo = modelo.obtener()
+
+        print("✅ Modelo cargado")
+        return modelo, columnas_modelo
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return None, None
+
+
+def main():
+    exportar_bundle()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Backfill del scoring
+Re-puntúa un rango de fechas completo (p. ej. un trimestre después de
+reentrenar) en varios procesos. El rango se parte en particiones de
+--dias-particion días que no cruzan meses (cada una con su periodo); cada
+proceso lee su partición (de la BD o de un Parquet con --entrada), la
+preprocesa y puntúa, y escribe sus propios archivos en el dataset Parquet
+del backfill. Con --exportar, los Excel/CSV se arman en el proceso principal
+en el orden de las particiones (los Excel hasta el límite de filas de una
+hoja; los CSV completos).
+
+El modelo, las columnas y las reglas de categorización se cargan una vez
+en el proceso principal y los procesos del pool los heredan con fork (sin
+volver a leer ni deserializar nada); cada proceso arma su propia tabla de
+inferencia y usa un hilo de XGBoost para no sobresuscribir la CPU. Donde no
+hay fork (Windows) cada proceso carga el modelo al iniciar.
+
+Uso:
+    python scripts/backfill_scoring.py --desde 2026-01-01 --hasta 2026-04-01
+    python scripts/backfill_scoring.py --desde 2026-01-01 --hasta 2026-04-01 --entrada data/asignaciones_q1.parquet --exportar
+"""
+
+import sys
+import os
+import time
+import shutil
+import argparse
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from database import get_engine, query_to_dataframe
+from categorizacion import cargar_reglas
+from esquema import COLUMNAS_EXPORTACION, columnas_requeridas, compactar_tipos
+from artefacto_modelo import cargar_modelo_scoring
+from inferencia import InferenciaTabla
+from pipeline_features import crear_pipeline
+from prediccion_diaria import cargar_query_proyectado, preprocesar_datos, generar_predicciones
+from analisis_parquet import directorio_fecha, escribir_consolidado_parquet
+from exportacion import SCORES, ExportadorIncremental
+from instrumentacion import iniciar_corrida, finalizar_corrida, registrar_span
+
+RUTA_BACKFILL = os.path.join(os.path.dirname(__file__), '..', 'data', 'analisis', 'backfill')
+
+# Estado de cada proceso del pool (heredado con fork o cargado por _inicializar_proceso)
+_modelo = None
+_columnas_modelo = None
+_tabla = None
+
+
+def particiones_fecha(desde, hasta, dias=7):
+    """
+    Partir [desde, hasta) en rangos de `dias` días sin cruzar meses
+
+    Returns:
+    --------
+    list
+        Dicts con indice, periodo, fecha_desde (incluida) y fecha_hasta (excluida)
+    """
+    inicio = pd.Timestamp(desde).normalize()
+    fin = pd.Timestamp(hasta).normalize()
+    particiones = []
+    while inicio < fin:
+        siguiente = min(inicio + pd.Timedelta(days=dias), inicio + pd.offsets.MonthBegin(1), fin)
+        particiones.append({
+            'indice': len(particiones),
+            'periodo': int(inicio.strftime('%Y%m')),
+            'fecha_desde': inicio.strftime('%Y-%m-%d'),
+            'fecha_hasta': siguiente.strftime('%Y-%m-%d'),
+        })
+        inicio = siguiente
+    return particiones
+
+
+def _inicializar_proceso(hilos, cargar):
+    """Hilos de XGBoost por proceso; sin fork, cargar aquí el modelo (una vez por proceso)"""
+    global _modelo, _columnas_modelo, _tabla
+    if cargar:
+        _modelo, _columnas_modelo = cargar_modelo_scoring(diferido=False)
+    _modelo.booster.set_param({'nthread': hilos})
+    _tabla = InferenciaTabla(_modelo, _columnas_modelo)
+
+
+def leer_particion(particion, entrada=None):
+    """Asignaciones de la partición: del Parquet `entrada` (ya filtrado) o de la BD"""
+    if entrada:
+        return pd.read_parquet(entrada, columns=columnas_requeridas(), filters=[
+            ('fecha_asignacion', '>=', pd.Timestamp(particion['fecha_desde'])),
+            ('fecha_asignacion', '<', pd.Timestamp(particion['fecha_hasta'])),
+        ])
+    query = cargar_query_proyectado('query_asignaciones_rango.sql')
+    engine = get_engine()
+    if query is None or engine is None:
+        return None
+    params = {k: particion[k] for k in ('periodo', 'fecha_desde', 'fecha_hasta')}
+    return query_to_dataframe(query, engine, params=params, cache=False)
+
+
+def puntuar_particion(particion, entrada, ruta_parquet, fecha, exportar):
+    """
+    Leer, preprocesar y puntuar una partición y escribir su parte del Parquet
+
+    Returns:
+    --------
+    dict
+        particion, filas, conteos por score, segundos (lectura y puntuación),
+        pid, error y, con `exportar`, las columnas de exportación
+    """
+    resultado = {'particion': particion, 'filas': 0, 'conteos': {}, 'pid': os.getpid(), 'error': None,
+                 'exportacion': None}
+    try:
+        inicio = time.perf_counter()
+        df = leer_particion(particion, entrada)
+        if df is None:
+            resultado['error'] = 'no se pudieron leer las asignaciones'
+            return resultado
+        resultado['segundos_lectura'] = time.perf_counter() - inicio
+        if len(df) > 0:
+            df = generar_predicciones(preprocesar_datos(compactar_tipos(df), crear_pipeline(), verbose=False),
+                                      _tabla, _columnas_modelo, verbose=False)
+            if ruta_parquet:
+                escribir_consolidado_parquet(df, fecha, parte=particion['indice'], reemplazar=False, ruta=ruta_parquet)
+            resultado['filas'] = len(df)
+            resultado['conteos'] = df['score_priorizacion'].value_counts().to_dict()
+            if exportar:
+                resultado['exportacion'] = df[COLUMNAS_EXPORTACION]
+        resultado['segundos'] = time.perf_counter() - inicio
+    except Exception as e:
+        resultado['error'] = f'{type(e).__name__}: {e}'
+    return resultado
+
+
+def ejecutar_backfill(particiones, modelo, columnas_modelo, entrada=None, max_workers=None, ruta_parquet=RUTA_BACKFILL,
+                      fecha=None, exportar=False, directorio=None):
+    """
+    Puntuar las particiones en un pool de procesos
+
+    Parameters:
+    -----------
+    particiones : list
+        Salida de particiones_fecha
+    modelo, columnas_modelo :
+        Salida de cargar_modelo_scoring(diferido=False) (ModeloBooster)
+    entrada : str, optional
+        Parquet con las asignaciones (columnas crudas); si no, se leen de la BD
+    max_workers : int, optional
+        Procesos (por defecto uno por CPU, sin pasar del número de particiones)
+    ruta_parquet : str or None
+        Dataset Parquet del backfill (None no escribe)
+    fecha : str, optional
+        Partición `fecha=` del dataset (por defecto hoy); se reemplaza completa
+    exportar : bool
+        Además escribir Excel/CSV (mismos archivos que la predicción diaria) en `directorio`
+
+    Returns:
+    --------
+    dict
+        filas, conteos, segundos, procesos, particiones con error, archivos y,
+        con `exportar`, los Excel que no alcanzaron a tener todas las filas
+    """
+    global _modelo, _columnas_modelo
+    fecha = fecha or datetime.now().strftime('%Y-%m-%d')
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(particiones)))
+    hilos = max(1, (os.cpu_count() or 1) // max_workers)
+    fork = 'fork' in multiprocessing.get_all_start_methods()
+
+    # Reglas compiladas y modelo en memoria antes de crear el pool: los procesos los heredan
+    cargar_reglas()
+    _modelo, _columnas_modelo = modelo, columnas_modelo
+    archivos = []
+    if ruta_parquet:
+        # Re-ejecutar el backfill del mismo día reemplaza su partición; cada proceso agrega sus archivos
+        directorio_parquet = directorio_fecha(fecha, ruta_parquet)
+        if os.path.exists(directorio_parquet):
+            shutil.rmtree(directorio_parquet)
+        archivos.append(directorio_parquet)
+
+    print(f"\n🧮 {len(particiones)} particiones en {max_workers} procesos x {hilos} hilos"
+          + ("" if fork or max_workers == 1 else " (sin fork: cada proceso carga el modelo)"))
+    inicio = time.perf_counter()
+    argumentos = (entrada, ruta_parquet, fecha, exportar)
+    if max_workers == 1:
+        _inicializar_proceso(hilos, cargar=False)
+        resultados = (puntuar_particion(p, *argumentos) for p in particiones)
+        executor = None
+    else:
+        contexto = multiprocessing.get_context('fork' if fork else 'spawn')
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto,
+                                       initializer=_inicializar_proceso, initargs=(hilos, not fork))
+        # map entrega en el orden de las particiones (los Excel quedan en orden de fecha)
+        resultados = executor.map(puntuar_particion, particiones, *[[a] * len(particiones) for a in argumentos])
+
+    exportador = None
+    resumen = {'filas': 0, 'conteos': {score: 0 for score in SCORES}, 'errores': [], 'procesos': max_workers}
+    try:
+        for r in resultados:
+            p = r['particion']
+            etiqueta = f"{p['fecha_desde']} a {p['fecha_hasta']}"
+            if r['error']:
+                print(f"❌ {etiqueta}: {r['error']}")
+                resumen['errores'].append(etiqueta)
+                continue
+            print(f"✅ {etiqueta}: {r['filas']:>10,} filas en {r['segundos']:.1f} s (proceso {r['pid']})")
+            registrar_span('particion', r['segundos'], r['filas'], desde=p['fecha_desde'], hasta=p['fecha_hasta'],
+                           segundos_lectura=round(r['segundos_lectura'], 4), proceso=r['pid'])
+            resumen['filas'] += r['filas']
+            for score, n in r['conteos'].items():
+                resumen['conteos'][score] = resumen['conteos'].get(score, 0) + n
+
+            df_export = r.pop('exportacion')
+            if df_export is None or len(df_export) == 0:
+                continue
+            if exportador is None:
+                exportador = ExportadorIncremental(directorios=(directorio,) * 3 if directorio else None)
+            # Los Excel se llenan hasta el límite de una hoja; los CSV reciben todas las filas
+            exportador.agregar(df_export)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if exportador is not None:
+        archivos.extend(exportador.cerrar())
+        resumen['excel_incompletos'] = ['Consolidado' if clave is None else clave
+                                        for clave in exportador.excel_incompletos]
+    resumen['segundos'] = time.perf_counter() - inicio
+    resumen['archivos'] = archivos
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill del scoring en varios procesos')
+    parser.add_argument('--desde', required=True, help='Primera fecha de asignación (YYYY-MM-DD, incluida)')
+    parser.add_argument('--hasta', required=True, help='Última fecha de asignación (YYYY-MM-DD, excluida)')
+    parser.add_argument('--dias-particion', type=int, default=7,
+                        help='Días por partición (particiones chicas reparten mejor la carga entre procesos)')
+    parser.add_argument('--max-workers', type=int, default=None, help='Procesos (por defecto uno por CPU)')
+    parser.add_argument('--entrada', default=None,
+                        help='Parquet con las asignaciones ya filtradas (en lugar de la BD)')
+    parser.add_argument('--salida', default=RUTA_BACKFILL, help='Dataset Parquet del backfill')
+    parser.add_argument('--fecha', default=None,
+                        help='Partición fecha= del dataset (por defecto hoy); se reemplaza completa')
+    parser.add_argument('--exportar', action='store_true',
+                        help='Además escribir Excel/CSV (como la predicción diaria) en --salida/archivos')
+    parser.add_argument('--perfil', action='store_true', help='Guardar un cProfile del proceso principal')
+    args = parser.parse_args()
+
+    particiones = particiones_fecha(args.desde, args.hasta, args.dias_particion)
+    if not particiones:
+        parser.error('--hasta debe ser posterior a --desde')
+
+    print("\n" + "="*50)
+    print(f"🔁 BACKFILL DEL SCORING {args.desde} a {args.hasta}")
+    print("="*50)
+
+    corrida = iniciar_corrida('backfill_scoring', argumentos=vars(args), perfil=args.perfil)
+    estado = 'error'
+    try:
+        modelo, columnas_modelo = cargar_modelo_scoring(diferido=False)
+        if modelo is None:
+            estado = 'sin modelo'
+            return
+        directorio = os.path.join(args.salida, 'archivos') if args.exportar else None
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        resumen = ejecutar_backfill(particiones, modelo, columnas_modelo, entrada=args.entrada,
+                                    max_workers=args.max_workers, ruta_parquet=args.salida, fecha=args.fecha,
+                                    exportar=args.exportar, directorio=directorio)
+        corrida.agregar_archivos(resumen['archivos'])
+        corrida.datos['backfill'] = {k: resumen[k] for k in ('filas', 'conteos', 'procesos', 'errores')}
+        estado = 'con errores' if resumen['errores'] else 'ok'
+
+        conteos = resumen['conteos']
+        velocidad = resumen['filas'] / resumen['segundos'] if resumen['segundos'] else 0
+        print("\n" + "="*50)
+        print(f"{'✅' if not resumen['errores'] else '⚠️'} {resumen['filas']:,} asignaciones en "
+              f"{resumen['segundos']:.1f} s ({velocidad:,.0f} filas/s, {resumen['procesos']} procesos)")
+        print(f"   Alto={conteos.get('Alto', 0):,}, Medio={conteos.get('Medio', 0):,}, Bajo={conteos.get('Bajo', 0):,}")
+        if resumen['errores']:
+            print(f"   Particiones con error: {', '.join(resumen['errores'])}")
+        print("="*50)
+    finally:
+        corrida.imprimir()
+        ruta_manifiesto = finalizar_corrida(estado)
+        if ruta_manifiesto:
+            print(f"🧾 Manifiesto de la ejecución: {os.path.normpath(ruta_manifiesto)}\n")
+    if estado != 'ok':
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
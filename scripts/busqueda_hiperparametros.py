@@ -0,0 +1,340 @@
+"""
+Búsqueda de hiperparámetros del XGBoost (successive halving)
+Reemplaza los parámetros fijos del notebook (max_depth=6, n_estimators=200,
+learning_rate=0.1) por una búsqueda con presupuesto de tiempo:
+
+1. Configuraciones al azar (la primera es la del notebook)
+2. Cada ronda evalúa las configuraciones vivas con StratifiedKFold y early
+   stopping, con un máximo de árboles que se multiplica por --factor; pasa
+   a la siguiente ronda solo la mejor fracción 1/--factor
+3. Las pruebas corren en un pool de procesos: cada proceso arma una vez los
+   QuantileDMatrix de los pliegues (features ya discretizadas, ~1 byte por
+   celda) y los reutiliza en todas sus pruebas
+4. La mejor configuración se compara contra la del notebook en el 20% de
+   test y se guarda en models/busqueda_precontacto.json
+
+Uso:
+    python scripts/busqueda_hiperparametros.py --presupuesto-minutos 60
+    python scripts/entrenamiento.py --hiperparametros models/busqueda_precontacto.json
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+from database import get_engine
+from entrenamiento import CANDIDATOS, cargar_o_construir_matriz, cargar_x, split_ventana
+
+RUTA_REPORTE_BUSQUEDA = os.path.join(os.path.dirname(__file__), '..', 'models', 'busqueda_precontacto.json')
+
+# Espacio de búsqueda: listas = valores discretos, tuplas = rango continuo (log si el nombre está en ESCALA_LOG)
+ESPACIO = {
+    'max_depth': [3, 4, 5, 6, 7, 8],
+    'learning_rate': (0.02, 0.3),
+    'subsample': (0.6, 1.0),
+    'colsample_bytree': (0.5, 1.0),
+    'min_child_weight': [1, 2, 5, 10, 20],
+    'reg_lambda': (0.5, 10.0),
+}
+ESCALA_LOG = {'learning_rate', 'reg_lambda'}
+PARAMETROS_NOTEBOOK = {k: CANDIDATOS['xgboost'][k] for k in ['max_depth', 'learning_rate', 'subsample',
+                                                               'colsample_bytree']}
+PARAMETROS_FIJOS = {'objective': 'binary:logistic', 'eval_metric': 'auc', 'tree_method': 'hist', 'seed': 42}
+EARLY_STOPPING = 20
+MAX_BIN = 256
+
+# Pliegues del proceso (se arman una vez en _inicializar_proceso)
+_pliegues = None
+_nthread = 1
+
+
+def muestrear_configuraciones(n, semilla=42):
+    """`n` configuraciones al azar del ESPACIO; la primera es la del notebook"""
+    rng = np.random.default_rng(semilla)
+    configuraciones = [dict(PARAMETROS_NOTEBOOK)]
+    while len(configuraciones) < n:
+        config = {}
+        for nombre, valores in ESPACIO.items():
+            if isinstance(valores, list):
+                config[nombre] = valores[rng.integers(len(valores))]
+            elif nombre in ESCALA_LOG:
+                config[nombre] = float(np.exp(rng.uniform(np.log(valores[0]), np.log(valores[1]))))
+            else:
+                config[nombre] = float(rng.uniform(*valores))
+        configuraciones.append({k: (round(v, 4) if isinstance(v, float) else int(v)) for k, v in config.items()})
+    return configuraciones
+
+
+def rondas_halving(n_configuraciones, arboles_min, factor):
+    """
+    Plan de successive halving
+
+    Returns:
+    --------
+    list
+        [(configuraciones que se evalúan, máximo de árboles)] por ronda
+    """
+    plan = []
+    vivas, arboles = n_configuraciones, arboles_min
+    while vivas >= 1:
+        plan.append((vivas, arboles))
+        if vivas == 1:
+            break
+        vivas, arboles = max(1, vivas // factor), arboles * factor
+    return plan
+
+
+def _inicializar_proceso(archivo, n_pliegues, ventana_meses, nthread):
+    """Armar los QuantileDMatrix de cada pliegue del train una sola vez por proceso"""
+    global _pliegues, _nthread
+    import xgboost as xgb
+    from sklearn.model_selection import StratifiedKFold
+
+    train, _ = split_ventana(archivo, ventana_meses)
+    X = cargar_x(archivo)[train]
+    with np.load(archivo) as datos:
+        y = datos['y'][train]
+
+    _nthread = nthread
+    _pliegues = []
+    for idx_train, idx_valid in StratifiedKFold(n_splits=n_pliegues, shuffle=True, random_state=42).split(X, y):
+        d_train = xgb.QuantileDMatrix(X[idx_train], y[idx_train], max_bin=MAX_BIN, nthread=nthread)
+        d_valid = xgb.QuantileDMatrix(X[idx_valid], y[idx_valid], ref=d_train, nthread=nthread)
+        _pliegues.append((d_train, d_valid))
+
+
+def _corte_por_limite(limite):
+    """Callback de XGBoost que corta el entrenamiento al pasar `limite` (time.time()); None si no hay límite"""
+    if limite is None:
+        return None
+    import xgboost as xgb
+
+    class CortePorLimite(xgb.callback.TrainingCallback):
+        def __init__(self):
+            super().__init__()
+            self.cortado = False
+
+        def after_iteration(self, model, epoch, evals_log):
+            self.cortado = time.time() > limite
+            return self.cortado
+
+    return CortePorLimite()
+
+
+def evaluar_configuracion(id_config, parametros, max_arboles, limite=None):
+    """
+    AUC de validación cruzada de una configuración (corre en el proceso del pool)
+
+    `limite` (time.time() del fin del presupuesto) corta la prueba en curso
+    en la siguiente iteración; la prueba cortada vuelve con interrumpida=True
+    y no cuenta como evaluada.
+
+    Returns:
+    --------
+    dict
+        id, parámetros, árboles máximos, auc medio y desvío, mejor iteración media, segundos (o error)
+    """
+    import xgboost as xgb
+
+    inicio = time.perf_counter()
+    try:
+        aucs, iteraciones = [], []
+        for d_train, d_valid in _pliegues:
+            corte = _corte_por_limite(limite)
+            booster = xgb.train({**PARAMETROS_FIJOS, **parametros, 'nthread': _nthread}, d_train,
+                                num_boost_round=max_arboles, evals=[(d_valid, 'valid')],
+                                early_stopping_rounds=EARLY_STOPPING, verbose_eval=False,
+                                callbacks=[corte] if corte else None)
+            if corte and corte.cortado:
+                return {'id': id_config, 'interrumpida': True}
+            aucs.append(booster.best_score)
+            iteraciones.append(booster.best_iteration + 1)
+        return {'id': id_config, 'parametros': parametros, 'max_arboles': max_arboles,
+                'auc': float(np.mean(aucs)), 'auc_std': float(np.std(aucs)),
+                'arboles': int(round(np.mean(iteraciones))), 'segundos': time.perf_counter() - inicio, 'error': None}
+    except Exception as e:
+        return {'id': id_config, 'parametros': parametros, 'max_arboles': max_arboles, 'auc': None,
+                'auc_std': None, 'arboles': None, 'segundos': time.perf_counter() - inicio, 'error': str(e)}
+
+
+def _imprimir_prueba(r):
+    if r['error']:
+        print(f"   ❌ #{r['id']:<3} {r['error']}")
+    else:
+        print(f"   #{r['id']:<3} AUC={r['auc']:.4f} ±{r['auc_std']:.4f}  árboles={r['arboles']:>4}/{r['max_arboles']:<5} "
+              f"({r['segundos']:.1f} s)  {r['parametros']}")
+
+
+def successive_halving(archivo, configuraciones, arboles_min=50, factor=3, n_pliegues=3, ventana_meses=None,
+                       presupuesto_segundos=None, max_workers=None):
+    """
+    Ejecutar las rondas de successive halving dentro del presupuesto de tiempo
+
+    Al agotarse el presupuesto se cancelan las pruebas pendientes y las que
+    están corriendo se cortan en la siguiente iteración de XGBoost (también
+    dentro de los procesos del pool). La ronda cortada solo reemplaza a la
+    ganadora de la última ronda completa si su mejor prueba terminada tiene
+    mayor AUC: las que terminan primero suelen ser las más baratas, no las
+    mejores. Si se corta la primera ronda, gana la mejor de las terminadas.
+
+    Returns:
+    --------
+    tuple
+        (mejor prueba o None, lista de todas las pruebas terminadas)
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    nthread = max(1, (os.cpu_count() or 1) // max_workers)
+    # time.time() y no perf_counter: el límite se compara también en los procesos del pool
+    limite = time.time() + presupuesto_segundos if presupuesto_segundos else None
+    plan = rondas_halving(len(configuraciones), arboles_min, factor)
+    print(f"\n🔎 Successive halving: {' -> '.join(f'{n} x {a} árboles' for n, a in plan)} "
+          f"({n_pliegues} pliegues, {max_workers} procesos x {nthread} hilos)")
+
+    if max_workers == 1:
+        _inicializar_proceso(archivo, n_pliegues, ventana_meses, nthread)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializar_proceso,
+                                       initargs=(archivo, n_pliegues, ventana_meses, nthread))
+
+    pruebas, mejor = [], None
+    vivas = list(enumerate(configuraciones))
+    try:
+        for ronda, (n, max_arboles) in enumerate(plan, start=1):
+            vivas = vivas[:n]
+            print(f"\n🏁 Ronda {ronda}/{len(plan)}: {len(vivas)} configuraciones, hasta {max_arboles} árboles")
+            terminadas = []
+            if executor is None:
+                for id_config, parametros in vivas:
+                    if limite and time.time() > limite:
+                        break
+                    r = evaluar_configuracion(id_config, parametros, max_arboles, limite)
+                    if r.get('interrumpida'):
+                        break
+                    terminadas.append(r)
+                    _imprimir_prueba(r)
+            else:
+                pendientes = {executor.submit(evaluar_configuracion, id_config, parametros, max_arboles, limite)
+                              for id_config, parametros in vivas}
+                while pendientes:
+                    restante = limite - time.time() if limite else None
+                    if restante is not None and restante <= 0:
+                        break
+                    listas, pendientes = wait(pendientes, timeout=restante, return_when=FIRST_COMPLETED)
+                    for futuro in listas:
+                        r = futuro.result()
+                        if not r.get('interrumpida'):
+                            terminadas.append(r)
+                            _imprimir_prueba(r)
+                for futuro in pendientes:
+                    futuro.cancel()
+
+            incompleta = len(terminadas) < len(vivas)
+            validas = sorted((r for r in terminadas if not r['error']), key=lambda r: -r['auc'])
+            pruebas.extend({**r, 'ronda': ronda} for r in terminadas)
+            if validas and not incompleta:
+                mejor = {**validas[0], 'ronda': ronda}
+                vivas = [(r['id'], r['parametros']) for r in validas]
+            elif validas and (mejor is None or validas[0]['auc'] > mejor['auc']):
+                mejor = {**validas[0], 'ronda': ronda}
+            elif mejor is not None:
+                print(f"\n↩️ Ronda {ronda} incompleta sin superar a #{mejor['id']} (AUC={mejor['auc']:.4f}, "
+                      f"ronda {mejor['ronda']}): se conserva")
+            if incompleta or (limite and time.time() > limite):
+                print(f"\n⏰ Presupuesto agotado en la ronda {ronda}")
+                break
+    finally:
+        if executor is not None:
+            # Las pruebas en curso ya pasaron el límite y cortan en su siguiente iteración
+            executor.shutdown(wait=True, cancel_futures=True)
+    return mejor, pruebas
+
+
+def evaluar_en_test(archivo, parametros, arboles, ventana_meses=None):
+    """AUC en el 20% de test (el mismo split de entrenamiento.py) entrenando con todo el train"""
+    import xgboost as xgb
+    from sklearn.metrics import roc_auc_score
+
+    train, test = split_ventana(archivo, ventana_meses)
+    X = cargar_x(archivo)
+    with np.load(archivo) as datos:
+        y = datos['y']
+    d_train = xgb.QuantileDMatrix(X[train], y[train], max_bin=MAX_BIN)
+    d_test = xgb.QuantileDMatrix(X[test], ref=d_train)
+    booster = xgb.train({**PARAMETROS_FIJOS, **parametros}, d_train, num_boost_round=arboles)
+    return float(roc_auc_score(y[test], booster.predict(d_test)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Búsqueda de hiperparámetros del XGBoost (successive halving)')
+    parser.add_argument('--configuraciones', type=int, default=27, help='Configuraciones en la primera ronda')
+    parser.add_argument('--arboles-min', type=int, default=50, help='Máximo de árboles en la primera ronda')
+    parser.add_argument('--factor', type=int, default=3, help='Factor de eliminación (y de aumento de árboles)')
+    parser.add_argument('--pliegues', type=int, default=3, help='Pliegues de StratifiedKFold')
+    parser.add_argument('--presupuesto-minutos', type=float, default=None, help='Tiempo máximo de la búsqueda')
+    parser.add_argument('--ventana-meses', type=int, default=None, help='Solo los últimos N meses')
+    parser.add_argument('--max-workers', type=int, default=None, help='Procesos (por defecto, uno por CPU)')
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("🔎 BÚSQUEDA DE HIPERPARÁMETROS - MODELO DE CONVERSIÓN (PRE-CONTACTO)")
+    print("="*70 + "\n")
+
+    engine = get_engine()
+    if engine is None:
+        sys.exit(1)
+    archivo, columnas, marca = cargar_o_construir_matriz(engine)
+    if archivo is None:
+        sys.exit(1)
+    engine.dispose()
+
+    inicio = time.perf_counter()
+    presupuesto = args.presupuesto_minutos * 60 if args.presupuesto_minutos else None
+    mejor, pruebas = successive_halving(archivo, muestrear_configuraciones(args.configuraciones, args.semilla),
+                                       args.arboles_min, args.factor, args.pliegues, args.ventana_meses,
+                                       presupuesto, args.max_workers)
+    if mejor is None:
+        print("❌ Ninguna configuración terminó dentro del presupuesto")
+        sys.exit(1)
+    total_busqueda = time.perf_counter() - inicio
+
+    print("\n📏 Comparando contra la configuración del notebook en test...")
+    auc_test = evaluar_en_test(archivo, mejor['parametros'], mejor['arboles'], args.ventana_meses)
+    auc_notebook = evaluar_en_test(archivo, PARAMETROS_NOTEBOOK, CANDIDATOS['xgboost']['n_estimators'],
+                                   args.ventana_meses)
+
+    print(f"\n🏆 Mejor configuración (#{mejor['id']}, ronda {mejor['ronda']}): {mejor['parametros']}, "
+          f"{mejor['arboles']} árboles")
+    print(f"   AUC CV={mejor['auc']:.4f}  AUC test={auc_test:.4f}  (notebook: {auc_notebook:.4f})")
+    print(f"⏱️ Búsqueda: {len(pruebas)} pruebas en {total_busqueda:.1f} s")
+
+    reporte = {
+        'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'marca_agua': marca,
+        'matriz': os.path.basename(archivo),
+        'ventana_meses': args.ventana_meses,
+        'presupuesto_minutos': args.presupuesto_minutos,
+        'segundos': round(total_busqueda, 1),
+        'mejor': {
+            'parametros': {**mejor['parametros'], 'n_estimators': mejor['arboles']},
+            'auc_cv': mejor['auc'],
+            'auc_test': auc_test,
+            'auc_test_notebook': auc_notebook,
+        },
+        'pruebas': [{k: (round(v, 3) if k == 'segundos' else v) for k, v in r.items()} for r in pruebas],
+    }
+    with open(RUTA_REPORTE_BUSQUEDA, 'w', encoding='utf-8') as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+    print(f"💾 Reporte guardado en: {os.path.normpath(RUTA_REPORTE_BUSQUEDA)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Caché local de resultados de queries
+Guarda el DataFrame de cada query en data/cache/consultas/ como Parquet,
+con clave = SQL normalizado + parámetros + base de datos. Así la predicción
+diaria, el diagnóstico y el análisis del mismo día no repiten el mismo query
+contra producción mientras el resultado esté vigente (TTL)
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import pandas as pd
+
+RUTA_CACHE_CONSULTAS = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'consultas')
+
+
+def normalizar_sql(query):
+    """SQL sin comentarios de línea ni espacios redundantes (mismo query, misma clave)"""
+    sin_comentarios = re.sub(r'--[^\n]*', '', query)
+    return re.sub(r'\s+', ' ', sin_comentarios).strip()
+
+
+class CacheConsultas:
+    """
+    Resultados de queries en Parquet, con vencimiento y tamaño máximo
+
+    Parameters:
+    -----------
+    ttl : int
+        Segundos que un resultado es válido (0 desactiva la caché)
+    max_mb : float
+        Tamaño máximo del directorio; al superarlo se borran los archivos
+        usados hace más tiempo
+    ruta : str
+        Directorio de la caché
+    """
+
+    def __init__(self, ttl=1800, max_mb=500, ruta=RUTA_CACHE_CONSULTAS):
+        self.ttl = ttl
+        self.max_bytes = max_mb * 1024 ** 2
+        self.ruta = ruta
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clave(query, params=None, origen=''):
+        contenido = json.dumps([origen, normalizar_sql(query), params], sort_keys=True, default=str)
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    def _archivo(self, clave):
+        return os.path.join(self.ruta, f'{clave}.parquet')
+
+    def obtener(self, clave):
+        """DataFrame guardado si existe y no ha vencido; None si no"""
+        if self.ttl <= 0:
+            return None
+        archivo = self._archivo(clave)
+        try:
+            edad = time.time() - os.path.getmtime(archivo)
+        except OSError:
+            return None
+        if edad > self.ttl:
+            return None
+        try:
+            df = pd.read_parquet(archivo)
+        except Exception as e:
+            print(f"⚠️ Caché de queries ilegible, se descarta: {e}")
+            return None
+        # Marca de uso para el desalojo (el vencimiento se mide con el mtime de escritura)
+        try:
+            os.utime(archivo, (time.time(), os.path.getmtime(archivo)))
+        except OSError:
+            # Otro proceso lo desalojó después de leerlo: el resultado sigue siendo válido
+            pass
+        print(f"✅ Query desde caché local (hace {edad / 60:.0f} min). Filas: {len(df)}")
+        return df
+
+    def guardar(self, clave, df):
+        """Guardar el resultado (escritura atómica) y desalojar si se pasa del tamaño máximo"""
+        if self.ttl <= 0:
+            return
+        try:
+            os.makedirs(self.ruta, exist_ok=True)
+            archivo = self._archivo(clave)
+            temporal = f'{archivo}.{threading.get_ident()}.tmp'
+            df.to_parquet(temporal, index=False)
+            os.replace(temporal, archivo)
+        except Exception as e:
+            # p. ej. sin pyarrow o columnas con tipos mezclados
+            print(f"⚠️ No se pudo guardar el query en caché: {e}")
+            return
+        self.desalojar()
+
+    def desalojar(self):
+        """Borrar vencidos y, si aún se excede el tamaño, los de uso más antiguo"""
+        with self._lock:
+            archivos = []
+            ahora = time.time()
+            for nombre in os.listdir(self.ruta):
+                if not nombre.endswith('.parquet'):
+                    continue
+                archivo = os.path.join(self.ruta, nombre)
+                try:
+                    estado = os.stat(archivo)
+                except OSError:
+                    continue
+                if ahora - estado.st_mtime > self.ttl:
+                    try:
+                        os.remove(archivo)
+                    except OSError:
+                        pass
+                else:
+                    archivos.append((estado.st_atime, estado.st_size, archivo))
+
+            total = sum(tamano for _, tamano, _ in archivos)
+            for _, tamano, archivo in sorted(archivos):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(archivo)
+                except OSError:
+                    pass
+                total -= tamano
+
+
+def cache_desde_entorno():
+    """Caché configurada con DB_CACHE_TTL (segundos, 0 = sin caché) y DB_CACHE_MAX_MB del .env"""
+    return CacheConsultas(ttl=int(os.getenv('DB_CACHE_TTL', 1800)),
+                          max_mb=float(os.getenv('DB_CACHE_MAX_MB', 500)))
@@ -0,0 +1,460 @@
+"""
+Motor de categorización vectorizado
+Compila las reglas de config/reglas_categorizacion.json (una regex por feature),
+categoriza solo los valores únicos de cada columna y genera los CASE del SP
+
+Uso:
+    python scripts/categorizacion.py --sql              # imprime los CASE para el SP
+    python scripts/categorizacion.py --actualizar-sql   # reescribe el bloque generado de los SP
+    python scripts/categorizacion.py --verificar-sql    # sale con 1 si un SP no coincide con las reglas
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import textwrap
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+RUTA_REGLAS = os.path.join(os.path.dirname(__file__), '..', 'config', 'reglas_categorizacion.json')
+RUTA_CACHE_CATEGORIAS = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'categorias.sqlite')
+
+# SPs con un bloque de CASE generado desde las reglas, delimitado por estas marcas
+RUTAS_SQL_GENERADO = [
+    os.path.join(os.path.dirname(__file__), '..', 'sql', 'sp_consolidar_datos_v5.sql'),
+    os.path.join(os.path.dirname(__file__), '..', 'sql', 'sp_consolidar_datos_v6_incremental.sql'),
+]
+MARCA_INICIO_SQL = '-- >>> reglas_categorizacion: generado con python scripts/categorizacion.py --actualizar-sql'
+MARCA_FIN_SQL = '-- <<< reglas_categorizacion'
+
+_reglas_cargadas = None
+
+
+class Categorizador:
+    """
+    Categorizador compilado para una feature de texto
+
+    Todas las reglas se combinan en una única regex anclada al inicio con una
+    alternativa (grupo con nombre) por regla. Como `re` prueba las alternativas
+    en orden, el grupo que captura es siempre la primera regla que aplica.
+
+    Parameters:
+    -----------
+    reglas : list of tuple
+        (categoria, patron, patron_exclusion) en orden de prioridad
+    valor_defecto : str
+        Categoría cuando ninguna regla aplica
+    valor_vacio : str
+        Categoría para nulos (y para '', '-' si `vacios_como_nulo`)
+    vacios_como_nulo : bool
+        Si True, los textos que tras `strip()` quedan en '' o '-' se tratan como nulos
+    """
+
+    def __init__(self, reglas, valor_defecto, valor_vacio=None, vacios_como_nulo=False):
+        self.reglas = list(reglas)
+        self.valor_defecto = valor_defecto
+        self.valor_vacio = valor_defecto if valor_vacio is None else valor_vacio
+        self.vacios_como_nulo = vacios_como_nulo
+        self.categorias = [categoria for categoria, _, _ in self.reglas]
+
+        alternativas = []
+        for i, (_, patron, exclusion) in enumerate(self.reglas):
+            guarda = f'(?!(?s:.*?)(?:{exclusion}))' if exclusion else ''
+            alternativas.append(f'(?P<r{i}>{guarda}(?s:.*?)(?:{patron}))')
+        self.patron = re.compile(r'\A(?:' + '|'.join(alternativas) + ')')
+
+    def categorizar_texto(self, texto_upper):
+        """Categoría de un texto ya convertido a mayúsculas"""
+        m = self.patron.match(texto_upper)
+        if m is None:
+            return self.valor_defecto
+        return self.categorias[int(m.lastgroup[1:])]
+
+    def categorizar_valor(self, valor):
+        """
+        Categoría de un valor suelto evaluando regla por regla
+
+        Es el camino fila a fila de referencia (equivalente a los antiguos
+        `if any(...) elif ...`); el camino normal es `categorizar`.
+        """
+        if pd.isna(valor):
+            return self.valor_vacio
+        texto = str(valor)
+        if self.vacios_como_nulo and texto.strip() in ['', '-']:
+            return self.valor_vacio
+        texto = texto.upper()
+        for categoria, patron, exclusion in self.reglas:
+            if re.search(patron, texto) and not (exclusion and re.search(exclusion, texto)):
+                return categoria
+        return self.valor_defecto
+
+    def categorizar_unicos(self, unicos):
+        """
+        Categorizar un array de valores únicos no nulos
+
+        Returns:
+        --------
+        np.ndarray
+            Categoría de cada valor, en el mismo orden
+        """
+        textos = pd.Series(unicos, dtype=object).astype(str)
+        resultado = np.empty(len(textos), dtype=object)
+        if self.vacios_como_nulo:
+            vacios = textos.str.strip().isin(['', '-']).to_numpy()
+        else:
+            vacios = np.zeros(len(textos), dtype=bool)
+        resultado[vacios] = self.valor_vacio
+
+        upper = textos[~vacios].str.upper()
+        resultado[~vacios] = [self.categorizar_texto(t) for t in upper]
+        return resultado
+
+    def categorizar(self, serie, cache=None, feature=None, como_categoria=False):
+        """
+        Categorizar una columna completa
+
+        Factoriza la serie, evalúa las reglas una vez por valor distinto y
+        reconstruye el resultado con un `take` sobre los códigos. Con `cache`
+        solo se evalúan los valores que no estén ya en la caché de `feature`.
+        Con `como_categoria` retorna dtype category armado desde los mismos
+        códigos (sin volver a hashear el texto).
+        """
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        unicos = np.asarray(unicos, dtype=object)
+        if cache is None:
+            categorias_unicos = self.categorizar_unicos(unicos)
+        else:
+            categorias_unicos = cache.resolver(feature or serie.name, unicos, self.categorizar_unicos)
+        tabla = np.append(categorias_unicos, self.valor_vacio).astype(object)
+        if como_categoria:
+            codigos_tabla, categorias = pd.factorize(tabla)
+            return pd.Series(pd.Categorical.from_codes(codigos_tabla[codigos], categorias),
+                             index=serie.index, name=serie.name)
+        return pd.Series(tabla[codigos], index=serie.index, name=serie.name)
+
+    def generar_sql(self, columna_sql, alias):
+        """Expresión CASE equivalente para MySQL (REGEXP sobre UPPER)"""
+        lineas = ['CASE']
+        if self.vacios_como_nulo:
+            lineas.append(f"    WHEN {columna_sql} IS NULL OR TRIM({columna_sql}) IN ('', '-') "
+                          f"THEN {_literal_sql(self.valor_vacio)}")
+        elif self.valor_vacio != self.valor_defecto:
+            lineas.append(f"    WHEN {columna_sql} IS NULL THEN {_literal_sql(self.valor_vacio)}")
+        for categoria, patron, exclusion in self.reglas:
+            condicion = f"UPPER({columna_sql}) REGEXP {_literal_sql(patron)}"
+            if exclusion:
+                condicion += f" AND NOT UPPER({columna_sql}) REGEXP {_literal_sql(exclusion)}"
+            lineas.append(f"    WHEN {condicion} THEN {_literal_sql(categoria)}")
+        lineas.append(f"    ELSE {_literal_sql(self.valor_defecto)}")
+        lineas.append(f"END AS {alias}")
+        return '\n'.join(lineas)
+
+
+class ReglasCategorizacion:
+    """
+    Tabla de reglas versionada y compilada
+
+    Agrupa un `Categorizador` por feature con la columna de origen. `huella`
+    es el SHA-256 del archivo de reglas y sirve para invalidar artefactos
+    derivados (la caché de categorías).
+    """
+
+    def __init__(self, definicion, huella):
+        self.version = definicion['version']
+        self.huella = huella
+        self.columnas = {}
+        self.categorizadores = {}
+        for feature, spec in definicion['features'].items():
+            reglas = [(r['categoria'], r['patron'], r.get('excluir')) for r in spec['reglas']]
+            self.columnas[feature] = spec['columna']
+            self.categorizadores[feature] = Categorizador(
+                reglas,
+                spec['valor_defecto'],
+                spec.get('valor_vacio'),
+                vacios_como_nulo='valor_vacio' in spec
+            )
+
+    def __getitem__(self, feature):
+        return self.categorizadores[feature]
+
+    def categorizar(self, df, cache=None, como_categoria=False):
+        """Agregar a `df` (in place) una columna por cada feature categorizada"""
+        for feature, categorizador in self.categorizadores.items():
+            df[feature] = categorizador.categorizar(df[self.columnas[feature]], cache, feature, como_categoria)
+        return df
+
+    def generar_sql(self, alias_tabla='a'):
+        """Bloques CASE de todas las features, listos para pegar en el SP"""
+        bloques = []
+        for feature, categorizador in self.categorizadores.items():
+            columna_sql = f"{alias_tabla}.{self.columnas[feature]}" if alias_tabla else self.columnas[feature]
+            bloques.append(f"-- CATEGORIZACIÓN: {feature.upper()} (reglas v{self.version})\n"
+                           + categorizador.generar_sql(columna_sql, feature))
+        return ',\n\n'.join(bloques)
+
+
+class CacheCategorias:
+    """
+    Caché persistente texto crudo -> categoría, por feature
+
+    Una LRU en memoria hace de frente a una tabla SQLite en data/cache/. La
+    tabla guarda la huella de las reglas con que se calculó; si las reglas
+    cambian se vacía, así nunca se sirven categorías de otra versión.
+
+    Parameters:
+    -----------
+    huella : str
+        Huella (`ReglasCategorizacion.huella`) de las reglas vigentes
+    ruta : str
+        Archivo SQLite. Se crea si no existe
+    max_memoria : int
+        Entradas máximas de la LRU en memoria (todas las features)
+    """
+
+    LOTE_SQL = 500
+
+    def __init__(self, huella, ruta=RUTA_CACHE_CATEGORIAS, max_memoria=200_000):
+        self.huella = huella
+        self.ruta = ruta
+        self.max_memoria = max_memoria
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self.estadisticas = {}
+
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS categorias ("
+            "feature TEXT NOT NULL, valor TEXT NOT NULL, categoria TEXT NOT NULL, "
+            "PRIMARY KEY (feature, valor))"
+        )
+        self._conexion.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT)")
+        fila = self._conexion.execute("SELECT valor FROM meta WHERE clave = 'huella'").fetchone()
+        if fila is None or fila[0] != huella:
+            self._conexion.execute("DELETE FROM categorias")
+            self._conexion.execute("INSERT OR REPLACE INTO meta VALUES ('huella', ?)", (huella,))
+        self._conexion.commit()
+
+    def _contar(self, feature, tipo, n):
+        contadores = self.estadisticas.setdefault(feature, {'memoria': 0, 'disco': 0, 'nuevos': 0})
+        contadores[tipo] += n
+
+    def _recordar(self, feature, valor, categoria):
+        self._memoria[(feature, valor)] = categoria
+        self._memoria.move_to_end((feature, valor))
+        if len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def resolver(self, feature, unicos, funcion):
+        """
+        Categorías de `unicos` usando la caché; `funcion` calcula las faltantes
+
+        Returns:
+        --------
+        np.ndarray
+            Categoría de cada valor, en el mismo orden que `unicos`
+        """
+        claves = [str(v) for v in unicos]
+        resultado = np.empty(len(claves), dtype=object)
+
+        with self._lock:
+            pendientes = []
+            for i, clave in enumerate(claves):
+                categoria = self._memoria.get((feature, clave))
+                if categoria is None:
+                    pendientes.append(i)
+                else:
+                    self._memoria.move_to_end((feature, clave))
+                    resultado[i] = categoria
+            self._contar(feature, 'memoria', len(claves) - len(pendientes))
+
+            # Segundo nivel: SQLite
+            en_disco = {}
+            claves_pendientes = list(dict.fromkeys(claves[i] for i in pendientes))
+            for inicio in range(0, len(claves_pendientes), self.LOTE_SQL):
+                lote = claves_pendientes[inicio:inicio + self.LOTE_SQL]
+                marcas = ','.join('?' * len(lote))
+                en_disco.update(self._conexion.execute(
+                    f"SELECT valor, categoria FROM categorias WHERE feature = ? AND valor IN ({marcas})",
+                    [feature] + lote
+                ).fetchall())
+
+            nuevos = []
+            for i in pendientes:
+                categoria = en_disco.get(claves[i])
+                if categoria is None:
+                    nuevos.append(i)
+                else:
+                    resultado[i] = categoria
+                    self._recordar(feature, claves[i], categoria)
+            self._contar(feature, 'disco', len(pendientes) - len(nuevos))
+            self._contar(feature, 'nuevos', len(nuevos))
+
+            # Solo los textos nunca vistos pasan por las reglas
+            if nuevos:
+                calculadas = funcion(unicos[nuevos])
+                resultado[nuevos] = calculadas
+                filas = []
+                for i, categoria in zip(nuevos, calculadas):
+                    self._recordar(feature, claves[i], categoria)
+                    filas.append((feature, claves[i], categoria))
+                self._conexion.executemany("INSERT OR REPLACE INTO categorias VALUES (?, ?, ?)", filas)
+                self._conexion.commit()
+
+        return resultado
+
+    def imprimir_estadisticas(self):
+        """Resumen de aciertos/fallos por feature"""
+        print("\n📦 Caché de categorías:")
+        for feature, c in self.estadisticas.items():
+            total = c['memoria'] + c['disco'] + c['nuevos']
+            aciertos = c['memoria'] + c['disco']
+            pct = aciertos / total * 100 if total else 0
+            print(f"   - {feature}: {aciertos:,}/{total:,} aciertos ({pct:.1f}%) "
+                  f"[memoria={c['memoria']:,}, disco={c['disco']:,}, nuevos={c['nuevos']:,}]")
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.close()
+
+
+def abrir_cache_categorias(reglas=None, ruta=RUTA_CACHE_CATEGORIAS):
+    """
+    Abrir la caché de categorías para las reglas vigentes
+
+    Returns:
+    --------
+    CacheCategorias or None
+        None si no se pudo abrir (el proceso sigue sin caché)
+    """
+    try:
+        if reglas is None:
+            reglas = cargar_reglas()
+        return CacheCategorias(reglas.huella, ruta)
+    except Exception as e:
+        print(f"⚠️ Caché de categorías no disponible: {e}")
+        return None
+
+
+def _literal_sql(texto):
+    return "'" + texto.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def cargar_reglas(ruta=RUTA_REGLAS):
+    """
+    Cargar y compilar las reglas desde el JSON
+
+    No se guardan compiladas en disco: un pickle de las regex las vuelve a
+    compilar al cargarse. Dentro de un mismo proceso se compilan una sola vez
+    mientras la huella del archivo no cambie.
+
+    Returns:
+    --------
+    ReglasCategorizacion
+    """
+    global _reglas_cargadas
+
+    with open(ruta, 'rb') as f:
+        contenido = f.read()
+    huella = hashlib.sha256(contenido).hexdigest()
+
+    if _reglas_cargadas is not None and _reglas_cargadas.huella == huella:
+        return _reglas_cargadas
+
+    reglas = ReglasCategorizacion(json.loads(contenido.decode('utf-8')), huella)
+    _reglas_cargadas = reglas
+    return reglas
+
+
+RANGOS_VACANTES = ['1-100', '100-200', '200-300', '300+', 'sin_informacion']
+
+
+def sincronizar_sql(ruta, reglas=None, escribir=False, alias_tabla='a'):
+    """
+    Comparar el bloque generado de un archivo SQL con las reglas vigentes
+
+    El bloque va entre MARCA_INICIO_SQL y MARCA_FIN_SQL, con la sangría de la
+    marca de inicio; la coma que lo separa de la columna siguiente se conserva.
+
+    Parameters:
+    -----------
+    escribir : bool
+        Reemplazar el bloque si no coincide
+
+    Returns:
+    --------
+    bool
+        True si el archivo ya coincidía con las reglas
+    """
+    if reglas is None:
+        reglas = cargar_reglas()
+    with open(ruta, 'r', encoding='utf-8') as f:
+        contenido = f.read()
+    patron = re.compile(rf'^(?P<sangria>[ \t]*){re.escape(MARCA_INICIO_SQL)}\n(?P<bloque>.*?)'
+                        rf'^(?P<sangria_fin>[ \t]*){re.escape(MARCA_FIN_SQL)}', re.M | re.S)
+    encontrado = patron.search(contenido)
+    if encontrado is None:
+        raise ValueError(f"{os.path.normpath(ruta)} no tiene el bloque {MARCA_INICIO_SQL!r} ... {MARCA_FIN_SQL!r}")
+
+    sufijo = ',' if encontrado['bloque'].rstrip().endswith(',') else ''
+    esperado = textwrap.indent(reglas.generar_sql(alias_tabla) + sufijo, encontrado['sangria']) + '\n'
+    if encontrado['bloque'] == esperado:
+        return True
+    if escribir:
+        contenido = contenido[:encontrado.start('bloque')] + esperado + contenido[encontrado.end('bloque'):]
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(contenido)
+    return False
+
+
+def categorizar_rango_vacantes(numero_de_vacantes, como_categoria=False):
+    """Rango de vacantes vectorizado ('sin_informacion' para nulos)"""
+    x = pd.to_numeric(numero_de_vacantes, errors='coerce').to_numpy(dtype=float)
+    codigos = np.select([x < 100, x < 200, x < 300, x >= 300], [0, 1, 2, 3], default=4)
+    if como_categoria:
+        rangos = pd.Categorical.from_codes(codigos, RANGOS_VACANTES)
+    else:
+        rangos = np.array(RANGOS_VACANTES, dtype=object)[codigos]
+    return pd.Series(rangos, index=numero_de_vacantes.index, name='rango_vacantes')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reglas de categorización')
+    parser.add_argument('--sql', action='store_true', help='Imprimir los CASE para el SP')
+    parser.add_argument('--alias', default='a', help='Alias de la tabla de asignaciones en el SQL')
+    parser.add_argument('--actualizar-sql', action='store_true',
+                        help='Reescribir el bloque generado de los SP (sql/) con las reglas vigentes')
+    parser.add_argument('--verificar-sql', action='store_true',
+                        help='Salir con código 1 si el bloque generado de algún SP no coincide con las reglas')
+    args = parser.parse_args()
+
+    reglas = cargar_reglas()
+    if args.sql:
+        print(reglas.generar_sql(args.alias))
+    elif args.actualizar_sql or args.verificar_sql:
+        desactualizados = []
+        for ruta in RUTAS_SQL_GENERADO:
+            if sincronizar_sql(ruta, reglas, escribir=args.actualizar_sql, alias_tabla=args.alias):
+                print(f"✅ {os.path.normpath(ruta)}: al día con las reglas v{reglas.version}")
+            elif args.actualizar_sql:
+                print(f"💾 {os.path.normpath(ruta)}: CASE regenerados con las reglas v{reglas.version}")
+            else:
+                print(f"❌ {os.path.normpath(ruta)}: no coincide con las reglas v{reglas.version} "
+                      f"(python scripts/categorizacion.py --actualizar-sql)")
+                desactualizados.append(ruta)
+        if desactualizados:
+            sys.exit(1)
+    else:
+        print(f"✅ Reglas v{reglas.version} ({reglas.huella[:12]})")
+        for feature, categorizador in reglas.categorizadores.items():
+            print(f"   - {feature}: {len(categorizador.reglas)} reglas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Codificador one-hot del modelo
+Traduce las features categóricas directamente a índices de columna del
+modelo y llena una matriz preasignada en una sola pasada (reemplaza
+pd.get_dummies + el ciclo de columnas faltantes)
+"""
+
+import os
+import pickle
+import numpy as np
+import pandas as pd
+
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+CODIFICADOR_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'codificador_precontacto.pkl')
+
+_codificadores = {}
+
+
+class CodificadorOneHot:
+    """
+    One-hot con el mismo orden de columnas que `columnas_modelo`
+
+    Se ajusta a partir de los nombres de columna del entrenamiento
+    (`<feature>_<valor>`): cada valor conocido apunta a su índice y los
+    niveles de referencia o no vistos quedan en cero, igual que con
+    get_dummies + reindex.
+
+    Parameters:
+    -----------
+    columnas_modelo : list
+        Columnas del modelo (model_columns_precontacto.pkl)
+    categorical_features, numeric_features : list
+        Features de entrada
+    """
+
+    def __init__(self, columnas_modelo, categorical_features=CATEGORICAL_FEATURES,
+                 numeric_features=NUMERIC_FEATURES):
+        self.columnas = list(columnas_modelo)
+        self.categorical_features = list(categorical_features)
+        self.numeric_features = list(numeric_features)
+
+        posicion = {col: i for i, col in enumerate(self.columnas)}
+        self.indices_numericas = [(f, posicion[f]) for f in self.numeric_features if f in posicion]
+
+        # Prefijo más largo primero para no confundir features con nombres contenidos en otros
+        prefijos = sorted(self.categorical_features, key=len, reverse=True)
+        self.categorias = {f: [] for f in self.categorical_features}
+        self.indices = {f: [] for f in self.categorical_features}
+        for i, col in enumerate(self.columnas):
+            if col in self.numeric_features:
+                continue
+            for f in prefijos:
+                if col.startswith(f + '_'):
+                    self.categorias[f].append(col[len(f) + 1:])
+                    self.indices[f].append(i)
+                    break
+        self.indices = {f: np.asarray(idx, dtype=np.intp) for f, idx in self.indices.items()}
+
+    def transformar(self, df, dtype=np.float32):
+        """
+        Matriz densa (n_filas x n_columnas) lista para el modelo
+
+        Es densa a propósito: XGBoost trata las entradas ausentes de una
+        matriz dispersa como "missing", no como 0, y cambiaría los scores.
+        Se llena como (n_columnas x n_filas), el layout de bloque de pandas,
+        y se retorna la transpuesta (vista, sin copia).
+        """
+        n = len(df)
+        X = np.zeros((len(self.columnas), n), dtype=dtype)
+        for f, j in self.indices_numericas:
+            X[j] = df[f].to_numpy()
+
+        for f in self.categorical_features:
+            if len(self.indices[f]) == 0:
+                continue
+            # Códigos por valor distinto (nulos -> -1); cada nivel del modelo es una comparación
+            serie = df[f]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                codigos, unicos = serie.cat.codes.to_numpy(), serie.cat.categories
+            else:
+                codigos, unicos = pd.factorize(serie)
+            posicion = dict(zip(self.categorias[f], self.indices[f]))
+            for codigo, valor in enumerate(unicos):
+                j = posicion.get(str(valor))
+                if j is not None:
+                    np.equal(codigos, codigo, out=X[j], casting='unsafe')
+        return X.T
+
+    def transformar_df(self, df, dtype=np.float32):
+        """Igual que `transformar`, envuelto en un DataFrame con los nombres de columna del modelo"""
+        return pd.DataFrame(self.transformar(df, dtype), columns=self.columnas, index=df.index, copy=False)
+
+
+def obtener_codificador(columnas_modelo, ruta=CODIFICADOR_PATH):
+    """
+    Codificador para `columnas_modelo`
+
+    Usa el pickle de models/ si corresponde a las mismas columnas; si no,
+    lo ajusta y lo guarda. Dentro de un proceso se reutiliza el mismo objeto.
+    """
+    clave = tuple(columnas_modelo)
+    if clave in _codificadores:
+        return _codificadores[clave]
+
+    codificador = None
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, 'rb') as f:
+                codificador = pickle.load(f)
+            if codificador.columnas != list(columnas_modelo):
+                codificador = None
+        except Exception:
+            codificador = None
+
+    if codificador is None:
+        codificador = CodificadorOneHot(columnas_modelo)
+        try:
+            with open(ruta, 'wb') as f:
+                pickle.dump(codificador, f)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el codificador: {e}")
+
+    _codificadores[clave] = codificador
+    return codificador
@@ -3,51 +3,136 @@ Módulo de conexión a base de datos MySQL
 """
 
 import os
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import pymysql
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
+from cache_consultas import CacheConsultas, cache_desde_entorno
+from instrumentacion import span, registrar_span, descripcion_sql
+
 # Cargar variables de entorno
 load_dotenv()
 
-def get_connection():
+# Engine compartido por todo el proceso (se crea en el primer get_engine)
+_engine = None
+_engine_lock = threading.Lock()
+
+# Caché local de resultados (DB_CACHE_TTL / DB_CACHE_MAX_MB)
+_cache_consultas = None
+
+def _config_pool():
+    """Parámetros del pool desde .env (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE)"""
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        # MySQL cierra conexiones inactivas (wait_timeout): reciclar antes y validar al tomar del pool
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True,
+    }
+
+def get_engine(nuevo=False):
     """
-    Crear conexión a MySQL usando pymysql
+    Engine de SQLAlchemy para pandas, con pool de conexiones
+    
+    Todas las llamadas del proceso comparten el mismo engine (y su pool),
+    así cada query reutiliza una conexión abierta en vez de pagar el
+    handshake TCP + autenticación.
+    
+    Parameters:
+    -----------
+    nuevo : bool
+        Descartar el engine actual (cierra sus conexiones) y crear otro
     """
+    global _engine
     try:
-        connection = pymysql.connect(
-            host=os.getenv('DB_HOST'),
-            port=int(os.getenv('DB_PORT')),
-            user=os.getenv('DB_USER'),
-            password=os.getenv('DB_PASSWORD'),
-            database=os.getenv('DB_NAME'),
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        print("✅ Conexión exitosa a la base de datos")
-        return connection
+        with _engine_lock:
+            if nuevo and _engine is not None:
+                _engine.dispose()
+                _engine = None
+            if _engine is None:
+                connection_string = (
+                    f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+                    f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+                )
+                config = _config_pool()
+                _engine = create_engine(connection_string, **config)
+                print(f"✅ Engine SQLAlchemy creado exitosamente (pool={config['pool_size']}, "
+                      f"recycle={config['pool_recycle']}s)")
+            return _engine
     except Exception as e:
-        print(f"❌ Error al conectar a la base de datos: {e}")
+        print(f"❌ Error al crear engine: {e}")
         return None
 
-def get_engine():
+@contextmanager
+def get_connection(dict_cursor=True):
     """
-    Crear engine de SQLAlchemy para pandas
+    Conexión pymysql tomada del pool del engine compartido
+    
+    Uso:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(...)
+    
+    Al salir hace commit (rollback si hubo excepción) y devuelve la
+    conexión al pool. Con `dict_cursor` los cursores retornan dicts.
     """
+    engine = get_engine()
+    if engine is None:
+        raise ConnectionError("No se pudo crear el engine de base de datos")
     try:
-        connection_string = (
-            f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
-            f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-        )
-        engine = create_engine(connection_string)
-        print("✅ Engine SQLAlchemy creado exitosamente")
-        return engine
+        connection = engine.raw_connection()
     except Exception as e:
-        print(f"❌ Error al crear engine: {e}")
-        return None
+        print(f"❌ Error al conectar a la base de datos: {e}")
+        raise
+    if dict_cursor:
+        connection.driver_connection.cursorclass = pymysql.cursors.DictCursor
+    try:
+        yield connection
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        if dict_cursor:
+            connection.driver_connection.cursorclass = pymysql.cursors.Cursor
+        connection.close()
+
+def obtener_cache_consultas():
+    """Caché de resultados compartida por el proceso (configurada desde .env)"""
+    global _cache_consultas
+    if _cache_consultas is None:
+        _cache_consultas = cache_desde_entorno()
+    return _cache_consultas
 
-def query_to_dataframe(query, engine=None):
+def _leer_sql(query, engine, params=None, cache=False):
+    """
+    pd.read_sql pasando por la caché local
+    
+    cache=True lee y guarda, 'refrescar' ignora lo guardado pero guarda el
+    resultado nuevo, False (por defecto) no usa la caché.
+    """
+    # Un span por query (manifiesto de la ejecución): duración, filas y si vino de la caché
+    with span('query', **descripcion_sql(query)) as s:
+        if not cache:
+            df = pd.read_sql(query, engine, params=params)
+        else:
+            cache_consultas = obtener_cache_consultas()
+            clave = CacheConsultas.clave(query, params, origen=engine.url.render_as_string(hide_password=True))
+            df = cache_consultas.obtener(clave) if cache != 'refrescar' else None
+            s.datos['desde_cache'] = df is not None
+            if df is None:
+                df = pd.read_sql(query, engine, params=params)
+                cache_consultas.guardar(clave, df)
+        s.filas = len(df)
+    return df
+
+def query_to_dataframe(query, engine=None, params=None, cache=False):
     """
     Ejecutar query y retornar DataFrame
     
@@ -56,7 +141,14 @@ def query_to_dataframe(query, engine=None):
     query : str
         Query SQL a ejecutar
     engine : SQLAlchemy engine, optional
-        Engine de SQLAlchemy. Si no se provee, se crea uno nuevo
+        Engine de SQLAlchemy. Si no se provee, se usa el engine compartido
+    params : dict, optional
+        Parámetros del query en formato pymysql (%(nombre)s)
+    cache : bool or 'refrescar'
+        Usar la caché local de resultados (data/cache/consultas/). Es
+        opcional: por defecto (False) siempre se consulta la BD, así
+        notebooks y entrenamiento ven datos frescos. Con 'refrescar' siempre
+        consulta la BD y actualiza la caché
     
     Returns:
     --------
@@ -67,9 +159,139 @@ def query_to_dataframe(query, engine=None):
         if engine is None:
             engine = get_engine()
         
-        df = pd.read_sql(query, engine)
+        df = _leer_sql(query, engine, params=params, cache=cache)
         print(f"✅ Query ejecutado exitosamente. Filas: {len(df)}")
         return df
     except Exception as e:
         print(f"❌ Error al ejecutar query: {e}")
         return None
+
+def queries_en_paralelo(consultas, engine=None, max_workers=None, cache=False):
+    """
+    Ejecutar varios queries a la vez y retornar sus DataFrames por nombre
+    
+    Cada query corre en un hilo con su propia conexión del pool; como la
+    espera es de red/servidor, las cargas se solapan.
+    
+    Parameters:
+    -----------
+    consultas : dict
+        nombre -> query SQL, o nombre -> (query, params)
+    engine : SQLAlchemy engine, optional
+        Engine de SQLAlchemy. Si no se provee, se usa el engine compartido
+    max_workers : int, optional
+        Queries simultáneos (por defecto todos, hasta el tamaño del pool)
+    cache : bool or 'refrescar'
+        Usar la caché local de resultados (ver query_to_dataframe)
+    
+    Returns:
+    --------
+    dict
+        nombre -> pd.DataFrame (None si ese query falló), en el orden de `consultas`
+    """
+    if engine is None:
+        engine = get_engine()
+    if engine is None:
+        return {nombre: None for nombre in consultas}
+    
+    def ejecutar(nombre, consulta):
+        query, params = consulta if isinstance(consulta, tuple) else (consulta, None)
+        inicio = time.perf_counter()
+        try:
+            df = _leer_sql(query, engine, params=params, cache=cache)
+        except Exception as e:
+            print(f"❌ Error al ejecutar query '{nombre}': {e}")
+            df = None
+        return df, time.perf_counter() - inicio
+    
+    if max_workers is None:
+        # No pedir más conexiones de las que el pool puede dar (el resto esperaría el timeout)
+        capacidad = engine.pool.size() + max(getattr(engine.pool, '_max_overflow', 0), 0) \
+            if hasattr(engine.pool, 'size') else len(consultas)
+        max_workers = min(len(consultas), capacidad)
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futuros = {nombre: executor.submit(ejecutar, nombre, consulta) for nombre, consulta in consultas.items()}
+        resultados = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    total = time.perf_counter() - inicio
+    
+    for nombre, (df, segundos) in resultados.items():
+        if df is not None:
+            print(f"✅ Query '{nombre}': {len(df)} filas en {segundos:.2f} s")
+    suma = sum(segundos for _, segundos in resultados.values())
+    print(f"⏱️ {len(consultas)} queries en {total:.2f} s (en secuencia serían ~{suma:.2f} s)")
+    return {nombre: df for nombre, (df, _) in resultados.items()}
+
+def query_en_chunks(query, engine=None, chunksize=50000, params=None, prefetch=2):
+    """
+    Ejecutar query y entregar el resultado por bloques (generador)
+    
+    Usa un cursor del lado del servidor (stream_results) para no materializar
+    el resultado completo, y un hilo que lee los siguientes bloques mientras
+    el consumidor procesa el actual.
+    
+    Parameters:
+    -----------
+    query : str
+        Query SQL a ejecutar
+    engine : SQLAlchemy engine, optional
+        Engine de SQLAlchemy. Si no se provee, se usa el engine compartido
+    chunksize : int
+        Filas por bloque
+    params : dict, optional
+        Parámetros del query en formato pymysql (%(nombre)s)
+    prefetch : int
+        Bloques que se pueden leer por adelantado (acota la memoria)
+    
+    Yields:
+    -------
+    pd.DataFrame
+        Bloques de hasta `chunksize` filas, en el orden del query
+    """
+    if engine is None:
+        engine = get_engine()
+    
+    bloques = queue.Queue(maxsize=prefetch)
+    fin = object()
+    detener = threading.Event()
+    
+    def leer():
+        try:
+            with engine.connect().execution_options(stream_results=True) as conn:
+                for chunk in pd.read_sql(query, conn, params=params, chunksize=chunksize):
+                    if detener.is_set():
+                        break
+                    bloques.put(chunk)
+        except Exception as e:
+            bloques.put(e)
+        finally:
+            bloques.put(fin)
+    
+    lector = threading.Thread(target=leer, daemon=True)
+    lector.start()
+    
+    filas = 0
+    espera = 0.0
+    try:
+        while True:
+            inicio = time.perf_counter()
+            chunk = bloques.get()
+            espera += time.perf_counter() - inicio
+            if chunk is fin:
+                break
+            if isinstance(chunk, Exception):
+                print(f"❌ Error al ejecutar query: {chunk}")
+                raise chunk
+            filas += len(chunk)
+            yield chunk
+        print(f"✅ Query ejecutado por bloques. Filas: {filas}")
+        # Solo el tiempo que el consumidor esperó bloques (la lectura se solapa con el procesamiento)
+        registrar_span('query_en_chunks', espera, filas, **descripcion_sql(query))
+    finally:
+        # Si el consumidor se detiene antes, liberar al lector
+        detener.set()
+        while lector.is_alive():
+            try:
+                bloques.get(timeout=0.1)
+            except queue.Empty:
+                pass
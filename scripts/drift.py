@@ -0,0 +1,201 @@
+"""
+Monitor de drift de features
+Compara la distribución de cada feature (y de la probabilidad) del lote del
+día contra el perfil del entrenamiento, que entrenamiento.py guarda una vez
+en models/perfil_entrenamiento_precontacto.json al publicar el modelo. No
+vuelve a leer tb_modelo_conversion_intermediacion: el lote se resume con
+conteos por valor (acumulables bloque a bloque) y el resultado (PSI y KL por
+feature) se agrega a data/analisis/drift/serie_drift.csv, una fila por
+feature y día
+"""
+
+import os
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+RUTA_PERFIL = os.path.join(os.path.dirname(__file__), '..', 'models', 'perfil_entrenamiento_precontacto.json')
+RUTA_SERIE_DRIFT = os.path.join(os.path.dirname(__file__), '..', 'data', 'analisis', 'drift', 'serie_drift.csv')
+
+VERSION_PERFIL = 1
+NULO = '(nulo)'
+PROBABILIDAD = 'probabilidad_conversion'
+BORDES_PROBABILIDAD = np.linspace(0.0, 1.0, 21)
+# Cada lote diario cae en un solo mes del año: su PSI siempre sería alto y no indica drift
+EXCLUIR_DRIFT = ['mes']
+# Proporción mínima para bins vacíos (evita log(0) y deja ver categorías nuevas)
+EPSILON = 1e-4
+# Umbrales usuales de PSI
+UMBRAL_MODERADO = 0.1
+UMBRAL_ALTO = 0.25
+
+
+def clave_valor(valor):
+    """Clave de un valor en los histogramas (igual en el entrenamiento y en el scoring)"""
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)) or valor is pd.NA:
+        return NULO
+    if isinstance(valor, (float, np.floating)) and float(valor).is_integer():
+        return str(int(valor))
+    if isinstance(valor, (np.integer, np.bool_)):
+        return str(int(valor))
+    return str(valor)
+
+
+def histograma_probabilidad(probabilidades):
+    conteos, _ = np.histogram(np.clip(probabilidades, 0.0, 1.0), bins=BORDES_PROBABILIDAD)
+    return conteos
+
+
+def psi_kl(conteos_referencia, conteos_actual):
+    """
+    PSI y KL(actual || referencia) entre dos histogramas {valor: conteo}
+
+    Returns:
+    --------
+    tuple
+        (psi, kl, valor que más aporta al PSI)
+    """
+    valores = sorted(set(conteos_referencia) | set(conteos_actual))
+    ref = np.array([conteos_referencia.get(v, 0) for v in valores], dtype=np.float64)
+    act = np.array([conteos_actual.get(v, 0) for v in valores], dtype=np.float64)
+    if ref.sum() == 0 or act.sum() == 0:
+        return np.nan, np.nan, None
+    ref = np.maximum(ref / ref.sum(), EPSILON)
+    act = np.maximum(act / act.sum(), EPSILON)
+    log_ratio = np.log(act / ref)
+    aportes = (act - ref) * log_ratio
+    return float(aportes.sum()), float((act * log_ratio).sum()), valores[int(np.argmax(aportes))]
+
+
+def nivel_drift(psi):
+    if np.isnan(psi):
+        return 'sin datos'
+    if psi >= UMBRAL_ALTO:
+        return 'alto'
+    return 'moderado' if psi >= UMBRAL_MODERADO else 'estable'
+
+
+def guardar_perfil(perfil, ruta=RUTA_PERFIL):
+    temporal = f'{ruta}.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'version': VERSION_PERFIL, **perfil}, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+    print(f"💾 Perfil de entrenamiento (drift) guardado en: {os.path.normpath(ruta)}")
+
+
+def cargar_perfil(ruta=RUTA_PERFIL):
+    """Perfil del entrenamiento; None (con aviso) si no existe o es de otra versión"""
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            perfil = json.load(f)
+        if perfil.get('version') != VERSION_PERFIL:
+            print("⚠️ Perfil de entrenamiento de otra versión: reentrenar para monitorear drift")
+            return None
+        return perfil
+    except FileNotFoundError:
+        print("⚠️ Sin perfil de entrenamiento (models/perfil_entrenamiento_precontacto.json): "
+              "se genera al reentrenar con entrenamiento.py")
+        return None
+    except Exception as e:
+        print(f"❌ Error al leer el perfil de entrenamiento: {e}")
+        return None
+
+
+class MonitorDrift:
+    """
+    Conteos por valor del lote del día, acumulados bloque a bloque
+
+    Parameters:
+    -----------
+    perfil : dict
+        Perfil del entrenamiento (cargar_perfil)
+    """
+
+    def __init__(self, perfil):
+        self.perfil = perfil
+        self.features = [f for f in CATEGORICAL_FEATURES + NUMERIC_FEATURES
+                         if f in perfil['features'] and f not in EXCLUIR_DRIFT]
+        self.conteos = {f: {} for f in self.features}
+        self.conteos_probabilidad = np.zeros(len(BORDES_PROBABILIDAD) - 1, dtype=np.int64)
+        self.filas = 0
+
+    def agregar(self, df, probabilidades=None):
+        """Sumar los conteos de un bloque (value_counts por feature, sin copiar el df)"""
+        for f in self.features:
+            conteos = self.conteos[f]
+            for valor, n in df[f].value_counts(dropna=False, sort=False).items():
+                if n:
+                    clave = clave_valor(valor)
+                    conteos[clave] = conteos.get(clave, 0) + int(n)
+        if probabilidades is not None:
+            self.conteos_probabilidad += histograma_probabilidad(np.asarray(probabilidades, dtype=np.float64))
+        self.filas += len(df)
+
+    def calcular(self):
+        """
+        PSI y KL por feature del lote acumulado
+
+        Returns:
+        --------
+        pd.DataFrame
+            feature, psi, kl, nivel, mayor_cambio, filas
+        """
+        filas = []
+        for f in self.features:
+            psi, kl, valor = psi_kl(self.perfil['features'][f]['conteos'], self.conteos[f])
+            filas.append({'feature': f, 'psi': psi, 'kl': kl, 'mayor_cambio': valor})
+        if self.conteos_probabilidad.sum() and 'probabilidad' in self.perfil:
+            referencia = dict(enumerate(self.perfil['probabilidad']['conteos']))
+            psi, kl, bin_ = psi_kl(referencia, dict(enumerate(self.conteos_probabilidad.tolist())))
+            rango = (f"{BORDES_PROBABILIDAD[bin_]:.2f}-{BORDES_PROBABILIDAD[bin_ + 1]:.2f}"
+                     if bin_ is not None else None)
+            filas.append({'feature': PROBABILIDAD, 'psi': psi, 'kl': kl, 'mayor_cambio': rango})
+
+        df = pd.DataFrame(filas)
+        df['nivel'] = df['psi'].map(nivel_drift)
+        df['filas'] = self.filas
+        return df[['feature', 'psi', 'kl', 'nivel', 'mayor_cambio', 'filas']]
+
+    def promedio_probabilidad(self):
+        """Promedio aproximado (centro de cada bin) de las probabilidades agregadas"""
+        centros = (BORDES_PROBABILIDAD[:-1] + BORDES_PROBABILIDAD[1:]) / 2
+        total = self.conteos_probabilidad.sum()
+        return float(centros @ self.conteos_probabilidad / total) if total else np.nan
+
+
+def imprimir_drift(df_drift, perfil=None):
+    emoji = {'estable': '✅', 'moderado': '⚠️', 'alto': '🚨', 'sin datos': '➖'}
+    print("\n📉 Drift vs entrenamiento (PSI / KL):")
+    for r in df_drift.itertuples():
+        cambio = f"  (más cambio: {r.mayor_cambio})" if r.nivel != 'estable' and r.mayor_cambio is not None else ''
+        print(f"   {emoji[r.nivel]} {r.feature:<26} PSI={r.psi:.3f}  KL={r.kl:.3f}  {r.nivel}{cambio}")
+    if perfil is not None:
+        print(f"   Perfil: entrenamiento del {perfil.get('fecha', '?')} ({perfil.get('filas', 0):,} filas)")
+
+
+def registrar_drift(df_drift, fecha=None, ruta=RUTA_SERIE_DRIFT):
+    """
+    Agregar el resultado del día a la serie (reemplaza el del mismo día si se vuelve a correr)
+
+    Returns:
+    --------
+    str
+        Ruta de la serie; None si hay error
+    """
+    try:
+        fecha = (fecha or datetime.now()).strftime('%Y-%m-%d')
+        nuevo = df_drift.assign(fecha=fecha)[['fecha'] + list(df_drift.columns)]
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        if os.path.exists(ruta):
+            anterior = pd.read_csv(ruta, dtype={'fecha': str})
+            nuevo = pd.concat([anterior[anterior['fecha'] != fecha], nuevo], ignore_index=True)
+        temporal = f'{ruta}.tmp'
+        nuevo.round({'psi': 5, 'kl': 5}).to_csv(temporal, index=False)
+        os.replace(temporal, ruta)
+        return ruta
+    except Exception as e:
+        print(f"❌ Error al registrar el drift: {e}")
+        return None
@@ -0,0 +1,689 @@
+"""
+Reentrenamiento del modelo de conversión (pre-contacto)
+Versión en script de notebooks/02_modelado_precontacto.ipynb para correr
+como tarea programada:
+
+1. Marca de agua de tb_modelo_conversion_intermediacion (query liviano)
+2. Matriz de features codificada: se lee de data/cache/entrenamiento/ si la
+   marca no cambió; si no, se carga la tabla, se codifica una vez y se guarda
+3. Los candidatos (LR / XGBoost / LightGBM) se entrenan en procesos
+   paralelos sobre el mismo split 80/20
+4. Se guardan el modelo y las columnas que usa cargar_modelo, se regenera
+   el bundle de scoring y el perfil de features para el monitor de drift
+
+Con --segmentar entrena en paralelo un XGBoost por tipo_de_gestion (o
+categoria_empresa) con los últimos --ventana-meses, más un global de la misma
+ventana para los segmentos chicos, y los publica en models/segmentos_precontacto/
+(prediccion_diaria.py --segmentado)
+
+Uso:
+    python scripts/entrenamiento.py
+    python scripts/entrenamiento.py --candidatos xgboost lightgbm --sin-guardar
+    python scripts/entrenamiento.py --segmentar tipo_de_gestion --ventana-meses 3
+"""
+
+import sys
+import os
+import json
+import time
+import pickle
+import hashlib
+import argparse
+import importlib.util
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from database import get_engine, query_to_dataframe
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from pipeline_features import crear_pipeline
+from artefacto_modelo import MODEL_PATH, COLUMNS_PATH, exportar_bundle
+from segmentos import SEGMENTACIONES, GLOBAL, normalizar_segmentos, exportar_segmentos
+from drift import NULO, clave_valor, histograma_probabilidad, guardar_perfil
+
+RUTA_CACHE_ENTRENAMIENTO = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'entrenamiento')
+RUTA_REPORTE = os.path.join(os.path.dirname(__file__), '..', 'models', 'entrenamiento_precontacto.json')
+
+TARGET = 'conversion'
+# Cambiar si cambia la forma de construir la matriz (invalida la caché)
+VERSION_MATRIZ = 4
+MATRICES_EN_CACHE = 3
+# Filas de entrenamiento mínimas para que un segmento tenga modelo propio
+MIN_FILAS_SEGMENTO = 5000
+# Días finales de la ventana que el perfil resume aparte (mix reciente para analisis_tipo_gestion)
+DIAS_PERFIL_RECIENTE = 60
+
+QUERY_MARCA = """
+    SELECT COUNT(*) AS filas, MAX(fecha_asignacion) AS ultima_asignacion, SUM(conversion) AS conversiones
+    FROM tb_modelo_conversion_intermediacion
+"""
+QUERY_MARCA_CONSOLIDACION = """
+    SELECT marca FROM tb_control_consolidacion WHERE proceso = 'modelo_conversion'
+"""
+# Solo las columnas de las features (la tabla ya trae las categorías del SP)
+QUERY_ENTRENAMIENTO = f"""
+    SELECT {', '.join(list(dict.fromkeys(CATEGORICAL_FEATURES + SEGMENTACIONES
+                                          + ['tiene_contacto_empresa', 'fecha_asignacion', TARGET])))}
+    FROM tb_modelo_conversion_intermediacion
+"""
+
+# Candidatos del notebook (mismos parámetros)
+CANDIDATOS = {
+    'regresion_logistica': {'max_iter': 1000, 'random_state': 42},
+    'xgboost': {
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'n_estimators': 200,
+        'objective': 'binary:logistic',
+        'eval_metric': 'auc',
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+        'random_state': 42,
+    },
+    'lightgbm': {
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'n_estimators': 200,
+        'objective': 'binary',
+        'metric': 'auc',
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+        'random_state': 42,
+        'verbose': -1,
+    },
+}
+# El scoring (bundle nativo) solo sabe cargar boosters de XGBoost
+CANDIDATOS_PUBLICABLES = ['xgboost']
+MODULO_CANDIDATO = {'regresion_logistica': 'sklearn', 'xgboost': 'xgboost', 'lightgbm': 'lightgbm'}
+
+
+# =====================================================
+# MATRIZ DE FEATURES
+# =====================================================
+
+def obtener_marca_agua(engine):
+    """Estado de la tabla de entrenamiento: si no cambia, la matriz en caché sigue sirviendo"""
+    df = query_to_dataframe(QUERY_MARCA, engine, cache=False)
+    if df is None:
+        return None
+    marca = {k: str(v) for k, v in df.iloc[0].items()}
+    try:
+        # Con la consolidación incremental (v6) cualquier cambio mueve esta marca
+        df_control = pd.read_sql(QUERY_MARCA_CONSOLIDACION, engine)
+        if len(df_control) > 0:
+            marca['consolidacion'] = str(df_control.iloc[0]['marca'])
+    except Exception:
+        pass
+    return marca
+
+
+def clave_matriz(marca):
+    contenido = json.dumps([VERSION_MATRIZ, marca, CATEGORICAL_FEATURES, NUMERIC_FEATURES], sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:16]
+
+
+def construir_matriz(df):
+    """
+    Codificar una vez con el mismo pipeline de features y codificador del scoring
+
+    La tabla ya trae las categorías del SP: el pipeline las reutiliza
+    (reutilizar_existentes), solo agrega las variables temporales y aprende
+    las columnas one-hot (sin copiar la tabla).
+
+    Returns:
+    --------
+    tuple
+        (X float32 densa, y int8, columnas)
+    """
+    if df[TARGET].isna().any():
+        df = df[df[TARGET].notna()]
+    pipeline = crear_pipeline(codificar=True, reutilizar_existentes=True)
+    X = np.ascontiguousarray(pipeline.fit_transform(df))
+    y = df[TARGET].to_numpy().astype(np.int8)
+    return X, y, pipeline['one_hot'].columnas_
+
+
+def columnas_auxiliares(df):
+    """
+    Arreglos por fila que se guardan junto a la matriz (mismas filas que construir_matriz)
+
+    - fecha_asignacion: ventana de meses recientes
+    - segmento_<columna>: clave de segmento normalizada
+    - codigos_<feature> / niveles_<feature>: valor crudo de cada categórica
+      (el one-hot pierde el nivel de referencia), para el perfil de drift
+    """
+    df = df[df[TARGET].notna()]
+    datos = {'fecha_asignacion': pd.to_datetime(df['fecha_asignacion']).to_numpy().astype('datetime64[D]')}
+    for columna in SEGMENTACIONES:
+        datos[f'segmento_{columna}'] = normalizar_segmentos(df[columna]).astype(str)
+    for feature in CATEGORICAL_FEATURES:
+        codigos, niveles = pd.factorize(df[feature])
+        datos[f'codigos_{feature}'] = codigos.astype(np.int32)
+        datos[f'niveles_{feature}'] = np.array([clave_valor(v) for v in niveles], dtype=str)
+    return datos
+
+
+def ruta_x(archivo):
+    """Ruta del .npy con X que acompaña al .npz de la matriz"""
+    return f'{os.path.splitext(archivo)[0]}_X.npy'
+
+
+def guardar_matriz(archivo, X, y, columnas, auxiliares=None):
+    """
+    Guardar la matriz: X en un .npy sin comprimir y el resto en un .npz comprimido
+
+    X va aparte y sin comprimir para que cada proceso la abra con mmap
+    (cargar_x) en lugar de descomprimirla entera; y, columnas y las
+    columnas auxiliares son chicas y siguen comprimidas.
+    """
+    for destino, escribir in ((ruta_x(archivo), lambda f: np.save(f, X)),
+                              (archivo, lambda f: np.savez_compressed(f, y=y, columnas=np.array(columnas),
+                                                                     **(auxiliares or {})))):
+        temporal = f'{destino}.tmp'
+        with open(temporal, 'wb') as f:
+            escribir(f)
+        os.replace(temporal, destino)
+
+
+def cargar_x(archivo):
+    """X de la matriz mapeada en memoria (solo lectura): X[filas] lee solo esas filas"""
+    return np.load(ruta_x(archivo), mmap_mode='r')
+
+
+def cargar_o_construir_matriz(engine, ruta=RUTA_CACHE_ENTRENAMIENTO, reconstruir=False):
+    """
+    Matriz de entrenamiento en caché por marca de agua
+
+    Se guarda densa (guardar_matriz): XGBoost trataría las entradas ausentes
+    de una matriz dispersa como faltantes en lugar de 0. X queda sin
+    comprimir para abrirla con mmap desde cada proceso.
+
+    Returns:
+    --------
+    tuple
+        (ruta del .npz, columnas, marca de agua); (None, None, None) si hay error
+    """
+    try:
+        marca = obtener_marca_agua(engine)
+        if marca is None:
+            return None, None, None
+        archivo = os.path.join(ruta, f'matriz_{clave_matriz(marca)}.npz')
+
+        if os.path.exists(archivo) and os.path.exists(ruta_x(archivo)) and not reconstruir:
+            with np.load(archivo) as datos:
+                columnas = datos['columnas'].tolist()
+                filas = len(datos['y'])
+            print(f"✅ Matriz desde caché ({filas:,} filas x {len(columnas)} columnas): {os.path.basename(archivo)}")
+            return archivo, columnas, marca
+
+        inicio = time.perf_counter()
+        df = query_to_dataframe(QUERY_ENTRENAMIENTO, engine, cache=False)
+        if df is None:
+            return None, None, None
+        X, y, columnas = construir_matriz(df)
+
+        os.makedirs(ruta, exist_ok=True)
+        guardar_matriz(archivo, X, y, columnas, columnas_auxiliares(df))
+        print(f"✅ Matriz construida ({X.shape[0]:,} filas x {X.shape[1]} columnas) en "
+              f"{time.perf_counter() - inicio:.1f} s y guardada en caché")
+
+        # Conservar solo las matrices más recientes
+        anteriores = sorted((os.path.join(ruta, f) for f in os.listdir(ruta) if f.endswith('.npz')),
+                            key=os.path.getmtime, reverse=True)
+        for viejo in anteriores[MATRICES_EN_CACHE:]:
+            os.remove(viejo)
+            if os.path.exists(ruta_x(viejo)):
+                os.remove(ruta_x(viejo))
+        return archivo, columnas, marca
+    except Exception as e:
+        print(f"❌ Error al construir la matriz: {e}")
+        return None, None, None
+
+
+# =====================================================
+# ENTRENAMIENTO
+# =====================================================
+
+def filas_ventana(fechas, ventana_meses):
+    """Índices de las filas de los últimos `ventana_meses` (hasta la fecha más reciente); todas si es None"""
+    if not ventana_meses:
+        return np.arange(len(fechas))
+    desde = pd.Timestamp(fechas.max()) - pd.DateOffset(months=ventana_meses)
+    return np.flatnonzero(fechas >= np.datetime64(desde.date(), 'D'))
+
+
+def split_ventana(archivo, ventana_meses=None):
+    """
+    Split 80/20 estratificado (random_state=42) de las filas de la ventana
+
+    Solo lee y y las fechas del .npz (no toca X). Es determinístico:
+    todos los procesos obtienen los mismos índices.
+
+    Returns:
+    --------
+    tuple
+        (índices de train, índices de test)
+    """
+    from sklearn.model_selection import train_test_split
+
+    with np.load(archivo) as datos:
+        y = datos['y']
+        filas = filas_ventana(datos['fecha_asignacion'], ventana_meses) if ventana_meses else np.arange(len(y))
+    return train_test_split(filas, test_size=0.2, random_state=42, stratify=y[filas])
+
+
+def cargar_split(archivo, ventana_meses=None):
+    """Split 80/20 estratificado del notebook (random_state=42), opcionalmente solo con los meses recientes"""
+    train, test = split_ventana(archivo, ventana_meses)
+    X = cargar_x(archivo)
+    with np.load(archivo) as datos:
+        y, columnas = datos['y'], datos['columnas'].tolist()
+    return (pd.DataFrame(X[train], columns=columnas, copy=False), pd.DataFrame(X[test], columns=columnas, copy=False),
+            y[train], y[test])
+
+
+def crear_modelo(nombre, n_jobs, ajustes=None):
+    """Candidato con los parámetros del notebook, reemplazados por `ajustes` (búsqueda de hiperparámetros)"""
+    parametros = dict(CANDIDATOS[nombre], **(ajustes or {}), n_jobs=n_jobs)
+    if nombre == 'regresion_logistica':
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(**parametros)
+    if nombre == 'xgboost':
+        import xgboost as xgb
+        return xgb.XGBClassifier(**parametros)
+    import lightgbm as lgb
+    return lgb.LGBMClassifier(**parametros)
+
+
+def entrenar_candidato(nombre, archivo, n_jobs=1, ventana_meses=None, ajustes=None):
+    """
+    Entrenar y evaluar un candidato (corre en un proceso aparte)
+
+    Cada proceso lee de la matriz en caché solo sus filas en lugar de recibirla serializada.
+
+    Returns:
+    --------
+    dict
+        nombre, modelo, auc, segundos (o error)
+    """
+    from sklearn.metrics import roc_auc_score
+
+    inicio = time.perf_counter()
+    try:
+        X_train, X_test, y_train, y_test = cargar_split(archivo, ventana_meses)
+        modelo = crear_modelo(nombre, n_jobs, ajustes)
+        modelo.fit(X_train, y_train)
+        auc = roc_auc_score(y_test, modelo.predict_proba(X_test)[:, 1])
+        return {'nombre': nombre, 'modelo': modelo, 'auc': float(auc),
+                'segundos': time.perf_counter() - inicio, 'error': None}
+    except Exception as e:
+        return {'nombre': nombre, 'modelo': None, 'auc': None,
+                'segundos': time.perf_counter() - inicio, 'error': str(e)}
+
+
+def entrenar_candidatos(archivo, candidatos, max_workers=None, ventana_meses=None, ajustes=None):
+    """
+    Entrenar los candidatos en paralelo (un proceso por candidato)
+
+    `ajustes` ({candidato: parámetros}) reemplaza los parámetros del notebook.
+
+    Los hilos de cada modelo se reparten entre los procesos para no
+    sobresuscribir la CPU.
+    """
+    ajustes = ajustes or {}
+    disponibles = []
+    for nombre in candidatos:
+        if importlib.util.find_spec(MODULO_CANDIDATO[nombre]) is None:
+            print(f"⚠️ {MODULO_CANDIDATO[nombre]} no está instalado: se omite {nombre}")
+        else:
+            disponibles.append(nombre)
+    if not disponibles:
+        return []
+
+    max_workers = max_workers or min(len(disponibles), os.cpu_count() or 1)
+    n_jobs = max(1, (os.cpu_count() or 1) // max_workers)
+    print(f"\n🏋️ Entrenando {', '.join(disponibles)} ({max_workers} procesos x {n_jobs} hilos)...")
+
+    inicio = time.perf_counter()
+    if max_workers == 1:
+        resultados = [entrenar_candidato(nombre, archivo, n_jobs, ventana_meses, ajustes.get(nombre))
+                      for nombre in disponibles]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = [executor.submit(entrenar_candidato, nombre, archivo, n_jobs, ventana_meses, ajustes.get(nombre))
+                       for nombre in disponibles]
+            resultados = [futuro.result() for futuro in futuros]
+    total = time.perf_counter() - inicio
+
+    for r in resultados:
+        if r['error']:
+            print(f"❌ {r['nombre']}: {r['error']}")
+        else:
+            print(f"✅ {r['nombre']:<22} AUC={r['auc']:.4f}  ({r['segundos']:.1f} s)")
+    suma = sum(r['segundos'] for r in resultados)
+    print(f"⏱️ Entrenamiento en {total:.1f} s (en secuencia serían ~{suma:.1f} s)")
+    return resultados
+
+
+def entrenar_segmento(clave, archivo, columna, ventana_meses=None, n_jobs=1, ajustes=None):
+    """
+    Entrenar el XGBoost de un segmento (GLOBAL: todas las filas de la ventana)
+
+    Usa el mismo split de la ventana que el global, restringido al segmento,
+    para que los AUC sean comparables sobre las mismas filas de test.
+
+    Returns:
+    --------
+    dict
+        clave, modelo, auc, filas, test (índices), p_test, segundos (o error)
+    """
+    from sklearn.metrics import roc_auc_score
+
+    inicio = time.perf_counter()
+    try:
+        train, test = split_ventana(archivo, ventana_meses)
+        X = cargar_x(archivo)
+        with np.load(archivo) as datos:
+            if clave != GLOBAL:
+                segmentos = datos[f'segmento_{columna}']
+                train, test = train[segmentos[train] == clave], test[segmentos[test] == clave]
+            y, columnas = datos['y'], datos['columnas'].tolist()
+
+        modelo = crear_modelo('xgboost', n_jobs, ajustes)
+        modelo.fit(pd.DataFrame(X[train], columns=columnas, copy=False), y[train])
+        p_test = modelo.predict_proba(pd.DataFrame(X[test], columns=columnas, copy=False))[:, 1]
+        auc = float(roc_auc_score(y[test], p_test)) if len(np.unique(y[test])) == 2 else None
+        return {'clave': clave, 'modelo': modelo, 'auc': auc, 'filas': len(train), 'test': test, 'p_test': p_test,
+                'segundos': time.perf_counter() - inicio, 'error': None}
+    except Exception as e:
+        return {'clave': clave, 'modelo': None, 'auc': None, 'filas': 0, 'test': None, 'p_test': None,
+                'segundos': time.perf_counter() - inicio, 'error': str(e)}
+
+
+def elegir_segmentos(archivo, columna, ventana_meses=None, min_filas=MIN_FILAS_SEGMENTO):
+    """Segmentos de la ventana con suficientes filas de train y ambas clases, de mayor a menor"""
+    train, _ = split_ventana(archivo, ventana_meses)
+    with np.load(archivo) as datos:
+        segmentos, y = datos[f'segmento_{columna}'][train], datos['y'][train]
+    conteo = pd.DataFrame({'segmento': segmentos, 'y': y}).groupby('segmento')['y'].agg(['size', 'min', 'max'])
+    validos = conteo[(conteo['size'] >= min_filas) & (conteo['min'] != conteo['max'])]
+    return validos.sort_values('size', ascending=False).index.tolist()
+
+
+def entrenar_segmentos(archivo, columna, ventana_meses=None, min_filas=MIN_FILAS_SEGMENTO, max_workers=None,
+                       ajustes=None):
+    """
+    Entrenar en paralelo el global de la ventana y un modelo por segmento
+
+    Los segmentos grandes se envían primero para repartir mejor la carga.
+    Al final compara el AUC de test del global contra el enrutado por
+    segmento (las filas de segmentos sin modelo propio usan el global).
+
+    Returns:
+    --------
+    tuple
+        (resultados por clave sin error, resumen para el reporte); ({}, None) si falla el global
+    """
+    from sklearn.metrics import roc_auc_score
+
+    claves = [GLOBAL] + elegir_segmentos(archivo, columna, ventana_meses, min_filas)
+    max_workers = max_workers or min(len(claves), os.cpu_count() or 1)
+    n_jobs = max(1, (os.cpu_count() or 1) // max_workers)
+    ventana = f"últimos {ventana_meses} meses" if ventana_meses else "todo el histórico"
+    print(f"\n🧩 Entrenando global + {len(claves) - 1} segmentos por {columna} ({ventana}, "
+          f"{max_workers} procesos x {n_jobs} hilos)...")
+
+    inicio = time.perf_counter()
+    if max_workers == 1:
+        lista = [entrenar_segmento(clave, archivo, columna, ventana_meses, n_jobs, ajustes) for clave in claves]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = [executor.submit(entrenar_segmento, clave, archivo, columna, ventana_meses, n_jobs, ajustes)
+                       for clave in claves]
+            lista = [futuro.result() for futuro in futuros]
+    total = time.perf_counter() - inicio
+
+    resultados = {}
+    for r in lista:
+        if r['error']:
+            print(f"❌ {r['clave']}: {r['error']}")
+        else:
+            resultados[r['clave']] = r
+    if GLOBAL not in resultados:
+        return {}, None
+
+    # Score enrutado sobre el test del global: cada fila con el modelo de su segmento
+    global_ = resultados[GLOBAL]
+    posicion = np.full(global_['test'].max() + 1, -1)
+    posicion[global_['test']] = np.arange(len(global_['test']))
+    with np.load(archivo) as datos:
+        y_test = datos['y'][global_['test']]
+    p_enrutado = global_['p_test'].copy()
+
+    resumen = {'segmentos': {}}
+    for clave, r in resultados.items():
+        filas_test = posicion[r['test']]
+        if clave != GLOBAL:
+            p_enrutado[filas_test] = r['p_test']
+        auc_global = (float(roc_auc_score(y_test[filas_test], global_['p_test'][filas_test]))
+                      if len(np.unique(y_test[filas_test])) == 2 else None)
+        resumen['segmentos'][clave] = {'filas_train': int(r['filas']), 'auc': r['auc'], 'auc_global': auc_global,
+                                       'segundos': round(r['segundos'], 2)}
+        etiqueta = 'GLOBAL' if clave == GLOBAL else clave
+        auc = f"{r['auc']:.4f}" if r['auc'] is not None else '  -   '
+        auc_g = f"{auc_global:.4f}" if auc_global is not None else '  -   '
+        print(f"✅ {etiqueta:<28} {r['filas']:>9,} filas  AUC={auc} (global: {auc_g})  ({r['segundos']:.1f} s)")
+
+    resumen['auc_global'] = global_['auc']
+    resumen['auc_segmentado'] = float(roc_auc_score(y_test, p_enrutado))
+    print(f"\n📊 AUC-ROC en test de la ventana: global={resumen['auc_global']:.4f}  "
+          f"por segmento={resumen['auc_segmentado']:.4f}")
+    suma = sum(r['segundos'] for r in lista)
+    print(f"⏱️ Entrenamiento en {total:.1f} s (en secuencia serían ~{suma:.1f} s)")
+    return resultados, resumen
+
+
+def _histogramas(datos, X, y, columnas, filas):
+    """Conteos y conversiones por valor de cada feature en `filas`"""
+    features = {}
+    for feature in CATEGORICAL_FEATURES:
+        niveles = datos[f'niveles_{feature}'].tolist() + [NULO]
+        codigos = datos[f'codigos_{feature}'][filas]
+        codigos = np.where(codigos < 0, len(niveles) - 1, codigos)
+        conteos = np.bincount(codigos, minlength=len(niveles))
+        conversiones = np.bincount(codigos, weights=y[filas], minlength=len(niveles))
+        features[feature] = {
+            'conteos': {v: int(n) for v, n in zip(niveles, conteos) if n},
+            'conversiones': {v: int(c) for v, n, c in zip(niveles, conteos, conversiones) if n},
+        }
+    for feature in NUMERIC_FEATURES:
+        valores, codigos = np.unique(X[filas, columnas.index(feature)], return_inverse=True)
+        conteos = np.bincount(codigos, minlength=len(valores))
+        conversiones = np.bincount(codigos, weights=y[filas], minlength=len(valores))
+        claves = [clave_valor(float(v)) for v in valores]
+        features[feature] = {
+            'conteos': dict(zip(claves, conteos.tolist())),
+            'conversiones': {k: int(c) for k, c in zip(claves, conversiones)},
+        }
+    return features
+
+
+def construir_perfil(archivo, modelo, ventana_meses=None, marca=None):
+    """
+    Perfil de referencia para el monitor de drift (se calcula una vez, al publicar)
+
+    Histograma por valor de cada feature sobre las filas de la ventana de
+    entrenamiento, el mismo resumen para los últimos DIAS_PERFIL_RECIENTE
+    días, y el histograma de probabilidades del modelo en el test.
+    """
+    train, test = split_ventana(archivo, ventana_meses)
+    filas = np.sort(np.concatenate([train, test]))
+    X = cargar_x(archivo)
+    with np.load(archivo) as datos:
+        y, columnas = datos['y'], datos['columnas'].tolist()
+        fechas = datos['fecha_asignacion'][filas]
+        recientes = filas[fechas >= fechas.max() - np.timedelta64(DIAS_PERFIL_RECIENTE, 'D')]
+        features = _histogramas(datos, X, y, columnas, filas)
+        features_recientes = _histogramas(datos, X, y, columnas, recientes)
+
+    p_test = modelo.predict_proba(pd.DataFrame(X[test], columns=columnas, copy=False))[:, 1]
+    return {
+        'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'marca_agua': marca,
+        'ventana_meses': ventana_meses,
+        'desde': str(fechas.min()),
+        'hasta': str(fechas.max()),
+        'filas': int(len(filas)),
+        'tasa_conversion': float(y[filas].mean()),
+        'features': features,
+        'reciente': {'dias': DIAS_PERFIL_RECIENTE, 'filas': int(len(recientes)), 'features': features_recientes},
+        'probabilidad': {'conteos': histograma_probabilidad(p_test).tolist(), 'promedio': float(p_test.mean())},
+    }
+
+
+def cargar_hiperparametros(ruta):
+    """Mejor configuración de XGBoost del reporte de busqueda_hiperparametros.py; None si hay error"""
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            parametros = json.load(f)['mejor']['parametros']
+        print(f"✅ Hiperparámetros de XGBoost desde {os.path.basename(ruta)}: {parametros}")
+        return parametros
+    except Exception as e:
+        print(f"❌ Error al leer los hiperparámetros: {e}")
+        return None
+
+
+def _escribir_pickle(objeto, ruta):
+    temporal = f'{ruta}.tmp'
+    with open(temporal, 'wb') as f:
+        pickle.dump(objeto, f)
+    os.replace(temporal, ruta)
+
+
+def guardar_artefactos(modelo, columnas, reporte, ruta_modelo=MODEL_PATH, ruta_columnas=COLUMNS_PATH, perfil=None):
+    """Modelo + columnas para cargar_modelo, bundle de scoring, perfil de drift y reporte del entrenamiento"""
+    try:
+        _escribir_pickle(modelo, ruta_modelo)
+        _escribir_pickle(list(columnas), ruta_columnas)
+        print(f"💾 Modelo guardado en: {os.path.normpath(ruta_modelo)}")
+        print(f"💾 Columnas del modelo guardadas en: {os.path.normpath(ruta_columnas)}")
+        exportar_bundle(ruta_modelo, ruta_columnas)
+        if perfil is not None:
+            guardar_perfil(perfil)
+        with open(RUTA_REPORTE, 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+        return True
+    except Exception as e:
+        print(f"❌ Error al guardar los artefactos: {e}")
+        return False
+
+
+def entrenar_y_publicar_segmentos(archivo, columnas, marca, args, ajustes=None):
+    """Modo --segmentar: no toca el modelo único ni su bundle"""
+    resultados, resumen = entrenar_segmentos(archivo, args.segmentar, args.ventana_meses, args.min_filas,
+                                             args.max_workers, (ajustes or {}).get('xgboost'))
+    if resumen is None:
+        print("❌ No se pudo entrenar el modelo global de la ventana")
+        sys.exit(1)
+    if args.sin_guardar:
+        print("\n⏭️ --sin-guardar: los modelos por segmento actuales no se modifican")
+        return
+
+    reporte = {
+        'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'marca_agua': marca,
+        'matriz': os.path.basename(archivo),
+        'ventana_meses': args.ventana_meses,
+        'min_filas': args.min_filas,
+        **resumen,
+    }
+    try:
+        exportar_segmentos({clave: r['modelo'] for clave, r in resultados.items()}, args.segmentar, columnas, reporte)
+    except Exception as e:
+        print(f"❌ Error al exportar los modelos por segmento: {e}")
+        sys.exit(1)
+    print("\n✅ REENTRENAMIENTO POR SEGMENTO COMPLETADO")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reentrenamiento del modelo de conversión (pre-contacto)')
+    parser.add_argument('--candidatos', nargs='+', choices=list(CANDIDATOS), default=list(CANDIDATOS))
+    parser.add_argument('--max-workers', type=int, default=None, help='Procesos de entrenamiento')
+    parser.add_argument('--reconstruir', action='store_true', help='Ignorar la matriz en caché')
+    parser.add_argument('--sin-guardar', action='store_true', help='Solo evaluar, sin reemplazar el modelo')
+    parser.add_argument('--ventana-meses', type=int, default=None,
+                        help='Entrenar solo con los últimos N meses de la tabla consolidada')
+    parser.add_argument('--segmentar', choices=SEGMENTACIONES, default=None,
+                        help='Un XGBoost por segmento (models/segmentos_precontacto) en lugar del modelo único')
+    parser.add_argument('--min-filas', type=int, default=MIN_FILAS_SEGMENTO,
+                        help='Filas de train mínimas para que un segmento tenga modelo propio')
+    parser.add_argument('--hiperparametros', default=None,
+                        help='Reporte de busqueda_hiperparametros.py: usar su mejor configuración de XGBoost')
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("🤖 REENTRENAMIENTO - MODELO DE CONVERSIÓN (PRE-CONTACTO)")
+    print("="*70 + "\n")
+
+    ajustes = {}
+    if args.hiperparametros:
+        ajustes['xgboost'] = cargar_hiperparametros(args.hiperparametros)
+        if ajustes['xgboost'] is None:
+            sys.exit(1)
+
+    engine = get_engine()
+    if engine is None:
+        sys.exit(1)
+
+    archivo, columnas, marca = cargar_o_construir_matriz(engine, reconstruir=args.reconstruir)
+    if archivo is None:
+        sys.exit(1)
+    # Cerrar las conexiones del pool antes de crear los procesos (no deben heredarlas)
+    engine.dispose()
+
+    if args.segmentar:
+        entrenar_y_publicar_segmentos(archivo, columnas, marca, args, ajustes)
+        return
+
+    resultados = [r for r in entrenar_candidatos(archivo, args.candidatos, args.max_workers, args.ventana_meses,
+                                                 ajustes) if not r['error']]
+    if not resultados:
+        print("❌ Ningún candidato se entrenó")
+        sys.exit(1)
+
+    mejor = max(resultados, key=lambda r: r['auc'])
+    publicables = [r for r in resultados if r['nombre'] in CANDIDATOS_PUBLICABLES]
+    print(f"\n🏆 Mejor modelo: {mejor['nombre']} (AUC-ROC: {mejor['auc']:.4f})")
+    if not publicables:
+        print("⚠️ Sin candidato XGBoost: el scoring no puede usar otros modelos, no se guarda nada")
+        sys.exit(1)
+    elegido = max(publicables, key=lambda r: r['auc'])
+    if elegido is not mejor:
+        print(f"⚠️ El scoring usa boosters de XGBoost: se publica {elegido['nombre']} "
+              f"(AUC-ROC: {elegido['auc']:.4f})")
+
+    if args.sin_guardar:
+        print("\n⏭️ --sin-guardar: el modelo actual no se modifica")
+        return
+
+    reporte = {
+        'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'marca_agua': marca,
+        'matriz': os.path.basename(archivo),
+        'ventana_meses': args.ventana_meses,
+        'hiperparametros': ajustes.get('xgboost'),
+        'columnas': len(columnas),
+        'modelo_publicado': elegido['nombre'],
+        'candidatos': {r['nombre']: {'auc': r['auc'], 'segundos': round(r['segundos'], 2)} for r in resultados},
+    }
+    perfil = construir_perfil(archivo, elegido['modelo'], args.ventana_meses, marca)
+    if not guardar_artefactos(elegido['modelo'], columnas, reporte, perfil=perfil):
+        sys.exit(1)
+    print("\n✅ REENTRENAMIENTO COMPLETADO")
+
+
+if __name__ == "__main__":
+    main()
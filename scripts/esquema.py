@@ -0,0 +1,125 @@
+"""
+Esquema de columnas del scoring
+Define qué columnas usa el modelo y cuáles se exportan, para pedir al query
+solo esas columnas y cargarlas con tipos compactos
+"""
+
+import re
+from datetime import datetime
+import pandas as pd
+
+# Features del modelo (mismo orden que en el notebook de entrenamiento)
+CATEGORICAL_FEATURES = ['tipo_de_gestion', 'rango_vacantes', 'categoria_cargo', 'categoria_empresa',
+                        'categoria_requisito', 'franja_hora_entrevista', 'categoria_documentacion']
+NUMERIC_FEATURES = ['tiene_contacto_empresa', 'dia_semana', 'mes', 'es_fin_semana']
+
+# Columnas crudas de tb_asignacion_intermediacion_v2_coalesce de las que sale cada feature
+# (las categorías de texto se toman de config/reglas_categorizacion.json)
+ORIGEN_FEATURES = {
+    'tipo_de_gestion': ['tipo_de_gestion'],
+    'rango_vacantes': ['numero_de_vacantes'],
+    'tiene_contacto_empresa': ['persona_contacto_empresa'],
+    'dia_semana': ['fecha_asignacion'],
+    'mes': ['fecha_asignacion'],
+    'es_fin_semana': ['fecha_asignacion'],
+}
+
+COLUMNAS_EXPORTACION = ['tipo_de_gestion', 'codigo_vacante', 'cargo', 'empresa', 'fecha_entrevista', 'hora_entrevista',
+                        'no_documento', 'nombres', 'apellidos', 'phone', 'email', 'codigo_unico_vacante',
+                        'probabilidad_conversion', 'score_priorizacion']
+
+# Columnas que genera el propio scoring (no vienen del query)
+COLUMNAS_CALCULADAS = ['probabilidad_conversion', 'score_priorizacion']
+
+# Tipos compactos al cargar. Las de COLUMNAS_CATEGORIA son siempre category (sin importar
+# cuántos valores distintos traiga el lote): mismo dtype todos los días, bloques y particiones
+COLUMNAS_FECHA = ['fecha_asignacion']
+COLUMNAS_CATEGORIA = ['tipo_de_gestion', 'cargo', 'empresa', 'requisito_profesional', 'hora_entrevista',
+                      'documentacion_requerida', 'persona_contacto_empresa']
+COLUMNAS_FLOAT32 = ['numero_de_vacantes']
+
+
+def columnas_requeridas(reglas=None):
+    """
+    Columnas crudas que necesita el scoring: origen de las features + exportación
+
+    Returns:
+    --------
+    list
+        Nombres de columna sin duplicados, en orden estable
+    """
+    if reglas is None:
+        from categorizacion import cargar_reglas
+        reglas = cargar_reglas()
+
+    columnas = []
+    for feature in CATEGORICAL_FEATURES + NUMERIC_FEATURES:
+        if feature in reglas.columnas:
+            columnas.append(reglas.columnas[feature])
+        else:
+            columnas.extend(ORIGEN_FEATURES[feature])
+    columnas.extend(c for c in COLUMNAS_EXPORTACION if c not in COLUMNAS_CALCULADAS)
+    return list(dict.fromkeys(columnas))
+
+
+def proyectar_columnas(query, columnas, alias='c'):
+    """
+    Reemplazar el `SELECT c.*` final del query por la lista de columnas
+
+    Solo toca el primer `SELECT <alias>.*`; si el query no lo tiene se
+    retorna sin cambios.
+    """
+    lista = ',\n    '.join(f'{alias}.{c}' for c in columnas)
+    return re.sub(rf'SELECT\s+{alias}\.\*', lambda _: f'SELECT \n    {lista}', query, count=1)
+
+
+def parametros_periodo(fecha_ejecucion=None):
+    """
+    Parámetros de los queries de asignaciones para una fecha de ejecución
+
+    Mes en curso hasta ayer: fecha_inicio (primer día del mes, incluido),
+    fecha_fin (fecha de ejecución, excluida) y periodo (YYYYMM) del mes.
+    Comparar fecha_asignacion contra el rango (en lugar de DATE(...)) deja
+    usar el índice.
+    """
+    fecha = pd.Timestamp(fecha_ejecucion or datetime.now()).normalize()
+    inicio = fecha.replace(day=1)
+    return {
+        'periodo': int(inicio.strftime('%Y%m')),
+        'fecha_inicio': inicio.strftime('%Y-%m-%d'),
+        'fecha_fin': fecha.strftime('%Y-%m-%d'),
+    }
+
+
+def compactar_tipos(df):
+    """
+    Convertir columnas a tipos compactos (in place)
+
+    - Columnas de texto de COLUMNAS_CATEGORIA -> category
+    - numero_de_vacantes -> float32
+    - fecha_asignacion -> datetime64
+    """
+    for col in COLUMNAS_FECHA:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+    for col in COLUMNAS_FLOAT32:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    for col in COLUMNAS_CATEGORIA:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def memoria_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def reporte_memoria(etiqueta_antes, df_antes, etiqueta_despues, df_despues):
+    """Imprimir memoria total y por fila de dos versiones del mismo DataFrame"""
+    filas = max(len(df_antes), 1)
+    antes, despues = memoria_mb(df_antes), memoria_mb(df_despues)
+    print(f"📊 Memoria {etiqueta_antes}: {antes:,.1f} MB ({antes * 1024 ** 2 / filas:,.0f} B/fila, "
+          f"{df_antes.shape[1]} columnas)")
+    print(f"📊 Memoria {etiqueta_despues}: {despues:,.1f} MB ({despues * 1024 ** 2 / filas:,.0f} B/fila, "
+          f"{df_despues.shape[1]} columnas) -> {(1 - despues / antes) * 100 if antes else 0:.0f}% menos")
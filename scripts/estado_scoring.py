@@ -0,0 +1,107 @@
+"""
+Estado del scoring incremental
+Guarda las asignaciones ya puntuadas del mes (con su probabilidad) para que
+la predicción diaria solo puntúe las nuevas
+"""
+
+import os
+import hashlib
+from datetime import datetime
+import pandas as pd
+
+RUTA_ESTADO = os.path.join(os.path.dirname(__file__), '..', 'data', 'estado', 'scoring_incremental.pkl')
+CLAVE = 'codigo_unico_vacante'
+
+
+def calcular_huella(rutas, extra=''):
+    """Huella de los artefactos que determinan el score (modelo, columnas, reglas)"""
+    h = hashlib.sha256(extra.encode('utf-8'))
+    for ruta in rutas:
+        with open(ruta, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class EstadoScoring:
+    """
+    Asignaciones puntuadas del mes en curso
+
+    Attributes:
+    -----------
+    df : pd.DataFrame
+        Una fila por `codigo_unico_vacante` con las columnas de `generar_predicciones`
+    huella : str
+        Huella del modelo + reglas con que se calcularon los scores
+    periodo : str
+        Mes (YYYYMM) al que pertenecen los scores
+    marca_agua : pd.Timestamp or None
+        Mayor `fecha_asignacion` puntuada
+    """
+
+    def __init__(self, huella, periodo, df=None, marca_agua=None, actualizado=None):
+        self.huella = huella
+        self.periodo = periodo
+        self.df = df if df is not None else pd.DataFrame(columns=[CLAVE])
+        self.marca_agua = marca_agua
+        self.actualizado = actualizado
+
+    def claves_faltantes(self, df_vigentes):
+        """Filas de `df_vigentes` cuya clave aún no tiene score"""
+        return df_vigentes[~df_vigentes[CLAVE].isin(self.df[CLAVE])]
+
+    def agregar(self, df_resultado):
+        """Upsert por clave de filas recién puntuadas"""
+        if len(df_resultado) == 0:
+            return
+        combinado = pd.concat([self.df, df_resultado], ignore_index=True) if len(self.df) else df_resultado
+        self.df = combinado.drop_duplicates(CLAVE, keep='last').reset_index(drop=True)
+        self.marca_agua = pd.to_datetime(self.df['fecha_asignacion']).max()
+
+    def resultado_vigente(self, df_vigentes):
+        """
+        Scores de las asignaciones vigentes, en el orden del query
+
+        Las claves que ya no pasan los filtros de exclusión quedan fuera
+        porque solo se conservan las que trae `df_vigentes`.
+        """
+        return df_vigentes[[CLAVE]].merge(self.df, on=CLAVE, how='inner')
+
+    def podar(self, df_vigentes):
+        """Descartar claves que ya no están vigentes (fuera del mes o excluidas)"""
+        self.df = self.df[self.df[CLAVE].isin(df_vigentes[CLAVE])].reset_index(drop=True)
+
+
+def cargar_estado(huella, periodo, ruta=RUTA_ESTADO):
+    """
+    Cargar el estado guardado
+
+    Si no existe, o si fue calculado con otro modelo/reglas o en otro mes,
+    retorna un estado vacío (se puntúa todo de nuevo).
+    """
+    if os.path.exists(ruta):
+        try:
+            guardado = pd.read_pickle(ruta)
+            if guardado['huella'] == huella and guardado['periodo'] == periodo:
+                print(f"✅ Estado incremental: {len(guardado['df']):,} asignaciones ya puntuadas "
+                      f"(marca de agua {guardado['marca_agua']})")
+                return EstadoScoring(huella, periodo, guardado['df'], guardado['marca_agua'], guardado['actualizado'])
+            print("⚠️ Estado incremental de otro modelo o periodo: se puntúa todo")
+        except Exception as e:
+            print(f"⚠️ Estado incremental ilegible, se descarta: {e}")
+    return EstadoScoring(huella, periodo)
+
+
+def guardar_estado(estado, ruta=RUTA_ESTADO):
+    """Guardar el estado (escritura atómica: archivo temporal + replace)"""
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    estado.actualizado = datetime.now()
+    temporal = ruta + '.tmp'
+    pd.to_pickle({
+        'huella': estado.huella,
+        'periodo': estado.periodo,
+        'marca_agua': estado.marca_agua,
+        'actualizado': estado.actualizado,
+        'df': estado.df,
+    }, temporal)
+    os.replace(temporal, ruta)
+    print(f"✅ Estado incremental guardado: {len(estado.df):,} asignaciones")
@@ -0,0 +1,233 @@
+"""
+Exportación de resultados del scoring
+Escribe los Excel por score, el Excel consolidado y los CSV para Vicidial.
+El resultado se particiona una sola vez por score y los siete archivos se
+escriben uno tras otro (por defecto) o, si se pide, en paralelo con procesos
+o hilos, midiendo el tiempo de cada uno
+"""
+
+import os
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from esquema import COLUMNAS_EXPORTACION
+from instrumentacion import instrumentar
+
+SCORES = ['Alto', 'Medio', 'Bajo']
+# Filas máximas de una hoja de Excel (sin el encabezado)
+MAX_FILAS_EXCEL = 1_048_575
+
+# Escritores de Excel:
+#   openpyxl   -> DataFrame.to_excel (encabezado con formato, el de siempre)
+#   streaming  -> openpyxl write_only (filas en streaming, sin formato)
+#   xlsxwriter -> xlsxwriter constant_memory (requiere el paquete xlsxwriter)
+MOTORES_EXCEL = ['openpyxl', 'streaming', 'xlsxwriter']
+MODOS_PARALELO = ['procesos', 'hilos', 'no']
+
+
+def directorios_salida():
+    output_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'predicciones')
+    analisis_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'analisis')
+    vicidial_dir = r'C:\Users\JuanD.Ramirez\Documents\Colsubsidio\Colsubsidio_Agencia_Empleo\data\upload_vicidial'
+
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(analisis_dir, exist_ok=True)
+    os.makedirs(vicidial_dir, exist_ok=True)
+    return output_dir, analisis_dir, vicidial_dir
+
+
+def filas_exportacion(df):
+    """Filas como tuplas con None en lugar de NaN (para openpyxl write_only)"""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def escribir_excel(df, filepath, motor='openpyxl'):
+    """Escribir un Excel y retornar (filepath, registros, segundos)"""
+    inicio = time.perf_counter()
+    if motor == 'streaming':
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(list(df.columns))
+        for fila in filas_exportacion(df):
+            ws.append(fila)
+        wb.save(filepath)
+    elif motor == 'xlsxwriter':
+        import pandas as pd
+        with pd.ExcelWriter(filepath, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True}}) as writer:
+            df.to_excel(writer, index=False)
+    else:
+        df.to_excel(filepath, index=False, engine='openpyxl')
+    return filepath, len(df), time.perf_counter() - inicio
+
+
+def escribir_csv(df, filepath):
+    """Escribir un CSV y retornar (filepath, registros, segundos)"""
+    inicio = time.perf_counter()
+    df.to_csv(filepath, index=False, encoding='utf-8')
+    return filepath, len(df), time.perf_counter() - inicio
+
+
+def resolver_motor(motor):
+    """xlsxwriter es opcional: si no está instalado se usa el modo streaming de openpyxl"""
+    if motor == 'xlsxwriter':
+        try:
+            import xlsxwriter  # noqa: F401
+        except ImportError:
+            print("⚠️ xlsxwriter no está instalado: se usa openpyxl en modo streaming")
+            return 'streaming'
+    return motor
+
+
+@instrumentar()
+def exportar_archivos(df_resultado, motor='openpyxl', paralelo='no', max_workers=None, directorios=None):
+    """
+    Exportar los 3 Excel por score, el consolidado y los 3 CSV de Vicidial
+
+    Parameters:
+    -----------
+    df_resultado : pd.DataFrame
+        Salida de generar_predicciones
+    motor : str
+        Escritor de Excel (ver MOTORES_EXCEL)
+    paralelo : str
+        'no' (secuencial, por defecto), 'procesos' (openpyxl es Python puro:
+        con hilos compite por el GIL) o 'hilos'. 'procesos' envía cada partición
+        a su proceso (en Windows, spawn + pickle del DataFrame): usarlo solo
+        donde benchmarks/benchmark_exportacion.py muestre que compensa
+    max_workers : int, optional
+        Tamaño del pool (por defecto uno por archivo, hasta el número de CPUs)
+    directorios : tuple, optional
+        (output_dir, analisis_dir, vicidial_dir); por defecto directorios_salida()
+
+    Returns:
+    --------
+    list
+        Rutas generadas, en el mismo orden de siempre (Excel por score,
+        consolidado, CSV por score)
+    """
+    fecha_str = datetime.now().strftime('%Y%m%d')
+    output_dir, analisis_dir, vicidial_dir = directorios or directorios_salida()
+    motor = resolver_motor(motor)
+
+    # Una sola partición por score
+    df_export = df_resultado[COLUMNAS_EXPORTACION]
+    particiones = {score: df_score for score, df_score in df_export.groupby('score_priorizacion', sort=False)}
+
+    tareas = []
+    for score in SCORES:
+        if score in particiones:
+            tareas.append((f'Excel: Score_{score}', escribir_excel, particiones[score],
+                           os.path.join(output_dir, f'COLSAGEM - Score_{score}_{fecha_str}.xlsx'), motor))
+    tareas.append(('Excel: Consolidado', escribir_excel, df_export,
+                   os.path.join(analisis_dir, f'Consolidado_Analisis_{fecha_str}.xlsx'), motor))
+    for score in SCORES:
+        if score in particiones:
+            tareas.append((f'CSV: Score_{score}', escribir_csv, particiones[score],
+                           os.path.join(vicidial_dir, f'COLSAGEM - Score_{score}_{fecha_str}.csv')))
+
+    inicio = time.perf_counter()
+    if paralelo == 'no':
+        resultados = [funcion(*args) for _, funcion, *args in tareas]
+    else:
+        workers = max_workers or min(len(tareas), os.cpu_count() or 1)
+        pool = ProcessPoolExecutor if paralelo == 'procesos' else ThreadPoolExecutor
+        with pool(max_workers=workers) as executor:
+            futuros = [executor.submit(funcion, *args) for _, funcion, *args in tareas]
+            resultados = [futuro.result() for futuro in futuros]
+    total = time.perf_counter() - inicio
+
+    archivos = []
+    for (descripcion, *_), (filepath, registros, segundos) in zip(tareas, resultados):
+        archivos.append(filepath)
+        print(f"✅ {descripcion} ({registros} registros) - {segundos:.2f} s")
+    print(f"⏱️ Exportación: {total:.2f} s ({len(archivos)} archivos, motor={motor}, paralelo={paralelo})")
+    return archivos
+
+
+class ExportadorIncremental:
+    """
+    Mismos archivos que `exportar_archivos`, escritos bloque a bloque
+
+    Los Excel usan openpyxl en modo write_only (filas en streaming) y los CSV
+    se abren en modo append; así la memoria no crece con el total de filas.
+    Los archivos por score solo se crean si llega al menos una fila.
+
+    Cada Excel se llena hasta `max_filas_excel` (el límite de una hoja) y
+    las filas que no caben se omiten solo en ese Excel: los CSV reciben
+    siempre todas las filas.
+    """
+
+    def __init__(self, directorios=None, max_filas_excel=MAX_FILAS_EXCEL):
+        self.fecha_str = datetime.now().strftime('%Y%m%d')
+        self.output_dir, self.analisis_dir, self.vicidial_dir = directorios or directorios_salida()
+        self.max_filas_excel = max_filas_excel
+        self.excel = {}
+        self.csv = {}
+        self.conteos = {score: 0 for score in SCORES}
+        self.total = 0
+        # Filas escritas en cada Excel (None = consolidado) y Excel que quedaron incompletos
+        self.filas_excel = {}
+        self.excel_incompletos = []
+        self.consolidado = self._abrir_excel(
+            os.path.join(self.analisis_dir, f'Consolidado_Analisis_{self.fecha_str}.xlsx'))
+
+    def _abrir_excel(self, filepath):
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(COLUMNAS_EXPORTACION)
+        return filepath, wb, ws
+
+    def _agregar_excel(self, clave, ws, df):
+        """Agregar a la hoja las filas de `df` que caben; avisa una vez por Excel si sobran"""
+        escritas = self.filas_excel.get(clave, 0)
+        espacio = max(0, self.max_filas_excel - escritas)
+        for fila in filas_exportacion(df.iloc[:espacio]):
+            ws.append(fila)
+        self.filas_excel[clave] = escritas + min(espacio, len(df))
+        if len(df) > espacio and clave not in self.excel_incompletos:
+            self.excel_incompletos.append(clave)
+            nombre = 'Consolidado' if clave is None else f'Score_{clave}'
+            print(f"⚠️ Excel {nombre}: más de {self.max_filas_excel:,} filas no caben en una hoja; "
+                  f"el resto sigue solo en el CSV/Parquet")
+
+    def agregar(self, df_resultado):
+        df_export = df_resultado[COLUMNAS_EXPORTACION]
+        self._agregar_excel(None, self.consolidado[2], df_export)
+        self.total += len(df_export)
+
+        for score, df_score in df_export.groupby('score_priorizacion', sort=False):
+            if score not in self.excel:
+                self.excel[score] = self._abrir_excel(
+                    os.path.join(self.output_dir, f'COLSAGEM - Score_{score}_{self.fecha_str}.xlsx'))
+                filepath_csv = os.path.join(self.vicidial_dir, f'COLSAGEM - Score_{score}_{self.fecha_str}.csv')
+                self.csv[score] = (filepath_csv, open(filepath_csv, 'w', encoding='utf-8', newline=''))
+                df_score.iloc[:0].to_csv(self.csv[score][1], index=False)
+            self._agregar_excel(score, self.excel[score][2], df_score)
+            df_score.to_csv(self.csv[score][1], index=False, header=False)
+            self.conteos[score] += len(df_score)
+
+    def cerrar(self):
+        archivos = []
+        for score in SCORES:
+            if score in self.excel:
+                filepath, wb, _ = self.excel[score]
+                wb.save(filepath)
+                archivos.append(filepath)
+                print(f"✅ Excel: Score_{score} ({self.filas_excel.get(score, 0)} registros)")
+
+        filepath, wb, _ = self.consolidado
+        wb.save(filepath)
+        archivos.append(filepath)
+        print(f"✅ Excel: Consolidado ({self.filas_excel.get(None, 0)} registros)")
+
+        for score in SCORES:
+            if score in self.csv:
+                filepath_csv, f = self.csv[score]
+                f.close()
+                archivos.append(filepath_csv)
+                print(f"✅ CSV: Score_{score} ({self.conteos[score]} registros)")
+        return archivos
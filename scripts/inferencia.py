@@ -0,0 +1,114 @@
+"""
+Inferencia por tabla
+Las features del modelo son one-hot y enteros chicos (día, mes, flags), así
+que cada fila cae en una de pocas combinaciones. Se puntúa cada combinación
+distinta una sola vez y el resultado se reparte por lookup; las combinaciones
+que no están en la tabla se puntúan con el modelo y se agregan
+"""
+
+import numpy as np
+import pandas as pd
+
+from codificador import CodificadorOneHot
+
+# Rango admitido para cada feature numérica en la clave (enteros 0..RADIX_NUMERICO-1)
+RADIX_NUMERICO = 64
+# Las claves se calculan en float64: por encima de 2**53 dejan de ser exactas
+MAX_CLAVE = 2 ** 53
+
+
+class InferenciaTabla:
+    """
+    Envoltorio de un modelo con `predict_proba` que cachea el score por combinación
+
+    La clave de una fila es `X @ pesos` (base mixta: cada nivel del one-hot
+    y cada valor numérico ocupa su propio dígito), exacta en float64. Las
+    filas con numéricas fuera de rango o no enteras se puntúan directo.
+
+    Parameters:
+    -----------
+    modelo : objeto con predict_proba
+        XGBClassifier, ModeloBooster o ModeloDiferido
+    columnas_modelo : list
+        Columnas del modelo, en el orden en que llegan a predict_proba
+    max_entradas : int
+        Combinaciones máximas en la tabla; al superarlo se vacía
+    """
+
+    def __init__(self, modelo, columnas_modelo, max_entradas=1_000_000):
+        self.modelo = modelo
+        self.max_entradas = max_entradas
+        self.tabla = {}
+        self.filas = 0
+        self.combinaciones = 0
+        self.puntuadas = 0
+        self.directas = 0
+
+        codificador = CodificadorOneHot(columnas_modelo)
+        pesos = np.zeros(len(columnas_modelo), dtype=np.float64)
+        multiplicador = 1
+        for f in codificador.categorical_features:
+            for nivel, j in enumerate(codificador.indices[f], start=1):
+                pesos[j] = nivel * multiplicador
+            multiplicador *= len(codificador.indices[f]) + 1
+        self.indices_numericas = np.array([j for _, j in codificador.indices_numericas], dtype=np.intp)
+        for j in self.indices_numericas:
+            pesos[j] = multiplicador
+            multiplicador *= RADIX_NUMERICO
+
+        # Si la base no cabe en float64 exacto, todo va directo al modelo
+        self.pesos = pesos if multiplicador <= MAX_CLAVE else None
+
+    def _claves(self, M):
+        claves = M @ self.pesos
+        numericas = M[:, self.indices_numericas]
+        invalidas = ((numericas != np.floor(numericas)) | (numericas < 0) | (numericas >= RADIX_NUMERICO)).any(axis=1)
+        claves[invalidas] = np.nan
+        return claves
+
+    def _predecir(self, X, filas):
+        subconjunto = X.iloc[filas] if isinstance(X, pd.DataFrame) else X[filas]
+        return self.modelo.predict_proba(subconjunto)[:, 1]
+
+    def predict_proba(self, X):
+        if self.pesos is None:
+            self.filas += len(X)
+            self.directas += len(X)
+            return self.modelo.predict_proba(X)
+
+        M = np.asarray(X, dtype=np.float64)
+        n = len(M)
+        codigos, unicos = pd.factorize(self._claves(M))
+
+        # float32 como predict_proba de XGBoost (NaN = combinación sin score)
+        p_unicos = np.array([self.tabla.get(k, np.nan) for k in unicos.tolist()], dtype=np.float32)
+        faltantes = np.flatnonzero(np.isnan(p_unicos))
+        validas = codigos >= 0
+        self.filas += n
+        self.combinaciones += len(unicos)
+        if len(faltantes):
+            # Primera fila de cada combinación (asignación en reversa: gana la primera)
+            filas_validas = np.flatnonzero(validas)
+            primera = np.empty(len(unicos), dtype=np.intp)
+            primera[codigos[filas_validas][::-1]] = filas_validas[::-1]
+            p_nuevas = self._predecir(X, primera[faltantes])
+            p_unicos[faltantes] = p_nuevas
+            if len(self.tabla) + len(faltantes) > self.max_entradas:
+                self.tabla.clear()
+            self.tabla.update(zip(unicos[faltantes].tolist(), p_nuevas.tolist()))
+            self.puntuadas += len(faltantes)
+
+        p = np.empty(n, dtype=np.float32)
+        p[validas] = p_unicos[codigos[validas]]
+        if not validas.all():
+            p[~validas] = self._predecir(X, np.flatnonzero(~validas))
+            self.directas += int((~validas).sum())
+        return np.vstack((1.0 - p, p)).T
+
+    def imprimir_estadisticas(self):
+        """Filas puntuadas vs combinaciones que realmente pasaron por el modelo"""
+        print("\n🧮 Inferencia por tabla:")
+        print(f"   - {self.filas:,} filas, {self.combinaciones:,} combinaciones distintas "
+              f"({self.combinaciones - self.puntuadas:,} ya en la tabla, {self.puntuadas:,} nuevas)")
+        print(f"   - {self.puntuadas + self.directas:,} filas por el modelo "
+              f"({self.directas:,} directas por numéricas fuera de rango)")
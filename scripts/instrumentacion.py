@@ -0,0 +1,364 @@
+"""
+Instrumentación de ejecuciones
+Spans livianos (context manager `span` y decorador `instrumentar`) que
+registran duración, filas, pico de memoria del proceso y errores de cada
+etapa, y un manifiesto JSON por ejecución en data/ejecuciones/ con los spans,
+un resumen por etapa y los archivos generados. Sin una corrida activa
+(iniciar_corrida) los spans no hacen nada, así las funciones instrumentadas
+se pueden usar igual desde notebooks, benchmarks o el servicio.
+
+Con perfil=True la corrida además guarda un cProfile (.prof, formato pstats:
+snakeviz, `python -m pstats` o gprof2dot). Para un perfil por muestreo sin
+tocar el código: `py-spy record -o perfil.svg -- python scripts/prediccion_diaria.py`
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import cProfile
+import functools
+import threading
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: rss_pico_mb usa psutil o GetProcessMemoryInfo
+    resource = None
+
+RUTA_EJECUCIONES = os.path.join(os.path.dirname(__file__), '..', 'data', 'ejecuciones')
+VERSION_MANIFIESTO = 1
+
+_corrida = None
+_local = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def _lector_pico_windows():
+    """
+    Función que retorna el pico del working set del proceso en bytes (Windows)
+
+    Con psutil si está instalado (memory_info().peak_wset); si no, con
+    GetProcessMemoryInfo de la API de Windows vía ctypes. None si ninguno
+    está disponible.
+    """
+    try:
+        import psutil
+        proceso = psutil.Process()
+        return lambda: proceso.memory_info().peak_wset
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ContadoresMemoria(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        kernel32 = ctypes.WinDLL('kernel32')
+        psapi = ctypes.WinDLL('psapi')
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(ContadoresMemoria), wintypes.DWORD]
+        psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+
+        def leer():
+            contadores = ContadoresMemoria()
+            contadores.cb = ctypes.sizeof(ContadoresMemoria)
+            if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(contadores), contadores.cb):
+                return None
+            return contadores.PeakWorkingSetSize
+        return leer
+    except (ImportError, OSError, AttributeError):
+        return None
+
+
+def rss_pico_mb():
+    """Pico de memoria residente del proceso hasta ahora (None si el sistema no lo expone)"""
+    if resource is None:
+        # Windows: pico del working set
+        leer = _lector_pico_windows() if sys.platform == 'win32' else None
+        pico = leer() if leer is not None else None
+        return pico / 1024 ** 2 if pico is not None else None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB; macOS, bytes
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+def descripcion_sql(query):
+    """Primer comentario del query (o su inicio) y una huella corta para agrupar ejecuciones"""
+    lineas = [linea.strip() for linea in query.strip().splitlines() if linea.strip()]
+    comentario = next((linea.lstrip('- ').strip() for linea in lineas if linea.startswith('--')), None)
+    texto = ' '.join(linea for linea in lineas if not linea.startswith('--'))
+    return {
+        'sql': comentario or texto[:100],
+        'huella_sql': hashlib.sha1(texto.encode('utf-8')).hexdigest()[:12],
+    }
+
+
+class Span:
+    """Una etapa medida; `filas` y `datos` se pueden completar dentro del bloque"""
+
+    def __init__(self, corrida, nombre, datos):
+        self.corrida = corrida
+        self.nombre = nombre
+        self.datos = datos
+        self.filas = None
+
+    def __enter__(self):
+        pila = _pila()
+        self.padre = pila[-1].nombre if pila else None
+        pila.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, error, traza):
+        segundos = time.perf_counter() - self.inicio
+        _pila().pop()
+        registro = {
+            'nombre': self.nombre,
+            'inicio_s': round(self.inicio - self.corrida.inicio_perf, 4),
+            'segundos': round(segundos, 4),
+            'filas': self.filas,
+            'rss_pico_mb': _redondear(rss_pico_mb()),
+        }
+        if self.padre:
+            registro['padre'] = self.padre
+        if threading.current_thread() is not threading.main_thread():
+            registro['hilo'] = threading.current_thread().name
+        if error is not None:
+            registro['error'] = f'{tipo.__name__}: {error}'
+        registro.update(self.datos)
+        self.corrida.agregar_span(registro)
+        return False
+
+
+class _SpanNulo:
+    """Span sin corrida activa: mismo uso, sin costo"""
+
+    filas = None
+
+    def __init__(self):
+        self.datos = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, error, traza):
+        return False
+
+
+def _pila():
+    if not hasattr(_local, 'pila'):
+        _local.pila = []
+    return _local.pila
+
+
+def _redondear(valor, decimales=1):
+    return round(valor, decimales) if valor is not None else None
+
+
+def _contar_filas(valor):
+    """Filas de un DataFrame/Series/array; None para otros resultados"""
+    if hasattr(valor, 'shape') and getattr(valor, 'ndim', 0) >= 1:
+        return int(valor.shape[0])
+    return None
+
+
+class Corrida:
+    """
+    Spans, archivos y datos de una ejecución, guardados como manifiesto JSON
+
+    Parameters:
+    -----------
+    nombre : str
+        Proceso (p. ej. 'prediccion_diaria'); prefijo del manifiesto
+    argumentos : dict, optional
+        Argumentos de la línea de comandos
+    perfil : bool
+        Perfilar con cProfile hasta `cerrar`
+    ruta : str
+        Directorio de los manifiestos
+    """
+
+    def __init__(self, nombre, argumentos=None, perfil=False, ruta=RUTA_EJECUCIONES):
+        self.nombre = nombre
+        self.argumentos = argumentos or {}
+        self.ruta = ruta
+        self.id = f"{nombre}_{datetime.now():%Y%m%d_%H%M%S}"
+        self.fecha_inicio = datetime.now()
+        self.inicio_perf = time.perf_counter()
+        self.spans = []
+        self.archivos = []
+        self.datos = {}
+        self.estado = 'en curso'
+        self._lock = threading.Lock()
+        self._perfil = None
+        if perfil:
+            self._perfil = cProfile.Profile()
+            self._perfil.enable()
+
+    def agregar_span(self, registro):
+        with self._lock:
+            self.spans.append(registro)
+
+    def agregar_archivos(self, archivos):
+        for archivo in archivos or []:
+            if archivo:
+                self.archivos.append(os.path.normpath(archivo))
+
+    def resumen_etapas(self):
+        """Suma por nombre de span (los que se repiten por bloque quedan en una línea)"""
+        resumen = {}
+        for s in self.spans:
+            r = resumen.setdefault(s['nombre'], {'llamadas': 0, 'segundos': 0.0, 'filas': 0, 'errores': 0})
+            r['llamadas'] += 1
+            r['segundos'] = round(r['segundos'] + s['segundos'], 4)
+            r['filas'] += s['filas'] or 0
+            r['errores'] += 'error' in s
+        return resumen
+
+    def manifiesto(self):
+        return {
+            'version': VERSION_MANIFIESTO,
+            'id': self.id,
+            'proceso': self.nombre,
+            'estado': self.estado,
+            'inicio': self.fecha_inicio.strftime('%Y-%m-%d %H:%M:%S'),
+            'segundos': round(time.perf_counter() - self.inicio_perf, 3),
+            'rss_pico_mb': _redondear(rss_pico_mb()),
+            'pid': os.getpid(),
+            'python': sys.version.split()[0],
+            'argumentos': self.argumentos,
+            'etapas': self.resumen_etapas(),
+            'spans': self.spans,
+            'archivos': self.archivos,
+            **self.datos,
+        }
+
+    def cerrar(self, estado=None):
+        """
+        Detener el perfil (si hay) y escribir el manifiesto
+
+        Returns:
+        --------
+        str
+            Ruta del manifiesto; None si no se pudo escribir
+        """
+        if estado is not None:
+            self.estado = estado
+        try:
+            os.makedirs(self.ruta, exist_ok=True)
+            if self._perfil is not None:
+                self._perfil.disable()
+                ruta_perfil = os.path.join(self.ruta, f'{self.id}.prof')
+                self._perfil.dump_stats(ruta_perfil)
+                self._perfil = None
+                self.datos['perfil'] = os.path.normpath(ruta_perfil)
+            archivo = os.path.join(self.ruta, f'{self.id}.json')
+            temporal = f'{archivo}.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(self.manifiesto(), f, ensure_ascii=False, indent=2, default=str)
+            os.replace(temporal, archivo)
+            return archivo
+        except Exception as e:
+            print(f"❌ Error al guardar el manifiesto de la ejecución: {e}")
+            return None
+
+    def imprimir(self):
+        print("\n⏱️ Etapas:")
+        for nombre, r in self.resumen_etapas().items():
+            llamadas = f" x{r['llamadas']}" if r['llamadas'] > 1 else ''
+            filas = f"  {r['filas']:>11,} filas" if r['filas'] else ''
+            errores = f"  ❌ {r['errores']} con error" if r['errores'] else ''
+            print(f"   {nombre + llamadas:<32}{r['segundos']:>9.2f} s{filas}{errores}")
+        pico = rss_pico_mb()
+        if pico is not None:
+            print(f"   Pico de memoria (RSS): {pico:,.0f} MB")
+
+
+def iniciar_corrida(nombre, argumentos=None, perfil=False, ruta=RUTA_EJECUCIONES):
+    """Activar una corrida: desde aquí los spans del proceso se registran en ella"""
+    global _corrida
+    _corrida = Corrida(nombre, argumentos, perfil, ruta)
+    return _corrida
+
+
+def finalizar_corrida(estado=None):
+    """Cerrar la corrida activa; retorna la ruta del manifiesto"""
+    global _corrida
+    corrida, _corrida = _corrida, None
+    if corrida is None:
+        return None
+    return corrida.cerrar(estado)
+
+
+def corrida_actual():
+    return _corrida
+
+
+def _despues_de_fork():
+    """Un proceso hijo (pool con fork) no registra en la corrida del padre ni hereda su perfil"""
+    global _corrida, _local
+    if _corrida is not None and _corrida._perfil is not None:
+        _corrida._perfil.disable()
+    _corrida = None
+    _local = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_despues_de_fork)
+
+
+def span(nombre, **datos):
+    """Context manager que mide un bloque (no hace nada sin corrida activa)"""
+    if _corrida is None:
+        return _SpanNulo()
+    return Span(_corrida, nombre, datos)
+
+
+def anotar(**datos):
+    """Agregar datos al span abierto más interno del hilo actual"""
+    pila = _pila() if _corrida is not None else None
+    if pila:
+        pila[-1].datos.update(datos)
+
+
+def registrar_span(nombre, segundos, filas=None, **datos):
+    """Registrar una etapa medida por fuera (p. ej. un generador que se consume por partes)"""
+    if _corrida is None:
+        return
+    _corrida.agregar_span({'nombre': nombre, 'inicio_s': round(time.perf_counter() - segundos - _corrida.inicio_perf, 4),
+                           'segundos': round(segundos, 4), 'filas': filas, 'rss_pico_mb': _redondear(rss_pico_mb()),
+                           **datos})
+
+
+def instrumentar(nombre=None):
+    """
+    Decorador: un span por llamada, con las filas del resultado
+
+    Si el resultado no tiene filas (p. ej. una lista de archivos), se usan
+    las del primer argumento que sea un DataFrame.
+    """
+    def decorador(funcion):
+        etiqueta = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _corrida is None:
+                return funcion(*args, **kwargs)
+            with span(etiqueta) as s:
+                resultado = funcion(*args, **kwargs)
+                if resultado is None:
+                    # Las funciones del proyecto retornan None cuando fallan (ya imprimieron el error)
+                    s.datos['sin_resultado'] = True
+                s.filas = _contar_filas(resultado)
+                if s.filas is None:
+                    s.filas = next((_contar_filas(a) for a in args if _contar_filas(a) is not None), None)
+                return resultado
+        return envoltura
+    return decorador
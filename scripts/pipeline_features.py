@@ -0,0 +1,372 @@
+"""
+Pipeline de features compartido
+Un solo preprocesamiento para el scoring (prediccion_diaria.py,
+servicio_scoring.py), el diagnóstico y el entrenamiento. Cada paso tiene la
+interfaz de los transformadores de sklearn (fit / transform / fit_transform /
+get_params / set_params), así se puede meter en un sklearn.pipeline.Pipeline,
+pero no importa sklearn: el scoring lo carga solo en segundo plano.
+
+Los pasos trabajan columna a columna sobre el mismo DataFrame: no lo copian,
+le agregan las columnas derivadas. Por defecto las calculan siempre; con
+reutilizar_existentes=True (solo el entrenamiento: la tabla ya trae las
+categorías del SP) calculan solo las que faltan. El pipeline acumula por paso
+segundos, filas, MB agregados y el pico de memoria (RSS del proceso; con
+trazar_memoria también el pico de tracemalloc del paso)
+"""
+
+import time
+import inspect
+import tracemalloc
+import pandas as pd
+
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from categorizacion import cargar_reglas, categorizar_rango_vacantes
+from codificador import CodificadorOneHot, obtener_codificador
+from instrumentacion import rss_pico_mb
+
+
+def columnas_one_hot(df):
+    """
+    Columnas que genera pd.get_dummies(..., drop_first=True) del notebook:
+    numéricas y luego `<feature>_<valor>` por valor ordenado, sin el primero
+    """
+    columnas = list(NUMERIC_FEATURES)
+    for feature in CATEGORICAL_FEATURES:
+        valores = sorted(df[feature].dropna().astype(str).unique())
+        columnas.extend(f'{feature}_{valor}' for valor in valores[1:])
+    return columnas
+
+
+# =====================================================
+# PASOS
+# =====================================================
+
+class PasoFeatures:
+    """
+    Paso del pipeline con la interfaz de un transformador de sklearn
+
+    Las subclases definen `salidas` y `_derivar(df, columnas)`, que agrega
+    a `df` (in place) las columnas de `columnas`. Una salida que `df` ya
+    trae se recalcula (y reemplaza), salvo con reutilizar_existentes=True:
+    entonces se deja como está y, si ya están todas, el paso no hace nada.
+    """
+
+    nombre = 'paso'
+    salidas = []
+    reutilizar_existentes = False
+
+    def fit(self, df, y=None):
+        return self
+
+    def transform(self, df):
+        columnas = self.salidas
+        if self.reutilizar_existentes:
+            columnas = [c for c in columnas if c not in df.columns]
+        if columnas:
+            self._derivar(df, columnas)
+        return df
+
+    def fit_transform(self, df, y=None):
+        return self.fit(df, y).transform(df)
+
+    def _derivar(self, df, columnas):
+        raise NotImplementedError
+
+    def get_params(self, deep=True):
+        parametros = inspect.signature(type(self).__init__).parameters
+        return {p: getattr(self, p) for p in parametros if p != 'self'}
+
+    def set_params(self, **parametros):
+        for clave, valor in parametros.items():
+            setattr(self, clave, valor)
+        return self
+
+    def __repr__(self):
+        parametros = ', '.join(f'{k}={v!r}' for k, v in self.get_params().items())
+        return f'{type(self).__name__}({parametros})'
+
+
+class RangoVacantes(PasoFeatures):
+    """numero_de_vacantes -> rango_vacantes (category)"""
+
+    nombre = 'rango_vacantes'
+    salidas = ['rango_vacantes']
+
+    def __init__(self, reutilizar_existentes=False):
+        self.reutilizar_existentes = reutilizar_existentes
+
+    def _derivar(self, df, columnas):
+        if not pd.api.types.is_numeric_dtype(df['numero_de_vacantes']):
+            df['numero_de_vacantes'] = pd.to_numeric(df['numero_de_vacantes'], errors='coerce')
+        df['rango_vacantes'] = categorizar_rango_vacantes(df['numero_de_vacantes'], como_categoria=True)
+
+
+class CategoriasTexto(PasoFeatures):
+    """
+    Categorías de texto con las reglas compartidas con el SP
+    (config/reglas_categorizacion.json)
+
+    Parameters:
+    -----------
+    reglas : ReglasCategorizacion, optional
+        Por defecto cargar_reglas() (se carga al primer uso)
+    cache : CacheCategorias, optional
+        Caché texto crudo -> categoría
+    reutilizar_existentes : bool
+        Dejar las categorías que el DataFrame ya trae (tabla del SP)
+    """
+
+    nombre = 'categorias'
+
+    def __init__(self, reglas=None, cache=None, reutilizar_existentes=False):
+        self.reglas = reglas
+        self.cache = cache
+        self.reutilizar_existentes = reutilizar_existentes
+
+    @property
+    def salidas(self):
+        return list(self._reglas().categorizadores)
+
+    def _reglas(self):
+        if self.reglas is None:
+            self.reglas = cargar_reglas()
+        return self.reglas
+
+    def fit(self, df, y=None):
+        self._reglas()
+        return self
+
+    def _derivar(self, df, columnas):
+        reglas = self._reglas()
+        for feature in columnas:
+            df[feature] = reglas[feature].categorizar(df[reglas.columnas[feature]], self.cache, feature,
+                                                      como_categoria=True)
+
+
+class ContactoEmpresa(PasoFeatures):
+    """persona_contacto_empresa -> tiene_contacto_empresa (int8)"""
+
+    nombre = 'contacto_empresa'
+    salidas = ['tiene_contacto_empresa']
+
+    def __init__(self, reutilizar_existentes=False):
+        self.reutilizar_existentes = reutilizar_existentes
+
+    def _derivar(self, df, columnas):
+        df['tiene_contacto_empresa'] = df['persona_contacto_empresa'].notna().astype('int8')
+
+
+class VariablesTemporales(PasoFeatures):
+    """Variables temporales del notebook (sección 3.2) desde fecha_asignacion"""
+
+    nombre = 'temporales'
+    salidas = ['dia_semana', 'mes', 'es_fin_semana']
+
+    def __init__(self, reutilizar_existentes=False):
+        self.reutilizar_existentes = reutilizar_existentes
+
+    def _derivar(self, df, columnas):
+        if not pd.api.types.is_datetime64_any_dtype(df['fecha_asignacion']):
+            df['fecha_asignacion'] = pd.to_datetime(df['fecha_asignacion'])
+        fecha = df['fecha_asignacion'].dt
+        dia_semana = fecha.dayofweek.astype('int8')
+        if 'dia_semana' in columnas:
+            df['dia_semana'] = dia_semana
+        if 'mes' in columnas:
+            df['mes'] = fecha.month.astype('int8')
+        if 'es_fin_semana' in columnas:
+            df['es_fin_semana'] = (dia_semana >= 5).astype('int8')
+
+
+class CodificacionOneHot(PasoFeatures):
+    """
+    Paso final opcional: matriz one-hot densa (float32) con CodificadorOneHot
+
+    Parameters:
+    -----------
+    columnas_modelo : list, optional
+        Columnas del modelo publicado. Sin ellas, `fit` las aprende de los
+        datos como get_dummies(drop_first=True) del notebook (entrenamiento)
+    """
+
+    nombre = 'one_hot'
+    salidas = []
+
+    def __init__(self, columnas_modelo=None):
+        self.columnas_modelo = columnas_modelo
+
+    def fit(self, df, y=None):
+        if self.columnas_modelo is None:
+            self.columnas_ = columnas_one_hot(df)
+            self.codificador_ = CodificadorOneHot(self.columnas_)
+        else:
+            self.columnas_ = list(self.columnas_modelo)
+            self.codificador_ = obtener_codificador(self.columnas_)
+        return self
+
+    def transform(self, df):
+        if not hasattr(self, 'codificador_'):
+            if self.columnas_modelo is None:
+                raise RuntimeError('CodificacionOneHot sin columnas_modelo necesita fit antes de transform')
+            self.fit(df)
+        return self.codificador_.transformar(df)
+
+
+# =====================================================
+# PIPELINE
+# =====================================================
+
+class MetricasPipeline:
+    """
+    Tiempos y memoria por paso, acumulados entre llamadas (p. ej. bloques)
+
+    Parameters:
+    -----------
+    trazar_memoria : bool
+        Medir además el pico de memoria de cada paso con tracemalloc (numpy y
+        pandas le reportan sus arreglos); hace más lento el pipeline
+    """
+
+    def __init__(self, trazar_memoria=False):
+        self.trazar_memoria = trazar_memoria
+        self.pasos = {}
+
+    def medir(self, nombre, funcion, df):
+        """Correr `funcion(df)` y acumular sus métricas bajo `nombre`"""
+        columnas_antes = set(df.columns) if isinstance(df, pd.DataFrame) else set()
+        if self.trazar_memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        rss_antes = rss_pico_mb()
+        inicio = time.perf_counter()
+
+        salida = funcion(df)
+
+        segundos = time.perf_counter() - inicio
+        if isinstance(salida, pd.DataFrame):
+            nuevas = [c for c in salida.columns if c not in columnas_antes]
+            mb = sum(salida[c].memory_usage(deep=True, index=False) for c in nuevas) / 1024 ** 2
+        else:
+            nuevas = []
+            mb = getattr(salida, 'nbytes', 0) / 1024 ** 2
+        rss = rss_pico_mb()
+
+        m = self.pasos.setdefault(nombre, {'llamadas': 0, 'filas': 0, 'segundos': 0.0, 'mb_agregados': 0.0,
+                                           'columnas_agregadas': [], 'aumento_rss_mb': 0.0, 'rss_pico_mb': None,
+                                           'pico_mb': None})
+        m['llamadas'] += 1
+        m['filas'] += len(df)
+        m['segundos'] += segundos
+        m['mb_agregados'] += mb
+        m['columnas_agregadas'] = list(dict.fromkeys(m['columnas_agregadas'] + nuevas))
+        if rss is not None:
+            m['aumento_rss_mb'] += rss - rss_antes
+            m['rss_pico_mb'] = rss
+        if self.trazar_memoria:
+            pico = (tracemalloc.get_traced_memory()[1] - base) / 1024 ** 2
+            m['pico_mb'] = max(m['pico_mb'] or 0.0, pico)
+        return salida
+
+    def resumen(self):
+        """Métricas por paso como dict serializable (JSON)"""
+        return {nombre: {k: round(v, 4) if isinstance(v, float) else v for k, v in m.items()}
+                for nombre, m in self.pasos.items()}
+
+    def imprimir(self):
+        if not self.pasos:
+            return
+        print("\n⏱️ Pipeline de features por paso:")
+        for nombre, m in self.pasos.items():
+            pico = f"  pico {m['pico_mb']:,.1f} MB" if m['pico_mb'] is not None else ''
+            rss = f"  RSS +{m['aumento_rss_mb']:,.1f} MB" if m['rss_pico_mb'] is not None else ''
+            print(f"   {nombre:<18}{m['segundos']:>8.3f} s  {m['filas']:>11,} filas  "
+                  f"+{m['mb_agregados']:,.1f} MB ({len(m['columnas_agregadas'])} columnas){pico}{rss}")
+
+    def cerrar(self):
+        if self.trazar_memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class PipelineFeatures:
+    """
+    Cadena de pasos aplicada en orden sobre el mismo DataFrame
+
+    `transform` retorna la salida del último paso: el mismo DataFrame con
+    las columnas derivadas o, si termina en CodificacionOneHot, la matriz.
+
+    Parameters:
+    -----------
+    pasos : list
+        Pasos con fit / transform (PasoFeatures o transformadores de sklearn
+        que acepten y devuelvan DataFrames)
+    metricas : MetricasPipeline, optional
+        Acumulador compartido (por defecto uno propio)
+    """
+
+    def __init__(self, pasos, metricas=None):
+        self.pasos = list(pasos)
+        self.metricas = metricas if metricas is not None else MetricasPipeline()
+
+    def _nombre(self, paso):
+        return getattr(paso, 'nombre', type(paso).__name__)
+
+    def fit(self, df, y=None):
+        for paso in self.pasos[:-1]:
+            df = self.metricas.medir(self._nombre(paso), lambda d, p=paso: p.fit_transform(d, y), df)
+        if self.pasos:
+            self.pasos[-1].fit(df, y)
+        return self
+
+    def transform(self, df):
+        for paso in self.pasos:
+            df = self.metricas.medir(self._nombre(paso), paso.transform, df)
+        return df
+
+    def fit_transform(self, df, y=None):
+        for paso in self.pasos:
+            df = self.metricas.medir(self._nombre(paso), lambda d, p=paso: p.fit_transform(d, y), df)
+        return df
+
+    def get_params(self, deep=True):
+        return {'pasos': self.pasos, 'metricas': self.metricas}
+
+    def set_params(self, **parametros):
+        for clave, valor in parametros.items():
+            setattr(self, clave, valor)
+        return self
+
+    def __getitem__(self, nombre):
+        for paso in self.pasos:
+            if self._nombre(paso) == nombre:
+                return paso
+        raise KeyError(nombre)
+
+
+def crear_pipeline(cache=None, reglas=None, columnas_modelo=None, codificar=False, metricas=None,
+                   reutilizar_existentes=False):
+    """
+    Pipeline de features del modelo
+
+    Parameters:
+    -----------
+    cache : CacheCategorias, optional
+        Caché de categorías del scoring
+    reglas : ReglasCategorizacion, optional
+        Reglas de categorización (por defecto las de config/)
+    columnas_modelo : list, optional
+        Columnas del modelo publicado para el paso one-hot
+    codificar : bool
+        Terminar en CodificacionOneHot (transform retorna la matriz)
+    metricas : MetricasPipeline, optional
+        Acumulador de métricas compartido entre pipelines o bloques
+    reutilizar_existentes : bool
+        No recalcular las features que el DataFrame ya trae (entrenamiento
+        sobre tb_modelo_conversion_intermediacion, categorizada por el SP)
+    """
+    pasos = [RangoVacantes(reutilizar_existentes), CategoriasTexto(reglas, cache, reutilizar_existentes),
+             ContactoEmpresa(reutilizar_existentes), VariablesTemporales(reutilizar_existentes)]
+    if codificar or columnas_modelo is not None:
+        pasos.append(CodificacionOneHot(columnas_modelo))
+    return PipelineFeatures(pasos, metricas)
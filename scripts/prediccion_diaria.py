@@ -5,30 +5,38 @@ Genera scores de priorización para nuevas asignaciones
 
 import sys
 import os
+import argparse
 from datetime import datetime
+import numpy as np
 import pandas as pd
-import pickle
 import warnings
 warnings.filterwarnings('ignore')
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-from database import get_engine, query_to_dataframe
+from database import get_engine, query_to_dataframe, query_en_chunks
+from categorizacion import cargar_reglas, abrir_cache_categorias
+from estado_scoring import CLAVE, calcular_huella, cargar_estado, guardar_estado
+from esquema import columnas_requeridas, proyectar_columnas, parametros_periodo, compactar_tipos
+from codificador import obtener_codificador
+from artefacto_modelo import MODEL_PATH, COLUMNS_PATH, cargar_modelo_scoring
+from inferencia import InferenciaTabla
+from pipeline_features import MetricasPipeline, crear_pipeline
+from instrumentacion import iniciar_corrida, finalizar_corrida, instrumentar, span
+from segmentos import ModeloSegmentado, cargar_modelo_segmentado
+from drift import PROBABILIDAD, MonitorDrift, cargar_perfil, imprimir_drift, registrar_drift
+from analisis_parquet import escribir_consolidado_parquet
+from exportacion import MOTORES_EXCEL, MODOS_PARALELO, exportar_archivos, ExportadorIncremental
 
-def cargar_modelo():
-    try:
-        model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'modelo_conversion_precontacto.pkl')
-        columns_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'model_columns_precontacto.pkl')
-        
-        with open(model_path, 'rb') as f:
-            modelo = pickle.load(f)
-        with open(columns_path, 'rb') as f:
-            columnas_modelo = pickle.load(f)
-        
-        print("✅ Modelo cargado")
-        return modelo, columnas_modelo
-    except Exception as e:
-        print(f"❌ Error: {e}")
+def cargar_modelo(segmentado=False):
+    if segmentado:
+        # Un booster por segmento (entrenamiento.py --segmentar), cada uno con su tabla de inferencia
+        return cargar_modelo_segmentado()
+    # Bundle nativo; xgboost se importa y el booster se carga en segundo plano mientras corre el query
+    modelo, columnas_modelo = cargar_modelo_scoring()
+    if modelo is None:
         return None, None
+    # Cada combinación distinta de features se puntúa una vez (también entre bloques)
+    return InferenciaTabla(modelo, columnas_modelo), columnas_modelo
 
 def cargar_query_sql(nombre_archivo):
     try:
@@ -39,200 +47,267 @@ def cargar_query_sql(nombre_archivo):
         print(f"❌ Error: {e}")
         return None
 
+def cargar_query_proyectado(nombre_archivo):
+    """Query con solo las columnas que usa el scoring en lugar de c.*"""
+    query = cargar_query_sql(nombre_archivo)
+    if query is None:
+        return None
+    return proyectar_columnas(query, columnas_requeridas())
+
+@instrumentar()
 def obtener_asignaciones_nuevas(engine):
-    query = cargar_query_sql('query_asignaciones_diarias.sql')
+    query = cargar_query_proyectado('query_asignaciones_diarias.sql')
     if query is None:
         return None
     
     try:
-        df = query_to_dataframe(query, engine)
+        # Siempre datos frescos de la BD; el resultado queda en caché para diagnóstico/análisis
+        df = query_to_dataframe(query, engine, params=parametros_periodo(), cache='refrescar')
+        if df is None:
+            return None
+        # Tipos compactos sobre el mismo frame (la comparación antes/después está en benchmarks/benchmark_memoria.py)
+        compactar_tipos(df)
         print(f"✅ Asignaciones: {len(df):,}")
         return df
     except Exception as e:
         print(f"❌ Error: {e}")
         return None
 
-def preprocesar_datos(df):
-    df_procesado = df.copy()
-    
-    # RANGO VACANTES
-    df_procesado['numero_de_vacantes'] = pd.to_numeric(df_procesado['numero_de_vacantes'], errors='coerce')
-    df_procesado['rango_vacantes'] = df_procesado['numero_de_vacantes'].apply(lambda x: 
-        '1-100' if x < 100 else '100-200' if x < 200 else '200-300' if x < 300 else '300+' if x >= 300 else 'sin_informacion')
-    
-    # CATEGORIAS (funciones simplificadas - mismo código que antes)
-    def categorizar_cargo(cargo):
-        if pd.isna(cargo): return 'otros'
-        cargo_upper = str(cargo).upper()
-        if any(w in cargo_upper for w in ['LIMPIEZA', 'ASEO', 'SERVICIOS GENERALES']): return 'limpieza_aseo'
-        elif any(w in cargo_upper for w in ['SEGURIDAD', 'VIGILANTE']): return 'seguridad'
-        elif any(w in cargo_upper for w in ['BODEGA', 'LOGISTIC', 'ALMACEN']): return 'bodega_logistica'
-        elif any(w in cargo_upper for w in ['PRODUCCION', 'OPERARIO', 'EMPAQUE']): return 'produccion'
-        elif any(w in cargo_upper for w in ['COMERCIAL', 'VENTAS', 'ASESOR']): return 'ventas_comercial'
-        elif 'CALL CENTER' in cargo_upper or 'CONTACT CENTER' in cargo_upper: return 'call_center'
-        elif any(w in cargo_upper for w in ['COCINA', 'COCINERO', 'MESERO']): return 'cocina_alimentos'
-        elif any(w in cargo_upper for w in ['CONDUCTOR', 'MOTORIZADO', 'DOMICILIARIO']): return 'conductor_transporte'
-        elif any(w in cargo_upper for w in ['TECNICO', 'ELECTRICISTA', 'MECANICO']): return 'tecnico'
-        elif any(w in cargo_upper for w in ['MEDICO', 'ODONTOLOGO', 'ENFERMERA']): return 'profesional_salud'
-        elif 'AUXILIAR' in cargo_upper and not any(w in cargo_upper for w in ['BODEGA', 'LOGISTIC', 'PRODUCCION']): return 'auxiliar_general'
-        elif 'CAJERO' in cargo_upper: return 'cajero'
-        elif any(w in cargo_upper for w in ['ARCHIVO', 'DIGITACION']): return 'archivo_digitacion'
-        else: return 'otros'
-    
-    def categorizar_empresa(empresa):
-        if pd.isna(empresa): return 'otras'
-        e = str(empresa).upper()
-        if any(w in e for w in ['CASALIMPIA', 'ASEOS', 'ECOLIMPIEZA', 'NASE']): return 'limpieza'
-        elif any(w in e for w in ['SECURITAS', 'VISE', 'SEGURIDAD NACIONAL', 'LIBERTADORA']): return 'seguridad'
-        elif any(w in e for w in ['MANPOWER', 'ADECCO', 'PRODUCTIVIDAD EMPRESARIAL', 'TEMPORAL', 'FLEXITEMP']): return 'servicios_temporales'
-        elif any(w in e for w in ['D1', 'ARA', 'ALKOSTO', 'EXITO']): return 'retail'
-        elif any(w in e for w in ['ATENTO', 'DICO', 'TELEPERFORMANCE', 'BRM', 'MANEJO TECNICO']): return 'bpo_callcenter'
-        elif any(w in e for w in ['HERMECO', 'OFFCORSS', 'PERMODA', 'KOAJ']): return 'manufactura_textil'
-        elif any(w in e for w in ['LADRILLERA', 'PROTELA', 'FORTOX']): return 'manufactura_industrial'
-        elif any(w in e for w in ['FRISBY', 'LISTOS', 'QUALA', 'GOYURT']): return 'alimentos'
-        elif any(w in e for w in ['CONSORCIO EXPRESS', 'GMOVIL', 'DITRANSA']): return 'transporte_logistica'
-        elif any(w in e for w in ['EMERMEDICA', 'KERALTY', 'AGM SALUD']): return 'salud'
-        elif any(w in e for w in ['RECUPERAR', 'RECAUDO', 'CARTERA']): return 'cobranza'
-        elif any(w in e for w in ['CONSTRUCTORA', 'CONSTRUCCION']): return 'construccion'
-        elif any(w in e for w in ['THOMAS GREG', 'OPTICENTRO', 'SERDAN']): return 'servicios_especializados'
-        elif any(w in e for w in ['INVERSIONES EL CARNAL', 'CALZATODO']): return 'ventas_comercial'
-        elif 'COLSUBSIDIO' in e: return 'colsubsidio'
-        elif any(w in e for w in ['AGROPECUARIA', 'FLORICULTOR']): return 'agropecuaria'
-        else: return 'otras'
-    
-    def categorizar_requisito(req):
-        if pd.isna(req) or str(req).strip() in ['', '-']: return 'sin_especificar'
-        r = str(req).upper()
-        if any(w in r for w in ['PROFESIONAL', 'MEDICO', 'INGENIERO']): return 'profesional'
-        elif 'TECNOLOGO' in r: return 'tecnologo'
-        elif any(w in r for w in ['TECNICO', 'CURSO', 'VIGILANCIA']): return 'tecnico'
-        elif 'BACHILLER' in r: return 'bachiller'
-        elif any(w in r for w in ['PRIMARIA', 'NOVENO']): return 'basica'
-        elif 'NO APLICA' in r: return 'sin_requisito'
-        else: return 'otros'
-    
-    def categorizar_hora(hora):
-        if pd.isna(hora) or str(hora).strip() in ['', '-']: return 'sin_hora'
-        h = str(hora).upper()
-        if '-' in h: return 'multiple'
-        elif any(x in h for x in ['07:', '08:', '09:', '10:', '11:', 'AM']): return 'manana'
-        elif any(x in h for x in ['12:', '01:', '02:', '03:', '04:', '05:', 'PM']): return 'tarde'
-        else: return 'sin_hora'
-    
-    def categorizar_doc(doc):
-        if pd.isna(doc) or str(doc).strip() in ['', '-']: return 'sin_especificar'
-        d = str(doc).upper()
-        if any(w in d for w in ['ANTECEDENTES', 'ADRES', 'LIBRETA', 'PENSION']): return 'completa'
-        elif any(w in d for w in ['HOJA', 'VIDA', 'CEDULA', 'CERTIFICADO']): return 'media'
-        elif 'DOCUMENTO' in d: return 'basica'
-        else: return 'otros'
-    
-    df_procesado['categoria_cargo'] = df_procesado['cargo'].apply(categorizar_cargo)
-    df_procesado['categoria_empresa'] = df_procesado['empresa'].apply(categorizar_empresa)
-    df_procesado['categoria_requisito'] = df_procesado['requisito_profesional'].apply(categorizar_requisito)
-    df_procesado['tiene_contacto_empresa'] = df_procesado['persona_contacto_empresa'].notna().astype(int)
-    df_procesado['franja_hora_entrevista'] = df_procesado['hora_entrevista'].apply(categorizar_hora)
-    df_procesado['categoria_documentacion'] = df_procesado['documentacion_requerida'].apply(categorizar_doc)
-    
-    df_procesado['fecha_asignacion'] = pd.to_datetime(df_procesado['fecha_asignacion'])
-    df_procesado['dia_semana'] = df_procesado['fecha_asignacion'].dt.dayofweek
-    df_procesado['mes'] = df_procesado['fecha_asignacion'].dt.month
-    df_procesado['es_fin_semana'] = (df_procesado['dia_semana'] >= 5).astype(int)
-    
-    print("✅ Datos preprocesados")
-    return df_procesado
-
-def generar_predicciones(df_procesado, modelo, columnas_modelo):
-    categorical_features = ['tipo_de_gestion', 'rango_vacantes', 'categoria_cargo', 'categoria_empresa', 
-                           'categoria_requisito', 'franja_hora_entrevista', 'categoria_documentacion']
-    numeric_features = ['tiene_contacto_empresa', 'dia_semana', 'mes', 'es_fin_semana']
+def obtener_asignaciones_incremental(engine, modelo, columnas_modelo, pipeline=None):
+    """
+    Puntuar solo las asignaciones nuevas y reutilizar los scores guardados
     
-    df_encoded = pd.get_dummies(df_procesado[categorical_features + numeric_features], 
-                                columns=categorical_features, drop_first=True)
+    1. Trae las claves vigentes del mes (mismos filtros de exclusión del query diario)
+    2. Trae columnas completas solo desde la fecha más antigua sin score
+    3. Puntúa esas filas, las agrega al estado y descarta las que ya no son vigentes
+    """
+    reglas = cargar_reglas()
+    # Los scores guardados dejan de servir si cambia el modelo (o los modelos por segmento)
+    huella = calcular_huella([MODEL_PATH, COLUMNS_PATH] + getattr(modelo, 'archivos', []), extra=reglas.huella)
+    estado = cargar_estado(huella, datetime.now().strftime('%Y%m'))
     
-    for col in columnas_modelo:
-        if col not in df_encoded.columns:
-            df_encoded[col] = 0
+    query_vigentes = cargar_query_sql('query_asignaciones_vigentes.sql')
+    if query_vigentes is None:
+        return None
+    # El estado incremental ya es la caché de este flujo: las claves vigentes siempre de la BD
+    df_vigentes = query_to_dataframe(query_vigentes, engine, params=parametros_periodo(), cache=False)
+    if df_vigentes is None:
+        return None
+    print(f"✅ Asignaciones vigentes: {len(df_vigentes):,}")
+    
+    df_faltantes = estado.claves_faltantes(df_vigentes)
+    if len(df_faltantes) > 0:
+        fecha_desde = pd.to_datetime(df_faltantes['fecha_asignacion']).min().strftime('%Y-%m-%d')
+        query_desde = cargar_query_proyectado('query_asignaciones_desde.sql')
+        if query_desde is None:
+            return None
+        df_nuevas = query_to_dataframe(query_desde, engine, params={**parametros_periodo(), 'fecha_desde': fecha_desde},
+                                       cache=False)
+        if df_nuevas is None:
+            return None
+        df_nuevas = compactar_tipos(df_nuevas[df_nuevas[CLAVE].isin(df_faltantes[CLAVE])])
+        print(f"✅ Asignaciones nuevas desde {fecha_desde}: {len(df_nuevas):,} "
+              f"(reutilizadas: {len(df_vigentes) - len(df_faltantes):,})")
+        
+        if len(df_nuevas) > 0:
+            df_procesado = preprocesar_datos(df_nuevas, pipeline)
+            estado.agregar(generar_predicciones(df_procesado, modelo, columnas_modelo))
+    else:
+        print("✅ Sin asignaciones nuevas: se reutilizan todos los scores")
     
-    df_encoded = df_encoded[columnas_modelo]
-    probabilidades = modelo.predict_proba(df_encoded)[:, 1]
+    estado.podar(df_vigentes)
+    guardar_estado(estado)
+    return estado.resultado_vigente(df_vigentes)
+
+@instrumentar()
+def preprocesar_datos(df, pipeline=None, verbose=True):
+    """
+    Features del modelo con el pipeline compartido (pipeline_features.py)
+    
+    Agrega las columnas derivadas a `df` sin copiarlo y lo retorna.
+    """
+    df_procesado = (pipeline or crear_pipeline()).transform(df)
+    if verbose:
+        print("✅ Datos preprocesados")
+    return df_procesado
+
+def codificar_features(df_procesado, columnas_modelo):
+    """One-hot directo a las columnas del modelo (niveles de referencia o no vistos quedan en 0)"""
+    return obtener_codificador(columnas_modelo).transformar_df(df_procesado)
+
+@instrumentar()
+def generar_predicciones(df_procesado, modelo, columnas_modelo, verbose=True, df_encoded=None):
+    """
+    Agrega probabilidad_conversion y score_priorizacion a `df_procesado` (sin copiarlo) y lo retorna
     
-    scores = ['Bajo' if p < 0.40 else 'Medio' if p < 0.55 else 'Alto' for p in probabilidades]
+    `df_encoded` permite pasar la matriz ya codificada con codificar_features.
+    """
+    if df_encoded is None:
+        df_encoded = codificar_features(df_procesado, columnas_modelo)
+    if isinstance(modelo, ModeloSegmentado):
+        # Un predict_proba por segmento sobre sus filas (no fila por fila)
+        probabilidades = modelo.predict_proba(df_encoded, df_procesado[modelo.columna_segmento])[:, 1]
+    else:
+        probabilidades = modelo.predict_proba(df_encoded)[:, 1]
     
-    df_resultado = df_procesado.copy()
-    df_resultado['probabilidad_conversion'] = probabilidades
-    df_resultado['score_priorizacion'] = scores
+    df_procesado['probabilidad_conversion'] = probabilidades
+    df_procesado['score_priorizacion'] = np.where(probabilidades < 0.40, 'Bajo',
+                                                  np.where(probabilidades < 0.55, 'Medio', 'Alto'))
     
-    print(f"✅ Predicciones: Alto={sum(1 for s in scores if s=='Alto')}, Medio={sum(1 for s in scores if s=='Medio')}, Bajo={sum(1 for s in scores if s=='Bajo')}")
-    return df_resultado
+    if verbose:
+        conteos = df_procesado['score_priorizacion'].value_counts()
+        print(f"✅ Predicciones: Alto={conteos.get('Alto', 0)}, Medio={conteos.get('Medio', 0)}, Bajo={conteos.get('Bajo', 0)}")
+    return df_procesado
 
-def exportar_archivos(df_resultado):
-    fecha_str = datetime.now().strftime('%Y%m%d')
-    
-    # Directorios
-    output_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'predicciones')
-    analisis_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'analisis')
-    vicidial_dir = r'C:\Users\JuanD.Ramirez\Documents\Colsubsidio\Colsubsidio_Agencia_Empleo\data\upload_vicidial'
-    
-    os.makedirs(output_dir, exist_ok=True)
-    os.makedirs(analisis_dir, exist_ok=True)
-    os.makedirs(vicidial_dir, exist_ok=True)
-    
-    columnas = ['tipo_de_gestion', 'codigo_vacante', 'cargo', 'empresa', 'fecha_entrevista', 'hora_entrevista',
-                'no_documento', 'nombres', 'apellidos', 'phone', 'email', 'codigo_unico_vacante',
-                'probabilidad_conversion', 'score_priorizacion']
-    
-    archivos = []
-    
-    # 1. Excel por score
-    for score in ['Alto', 'Medio', 'Bajo']:
-        df_score = df_resultado[df_resultado['score_priorizacion'] == score][columnas]
-        if len(df_score) > 0:
-            filepath = os.path.join(output_dir, f'COLSAGEM - Score_{score}_{fecha_str}.xlsx')
-            df_score.to_excel(filepath, index=False, engine='openpyxl')
-            archivos.append(filepath)
-            print(f"✅ Excel: Score_{score} ({len(df_score)} registros)")
-    
-    # 2. Excel consolidado
-    filepath_consol = os.path.join(analisis_dir, f'Consolidado_Analisis_{fecha_str}.xlsx')
-    df_resultado[columnas].to_excel(filepath_consol, index=False, engine='openpyxl')
-    archivos.append(filepath_consol)
-    print(f"✅ Excel: Consolidado ({len(df_resultado)} registros)")
-    
-    # 3. CSV para Vicidial (3 archivos separados)
-    for score in ['Alto', 'Medio', 'Bajo']:
-        df_score_csv = df_resultado[df_resultado['score_priorizacion'] == score][columnas]
-        if len(df_score_csv) > 0:
-            filepath_csv = os.path.join(vicidial_dir, f'COLSAGEM - Score_{score}_{fecha_str}.csv')
-            df_score_csv.to_csv(filepath_csv, index=False, encoding='utf-8')
-            archivos.append(filepath_csv)
-            print(f"✅ CSV: Score_{score} ({len(df_score_csv)} registros)")
+def procesar_por_bloques(engine, modelo, columnas_modelo, chunksize, pipeline=None, parquet=True, monitor=None):
+    """
+    Pipeline en streaming: cada bloque del query se preprocesa, puntúa y
+    escribe antes de pasar al siguiente (el siguiente se lee en paralelo)
+    """
+    query = cargar_query_proyectado('query_asignaciones_diarias.sql')
+    if query is None:
+        return None
+    
+    exportador = None
+    fecha = datetime.now()
+    ruta_parquet = None
+    for i, chunk in enumerate(query_en_chunks(query, engine, chunksize=chunksize, params=parametros_periodo())):
+        if len(chunk) == 0:
+            continue
+        chunk = compactar_tipos(chunk)
+        print(f"📦 Bloque {i + 1}: {len(chunk):,} filas")
+        df_resultado = generar_predicciones(preprocesar_datos(chunk, pipeline), modelo, columnas_modelo)
+        if exportador is None:
+            exportador = ExportadorIncremental()
+        exportador.agregar(df_resultado)
+        if monitor is not None:
+            monitor.agregar(df_resultado, df_resultado[PROBABILIDAD])
+        if parquet:
+            # El primer bloque reemplaza la partición del día; los demás agregan archivos
+            ruta_parquet = escribir_consolidado_parquet(df_resultado, fecha, parte=i, reemplazar=ruta_parquet is None)
     
+    if exportador is None:
+        return None
+    archivos = exportador.cerrar()
+    if ruta_parquet:
+        archivos.append(ruta_parquet)
     return archivos
 
-def main():
+def monitorear_drift(monitor):
+    """PSI/KL del lote contra el perfil del entrenamiento, agregado a la serie diaria"""
+    if monitor is None or monitor.filas == 0:
+        return None
+    df_drift = monitor.calcular()
+    imprimir_drift(df_drift, monitor.perfil)
+    return registrar_drift(df_drift)
+
+def ejecutar(args, corrida):
+    """Cuerpo de la predicción diaria; retorna el estado de la ejecución para el manifiesto"""
     print("\n" + "="*50)
-    print("🤖 PREDICCIÓN DIARIA")
+    print("🤖 PREDICCIÓN DIARIA" + (" (INCREMENTAL)" if args.incremental else ""))
     print("="*50 + "\n")
     
-    modelo, columnas_modelo = cargar_modelo()
-    if modelo is None: return
+    with span('cargar_modelo'):
+        modelo, columnas_modelo = cargar_modelo(args.segmentado)
+    if modelo is None: return 'sin modelo'
     
     engine = get_engine()
-    if engine is None: return
+    if engine is None: return 'sin conexión'
     
-    df_asignaciones = obtener_asignaciones_nuevas(engine)
-    if df_asignaciones is None or len(df_asignaciones) == 0:
-        print("⚠️ Sin asignaciones")
-        return
+    perfil = None if args.sin_drift else cargar_perfil()
+    monitor = MonitorDrift(perfil) if perfil is not None else None
     
-    df_procesado = preprocesar_datos(df_asignaciones)
-    df_resultado = generar_predicciones(df_procesado, modelo, columnas_modelo)
-    archivos = exportar_archivos(df_resultado)
+    cache = abrir_cache_categorias()
+    # Un pipeline para todo el run: sus métricas se acumulan entre bloques
+    metricas = MetricasPipeline(trazar_memoria=args.trazar_memoria)
+    pipeline = crear_pipeline(cache, metricas=metricas)
+    if args.chunksize:
+        archivos = procesar_por_bloques(engine, modelo, columnas_modelo, args.chunksize, pipeline,
+                                        parquet=not args.sin_parquet, monitor=monitor)
+        if archivos is None:
+            print("⚠️ Sin asignaciones")
+            return 'sin asignaciones'
+    else:
+        if args.incremental:
+            df_resultado = obtener_asignaciones_incremental(engine, modelo, columnas_modelo, pipeline)
+        else:
+            df_asignaciones = obtener_asignaciones_nuevas(engine)
+            df_resultado = None
+            if df_asignaciones is not None and len(df_asignaciones) > 0:
+                df_procesado = preprocesar_datos(df_asignaciones, pipeline)
+                df_resultado = generar_predicciones(df_procesado, modelo, columnas_modelo)
+        
+        if df_resultado is None or len(df_resultado) == 0:
+            print("⚠️ Sin asignaciones")
+            return 'sin asignaciones'
+        
+        archivos = exportar_archivos(df_resultado, motor=args.excel, paralelo=args.paralelo)
+        if not args.sin_parquet:
+            with span('parquet_historico', filas=len(df_resultado)):
+                ruta_parquet = escribir_consolidado_parquet(df_resultado)
+            if ruta_parquet:
+                archivos.append(ruta_parquet)
+        if monitor is not None:
+            monitor.agregar(df_resultado, df_resultado[PROBABILIDAD])
+    corrida.agregar_archivos(archivos)
+    
+    with span('drift'):
+        ruta_drift = monitorear_drift(monitor)
+    if ruta_drift:
+        print(f"💾 Serie de drift actualizada: {os.path.normpath(ruta_drift)}")
+        corrida.agregar_archivos([ruta_drift])
+    
+    metricas.imprimir()
+    metricas.cerrar()
+    corrida.datos['pipeline'] = metricas.resumen()
+    if cache is not None:
+        cache.imprimir_estadisticas()
+        cache.cerrar()
+    modelo.imprimir_estadisticas()
     
     print("\n" + "="*50)
     print(f"✅ COMPLETADO - {len(archivos)} archivos generados")
     print("="*50 + "\n")
+    return 'ok'
+
+def main():
+    parser = argparse.ArgumentParser(description='Predicción diaria del modelo de conversión')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Puntuar solo asignaciones nuevas y reutilizar los scores guardados del mes')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Leer, puntuar y exportar por bloques de N filas (memoria acotada)')
+    parser.add_argument('--excel', choices=MOTORES_EXCEL, default='openpyxl',
+                        help='Escritor de Excel: openpyxl (con formato), streaming (openpyxl write_only) o xlsxwriter')
+    parser.add_argument('--paralelo', choices=MODOS_PARALELO, default='no',
+                        help='Escribir los archivos en secuencia (por defecto) o en paralelo con procesos o hilos '
+                             '(medir antes con benchmarks/benchmark_exportacion.py)')
+    parser.add_argument('--sin-parquet', action='store_true',
+                        help='No agregar el consolidado al histórico Parquet (data/analisis/parquet)')
+    parser.add_argument('--segmentado', action='store_true',
+                        help='Puntuar con los modelos por segmento (models/segmentos_precontacto)')
+    parser.add_argument('--sin-drift', action='store_true',
+                        help='No comparar el lote con el perfil del entrenamiento (data/analisis/drift)')
+    parser.add_argument('--trazar-memoria', action='store_true',
+                        help='Medir el pico de memoria de cada paso del pipeline de features con tracemalloc (más lento)')
+    parser.add_argument('--perfil', action='store_true',
+                        help='Guardar un cProfile de la ejecución (.prof) junto al manifiesto en data/ejecuciones')
+    args = parser.parse_args()
+    if args.incremental and args.chunksize:
+        parser.error('--incremental y --chunksize no se pueden combinar')
+    
+    # Manifiesto de la ejecución (data/ejecuciones): spans por etapa y query, pico de memoria y archivos
+    corrida = iniciar_corrida('prediccion_diaria', argumentos=vars(args), perfil=args.perfil)
+    estado = 'error'
+    try:
+        estado = ejecutar(args, corrida)
+    except Exception as e:
+        corrida.datos['error'] = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        corrida.imprimir()
+        ruta_manifiesto = finalizar_corrida(estado)
+        if ruta_manifiesto:
+            print(f"🧾 Manifiesto de la ejecución: {os.path.normpath(ruta_manifiesto)}\n")
 
 if __name__ == "__main__":
     main()
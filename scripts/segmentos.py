@@ -0,0 +1,185 @@
+"""
+Modelos por segmento
+Un booster por valor de tipo_de_gestion (o categoria_empresa), entrenado con
+los meses recientes, más un modelo global de la misma ventana para los
+segmentos chicos o no vistos. Todos usan las columnas del mismo one-hot: el
+scoring codifica una vez, agrupa las filas por segmento y hace un
+predict_proba por grupo
+"""
+
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+from artefacto_modelo import ModeloBooster, ModeloDiferido
+from inferencia import InferenciaTabla
+
+RUTA_SEGMENTOS = os.path.join(os.path.dirname(__file__), '..', 'models', 'segmentos_precontacto')
+ARCHIVO_MANIFIESTO = 'segmentos.json'
+
+# Columnas por las que se puede segmentar (deben estar en la matriz y en el df del scoring)
+SEGMENTACIONES = ['tipo_de_gestion', 'categoria_empresa']
+# Modelo de respaldo: segmentos con pocas filas o que no existían al entrenar
+GLOBAL = '_global'
+
+
+def normalizar_segmentos(valores):
+    """
+    Clave de segmento por fila: texto sin espacios extremos y en mayúsculas
+
+    Se normaliza cada valor distinto una sola vez (factorize) y se reparte
+    por código; los nulos quedan como ''.
+
+    Returns:
+    --------
+    np.ndarray
+        Claves (dtype object), una por fila
+    """
+    codigos, unicos = pd.factorize(pd.Series(valores), use_na_sentinel=True)
+    claves = np.array([str(u).strip().upper() for u in unicos] + [''], dtype=object)
+    return claves[codigos]
+
+
+def agrupar_filas(claves):
+    """
+    Filas de cada clave sin recorrer el df por clave
+
+    Returns:
+    --------
+    list
+        [(clave, índices de fila)], en orden de primera aparición
+    """
+    codigos, unicos = pd.factorize(claves)
+    orden = np.argsort(codigos, kind='stable')
+    limites = np.cumsum(np.bincount(codigos, minlength=len(unicos)))[:-1]
+    return list(zip(unicos.tolist(), np.split(orden, limites)))
+
+
+def exportar_segmentos(modelos, columna, columnas, reporte, ruta=RUTA_SEGMENTOS):
+    """
+    Guardar los boosters de cada segmento (formato nativo) y el manifiesto
+
+    Se escribe todo en un directorio temporal y se reemplaza el anterior al
+    final, para que el scoring nunca lea una mezcla de versiones.
+
+    Parameters:
+    -----------
+    modelos : dict
+        {clave de segmento: XGBClassifier}; debe incluir GLOBAL
+    """
+    temporal = f'{ruta}.tmp'
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    segmentos = {}
+    for i, (clave, modelo) in enumerate(sorted(modelos.items())):
+        archivo = f'segmento_{i:02d}.ubj'
+        modelo.get_booster().save_model(os.path.join(temporal, archivo))
+        mejor_iteracion = getattr(modelo, 'best_iteration', None)
+        segmentos[clave] = {
+            'archivo': archivo,
+            'iteraciones': [0, mejor_iteracion + 1] if mejor_iteracion is not None else None,
+            **reporte.get('segmentos', {}).get(clave, {}),
+        }
+
+    manifiesto = {**reporte, 'columna': columna, 'columnas': list(columnas), 'segmentos': segmentos}
+    with open(os.path.join(temporal, ARCHIVO_MANIFIESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(ruta, ignore_errors=True)
+    os.replace(temporal, ruta)
+    print(f"✅ Modelos por segmento exportados: {os.path.normpath(ruta)} ({len(segmentos) - 1} segmentos + global)")
+
+
+class _BoosterDeSegmento:
+    """predict_proba de un segmento sobre la carga diferida de todos los boosters"""
+
+    def __init__(self, diferido, clave):
+        self.diferido = diferido
+        self.clave = clave
+
+    def predict_proba(self, X):
+        return self.diferido.obtener()[self.clave].predict_proba(X)
+
+
+class ModeloSegmentado:
+    """
+    Enruta cada fila al modelo de su segmento
+
+    Cada segmento tiene su propia InferenciaTabla: la misma combinación de
+    features puede tener scores distintos según el segmento.
+
+    Parameters:
+    -----------
+    modelos : dict
+        {clave de segmento: objeto con predict_proba}; debe incluir GLOBAL
+    columna_segmento : str
+        Columna del df preprocesado con el segmento
+    columnas_modelo : list
+        Columnas del one-hot, comunes a todos los modelos
+    """
+
+    def __init__(self, modelos, columna_segmento, columnas_modelo, archivos=()):
+        self.columna_segmento = columna_segmento
+        self.archivos = list(archivos)
+        self.modelos = {clave: InferenciaTabla(modelo, columnas_modelo) for clave, modelo in modelos.items()}
+        self.conocidos = np.array([c for c in self.modelos if c != GLOBAL], dtype=object)
+        self.filas = {}
+
+    def predict_proba(self, X, segmentos):
+        claves = normalizar_segmentos(segmentos)
+        claves[~np.isin(claves, self.conocidos)] = GLOBAL
+
+        p = np.empty(len(X), dtype=np.float32)
+        for clave, filas in agrupar_filas(claves):
+            subconjunto = X.iloc[filas] if isinstance(X, pd.DataFrame) else X[filas]
+            p[filas] = self.modelos[clave].predict_proba(subconjunto)[:, 1]
+            self.filas[clave] = self.filas.get(clave, 0) + len(filas)
+        return np.vstack((1.0 - p, p)).T
+
+    def imprimir_estadisticas(self):
+        print(f"\n🧩 Modelos por segmento ({self.columna_segmento}):")
+        for clave, filas in sorted(self.filas.items(), key=lambda x: -x[1]):
+            etiqueta = 'global (otros segmentos)' if clave == GLOBAL else clave
+            print(f"   - {etiqueta}: {filas:,} filas")
+        tablas = self.modelos.values()
+        print(f"   - Inferencia por tabla: {sum(t.combinaciones for t in tablas):,} combinaciones distintas, "
+              f"{sum(t.puntuadas + t.directas for t in tablas):,} filas por los modelos")
+
+
+def cargar_modelo_segmentado(ruta=RUTA_SEGMENTOS):
+    """
+    Cargar el manifiesto y dejar la carga de los boosters a un hilo
+
+    Returns:
+    --------
+    tuple
+        (ModeloSegmentado, lista de columnas); (None, None) si hay error
+    """
+    try:
+        ruta_manifiesto = os.path.join(ruta, ARCHIVO_MANIFIESTO)
+        with open(ruta_manifiesto, 'r', encoding='utf-8') as f:
+            manifiesto = json.load(f)
+        segmentos = manifiesto['segmentos']
+
+        def cargar():
+            import xgboost as xgb
+            boosters = {}
+            for clave, info in segmentos.items():
+                booster = xgb.Booster()
+                booster.load_model(os.path.join(ruta, info['archivo']))
+                boosters[clave] = ModeloBooster(booster, info)
+            return boosters
+
+        diferido = ModeloDiferido(cargar)
+        modelos = {clave: _BoosterDeSegmento(diferido, clave) for clave in segmentos}
+        modelo = ModeloSegmentado(modelos, manifiesto['columna'], manifiesto['columnas'], archivos=[ruta_manifiesto])
+
+        print(f"✅ Modelos por {manifiesto['columna']} cargados ({len(segmentos) - 1} segmentos + global, "
+              f"entrenados el {manifiesto.get('fecha', '?')})")
+        return modelo, manifiesto['columnas']
+    except Exception as e:
+        print(f"❌ Error al cargar los modelos por segmento: {e}")
+        return None, None
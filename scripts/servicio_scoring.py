@@ -0,0 +1,319 @@
+"""
+Servicio de scoring en línea
+Servidor HTTP local que carga una vez el modelo, el codificador y las reglas
+de categorización y puntúa asignaciones recién creadas sin esperar al batch
+diario. Las solicitudes concurrentes se juntan en micro-lotes: un solo hilo
+toma lo que haya en cola (hasta --max-lote filas o --espera-ms desde la
+primera) y hace un preprocesamiento y un predict_proba por lote. Cada
+solicitud se valida antes de entrar a la cola, y si aun así un lote falla se
+puntúa cada solicitud por separado: el error le llega solo a la que lo causó
+
+Endpoints:
+    POST /puntuar   {"asignaciones": [{...}, ...]}, una lista o un solo objeto
+                    con los campos crudos de tb_asignacion_intermediacion_v2_coalesce
+    GET  /salud     estado y estadísticas de los micro-lotes
+
+Uso:
+    python scripts/servicio_scoring.py --puerto 8765
+    curl -s localhost:8765/puntuar -d '{"empresa": "ATENTO COLOMBIA", "cargo": "Agente call center", ...}'
+"""
+
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from categorizacion import abrir_cache_categorias
+from esquema import columnas_requeridas, COLUMNAS_FECHA, COLUMNAS_FLOAT32
+from prediccion_diaria import cargar_modelo, preprocesar_datos, generar_predicciones
+from pipeline_features import crear_pipeline
+
+MAX_BYTES_SOLICITUD = 1024 ** 2
+MAX_ASIGNACIONES_SOLICITUD = 1000
+TIMEOUT_SEGUNDOS = 30
+
+
+class AgrupadorLotes:
+    """
+    Junta solicitudes concurrentes en un solo llamado a `puntuar`
+
+    Un hilo espera la primera solicitud, sigue tomando de la cola hasta
+    `max_filas` o hasta `espera_ms` después de la primera (lo que ya esté en
+    cola se toma sin esperar), puntúa todo junto y reparte los resultados.
+    Como `puntuar` corre siempre en ese hilo, el modelo y la caché de
+    categorías no se comparten entre hilos.
+
+    Parameters:
+    -----------
+    puntuar : callable
+        Lista de registros -> lista de resultados (mismo orden)
+    max_filas : int
+        Filas máximas por lote
+    espera_ms : float
+        Espera máxima para completar un lote
+    """
+
+    def __init__(self, puntuar, max_filas=256, espera_ms=2.0):
+        self.puntuar = puntuar
+        self.max_filas = max_filas
+        self.espera = espera_ms / 1000
+        self.cola = queue.Queue()
+        self.lotes = 0
+        self.solicitudes = 0
+        self.filas = 0
+        self.segundos_puntuando = 0.0
+        self.reintentos = 0
+        self._hilo = threading.Thread(target=self._bucle, name='agrupador-lotes', daemon=True)
+        self._hilo.start()
+
+    def enviar(self, registros):
+        """Encolar registros; el Future se resuelve con sus resultados"""
+        futuro = Future()
+        self.cola.put((registros, futuro))
+        return futuro
+
+    def _bucle(self):
+        while True:
+            pendientes = [self.cola.get()]
+            filas = len(pendientes[0][0])
+            limite = time.monotonic() + self.espera
+            while filas < self.max_filas:
+                restante = limite - time.monotonic()
+                try:
+                    item = self.cola.get(timeout=restante) if restante > 0 else self.cola.get_nowait()
+                except queue.Empty:
+                    break
+                pendientes.append(item)
+                filas += len(item[0])
+            self._procesar(pendientes)
+
+    def _procesar(self, pendientes):
+        registros = [r for regs, _ in pendientes for r in regs]
+        inicio = time.perf_counter()
+        try:
+            resultados = self.puntuar(registros)
+        except Exception as e:
+            if len(pendientes) == 1:
+                pendientes[0][1].set_exception(e)
+            else:
+                # Una solicitud no debe hacer fallar las de los demás: cada una por separado
+                self.reintentos += 1
+                for regs, futuro in pendientes:
+                    try:
+                        futuro.set_result(self.puntuar(regs))
+                    except Exception as e_solicitud:
+                        futuro.set_exception(e_solicitud)
+            return
+        finally:
+            self.segundos_puntuando += time.perf_counter() - inicio
+            self.lotes += 1
+            self.solicitudes += len(pendientes)
+            self.filas += len(registros)
+
+        desde = 0
+        for regs, futuro in pendientes:
+            futuro.set_result(resultados[desde:desde + len(regs)])
+            desde += len(regs)
+
+    def estadisticas(self):
+        return {
+            'lotes': self.lotes,
+            'solicitudes': self.solicitudes,
+            'filas': self.filas,
+            'filas_por_lote': round(self.filas / self.lotes, 1) if self.lotes else 0,
+            'ms_por_lote': round(self.segundos_puntuando / self.lotes * 1000, 2) if self.lotes else 0,
+            'lotes_reintentados': self.reintentos,
+            'en_cola': self.cola.qsize(),
+        }
+
+
+class ServicioScoring:
+    """Modelo, columnas, caché de categorías y pipeline de features cargados una vez para todo el proceso"""
+
+    def __init__(self, segmentado=False):
+        self.modelo, self.columnas_modelo = cargar_modelo(segmentado)
+        if self.modelo is None:
+            raise RuntimeError('No se pudo cargar el modelo')
+        self.columnas_entrada = columnas_requeridas()
+        self.cache = abrir_cache_categorias()
+        self.pipeline = crear_pipeline(self.cache)
+        self.inicio = datetime.now()
+
+    def validar(self, registros):
+        """
+        Normalizar los registros de una solicitud antes de encolarla
+
+        Solo se conservan las columnas de entrada. Los valores deben ser
+        escalares: las fechas se parsean (sin zona horaria), numero_de_vacantes
+        se convierte a número (nulo si no lo es) y el resto a texto. Así un
+        registro de un cliente no rompe el micro-lote de los demás.
+
+        Raises:
+        -------
+        ValueError
+            Con el registro y el campo inválidos
+        """
+        normalizados = []
+        for i, registro in enumerate(registros):
+            fila = {}
+            for columna in self.columnas_entrada:
+                valor = registro.get(columna)
+                if valor is None:
+                    fila[columna] = None
+                    continue
+                if not isinstance(valor, (str, int, float)):
+                    raise ValueError(f'asignación {i}: {columna} debe ser un texto o un número')
+                if columna in COLUMNAS_FECHA:
+                    fecha = pd.to_datetime(valor, format='mixed', errors='coerce') if isinstance(valor, str) else None
+                    if fecha is None or pd.isna(fecha):
+                        raise ValueError(f'asignación {i}: {columna} no es una fecha ({valor!r})')
+                    valor = fecha.tz_localize(None) if fecha.tzinfo is not None else fecha
+                elif columna in COLUMNAS_FLOAT32:
+                    valor = pd.to_numeric(valor, errors='coerce')
+                    valor = None if pd.isna(valor) else float(valor)
+                else:
+                    valor = str(valor)
+                fila[columna] = valor
+            normalizados.append(fila)
+        return normalizados
+
+    def puntuar(self, registros):
+        """
+        Mismo preprocesamiento y scoring de prediccion_diaria.py sobre un lote
+
+        Los campos que falten quedan nulos; sin fecha_asignacion se usa el
+        momento del scoring (la asignación se acaba de crear).
+        """
+        df = pd.DataFrame.from_records(registros, columns=self.columnas_entrada)
+        df['fecha_asignacion'] = (pd.to_datetime(df['fecha_asignacion'], format='mixed', errors='coerce')
+                                  .fillna(pd.Timestamp.now()))
+        df_resultado = generar_predicciones(preprocesar_datos(df, self.pipeline, verbose=False), self.modelo,
+                                            self.columnas_modelo, verbose=False)
+        claves = df_resultado['codigo_unico_vacante'].tolist()
+        probabilidades = df_resultado['probabilidad_conversion'].tolist()
+        scores = df_resultado['score_priorizacion'].tolist()
+        return [{'codigo_unico_vacante': None if pd.isna(c) else c, 'probabilidad_conversion': round(float(p), 6),
+                 'score_priorizacion': s} for c, p, s in zip(claves, probabilidades, scores)]
+
+
+class ManejadorScoring(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _responder(self, estado, cuerpo):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_GET(self):
+        if self.path != '/salud':
+            self._responder(404, {'error': 'ruta no encontrada'})
+            return
+        servicio = self.server.servicio
+        self._responder(200, {'estado': 'ok', 'desde': servicio.inicio.strftime('%Y-%m-%d %H:%M:%S'),
+                              **self.server.agrupador.estadisticas(),
+                              'pipeline': servicio.pipeline.metricas.resumen()})
+
+    def do_POST(self):
+        if self.path != '/puntuar':
+            self._responder(404, {'error': 'ruta no encontrada'})
+            return
+        largo = int(self.headers.get('Content-Length') or 0)
+        if largo > MAX_BYTES_SOLICITUD:
+            self._responder(413, {'error': f'solicitud mayor a {MAX_BYTES_SOLICITUD} bytes'})
+            return
+        try:
+            cuerpo = json.loads(self.rfile.read(largo) or b'null')
+        except ValueError:
+            self._responder(400, {'error': 'JSON inválido'})
+            return
+
+        registros = cuerpo.get('asignaciones') if isinstance(cuerpo, dict) and 'asignaciones' in cuerpo else cuerpo
+        if isinstance(registros, dict):
+            registros = [registros]
+        if (not isinstance(registros, list) or not registros
+                or not all(isinstance(r, dict) for r in registros)):
+            self._responder(400, {'error': 'se espera un objeto, una lista de objetos o {"asignaciones": [...]}'})
+            return
+        if len(registros) > MAX_ASIGNACIONES_SOLICITUD:
+            self._responder(413, {'error': f'máximo {MAX_ASIGNACIONES_SOLICITUD} asignaciones por solicitud'})
+            return
+        try:
+            registros = self.server.servicio.validar(registros)
+        except ValueError as e:
+            self._responder(400, {'error': str(e)})
+            return
+
+        try:
+            resultados = self.server.agrupador.enviar(registros).result(timeout=TIMEOUT_SEGUNDOS)
+        except TimeoutError:
+            self._responder(503, {'error': 'tiempo de espera agotado'})
+            return
+        except Exception as e:
+            self._responder(500, {'error': str(e)})
+            return
+        self._responder(200, {'resultados': resultados})
+
+    def log_message(self, formato, *args):
+        # Sin una línea por solicitud; los errores se ven en la respuesta
+        pass
+
+
+def crear_servidor(servicio, host='127.0.0.1', puerto=8765, max_lote=256, espera_ms=2.0):
+    """Servidor HTTP (un hilo por conexión) con su agrupador de micro-lotes"""
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorScoring)
+    servidor.daemon_threads = True
+    servidor.servicio = servicio
+    servidor.agrupador = AgrupadorLotes(servicio.puntuar, max_lote, espera_ms)
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servicio de scoring en línea')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--max-lote', type=int, default=256, help='Filas máximas por micro-lote')
+    parser.add_argument('--espera-ms', type=float, default=2.0,
+                        help='Espera máxima para completar un micro-lote (0 = solo lo que ya está en cola)')
+    parser.add_argument('--segmentado', action='store_true',
+                        help='Puntuar con los modelos por segmento (models/segmentos_precontacto)')
+    args = parser.parse_args()
+
+    print("\n" + "="*50)
+    print("🛰️ SERVICIO DE SCORING")
+    print("="*50 + "\n")
+
+    try:
+        servicio = ServicioScoring(args.segmentado)
+        # Calentar: termina de cargar el booster, las reglas y el codificador antes de aceptar solicitudes
+        servicio.puntuar([{}])
+    except Exception as e:
+        print(f"❌ Error al iniciar el servicio: {e}")
+        sys.exit(1)
+
+    servidor = crear_servidor(servicio, args.host, args.puerto, args.max_lote, args.espera_ms)
+    print(f"✅ Escuchando en http://{args.host}:{args.puerto} (micro-lotes de hasta {args.max_lote} filas, "
+          f"{args.espera_ms:g} ms)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if servicio.cache is not None:
+            servicio.cache.cerrar()
+        print(f"\n📊 {json.dumps(servidor.agrupador.estadisticas(), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
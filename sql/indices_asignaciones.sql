@@ -0,0 +1,95 @@
+-- =====================================================
+-- COLLATION E ÍNDICES: QUERIES DE ASIGNACIONES
+-- Para query_asignaciones_diarias.sql / _desde.sql / _vigentes.sql / _rango.sql
+-- Autor: Juan David Ramírez
+-- Se puede ejecutar varias veces: solo cambia lo que falta
+--
+-- OBLIGATORIO antes de desplegar esos queries: ya no usan CONVERT ... COLLATE
+-- y, si las dos columnas codigo_unico_vacante tienen collations distintas,
+-- el NOT EXISTS contra tb_mensajes_reporting puede fallar con
+-- "Illegal mix of collations". Los índices solo aceleran; la collation no.
+--
+-- 1. codigo_unico_vacante con la misma collation en ambas tablas, para que
+--    el NOT EXISTS contra tb_mensajes_reporting compare columnas directas
+--    (sin CONVERT ... COLLATE, que impide usar el índice). Conserva tipo,
+--    nulabilidad, DEFAULT y COMMENT de la columna
+-- 2. (periodo, tipo_phone, fecha_asignacion): filtro del CTE base
+-- 3. (periodo, phone, excluir_vicidial, excluir_soul): teléfonos excluidos
+--    del periodo leídos solo del índice
+-- 4. tb_mensajes_reporting(codigo_unico_vacante): anti-join
+-- =====================================================
+
+USE bbdd_cos_bog_colsubsidio_agencia_empleo;
+
+DROP PROCEDURE IF EXISTS tmp_alinear_collation;
+DROP PROCEDURE IF EXISTS tmp_crear_indice;
+
+DELIMITER $$
+
+-- Cambia la collation de una columna de texto conservando tipo, nulabilidad,
+-- DEFAULT y COMMENT (MODIFY reemplaza la definición completa de la columna).
+-- COLUMN_DEFAULT: MariaDB ya lo guarda como expresión SQL ('texto', NULL);
+-- MySQL guarda el valor literal sin comillas, salvo las expresiones
+-- (EXTRA = DEFAULT_GENERATED), que van entre paréntesis
+CREATE PROCEDURE tmp_alinear_collation(IN p_tabla VARCHAR(64), IN p_columna VARCHAR(64))
+BEGIN
+    SET @ddl = NULL;
+    SELECT CONCAT('ALTER TABLE ', p_tabla, ' MODIFY ', p_columna, ' ', COLUMN_TYPE,
+                  ' CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci',
+                  IF(IS_NULLABLE = 'NO', ' NOT NULL', ' NULL'),
+                  CASE
+                      WHEN COLUMN_DEFAULT IS NULL THEN ''
+                      WHEN VERSION() LIKE '%MariaDB%' THEN CONCAT(' DEFAULT ', COLUMN_DEFAULT)
+                      WHEN EXTRA LIKE '%DEFAULT_GENERATED%' THEN CONCAT(' DEFAULT (', COLUMN_DEFAULT, ')')
+                      ELSE CONCAT(' DEFAULT ', QUOTE(COLUMN_DEFAULT))
+                  END,
+                  IF(COLUMN_COMMENT <> '', CONCAT(' COMMENT ', QUOTE(COLUMN_COMMENT)), ''))
+      INTO @ddl
+      FROM information_schema.COLUMNS
+     WHERE TABLE_SCHEMA = DATABASE()
+       AND TABLE_NAME = p_tabla
+       AND COLUMN_NAME = p_columna
+       AND COLLATION_NAME <> 'utf8mb4_unicode_ci';
+    IF @ddl IS NOT NULL THEN
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+CREATE PROCEDURE tmp_crear_indice(IN p_tabla VARCHAR(64), IN p_indice VARCHAR(64), IN p_columnas VARCHAR(255))
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.STATISTICS
+         WHERE TABLE_SCHEMA = DATABASE()
+           AND TABLE_NAME = p_tabla
+           AND INDEX_NAME = p_indice
+    ) THEN
+        SET @ddl = CONCAT('CREATE INDEX ', p_indice, ' ON ', p_tabla, ' (', p_columnas, ')');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+CALL tmp_alinear_collation('tb_asignacion_intermediacion_v2_coalesce', 'codigo_unico_vacante');
+CALL tmp_alinear_collation('tb_mensajes_reporting', 'codigo_unico_vacante');
+
+CALL tmp_crear_indice('tb_asignacion_intermediacion_v2_coalesce', 'idx_asig_periodo_tipo_fecha',
+                      'periodo, tipo_phone, fecha_asignacion');
+CALL tmp_crear_indice('tb_asignacion_intermediacion_v2_coalesce', 'idx_asig_periodo_phone_exclusion',
+                      'periodo, phone, excluir_vicidial, excluir_soul');
+CALL tmp_crear_indice('tb_mensajes_reporting', 'idx_mensajes_codigo_unico_vacante',
+                      'codigo_unico_vacante');
+
+DROP PROCEDURE tmp_alinear_collation;
+DROP PROCEDURE tmp_crear_indice;
+
+-- Verificación
+SELECT TABLE_NAME, INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) AS columnas
+  FROM information_schema.STATISTICS
+ WHERE TABLE_SCHEMA = DATABASE()
+   AND TABLE_NAME IN ('tb_asignacion_intermediacion_v2_coalesce', 'tb_mensajes_reporting')
+ GROUP BY TABLE_NAME, INDEX_NAME;
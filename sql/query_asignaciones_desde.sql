@@ -0,0 +1,43 @@
+-- Asignaciones desde una fecha (mismos filtros que query_asignaciones_diarias.sql)
+-- Parámetros: fecha_desde (YYYY-MM-DD) más los de esquema.parametros_periodo.
+-- Usada por el modo incremental de prediccion_diaria.py
+-- Requiere sql/indices_asignaciones.sql aplicado antes (collation de codigo_unico_vacante)
+WITH base AS (
+    SELECT *
+    FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_asignacion_intermediacion_v2_coalesce
+    WHERE periodo = %(periodo)s
+        AND tipo_phone IN ('movil_1')
+        AND fecha_asignacion >= %(fecha_desde)s
+        AND fecha_asignacion < %(fecha_fin)s
+        AND vicidial_calls >= 1
+        AND (
+            tipificacion_mejor_gestion_soul IN ('No contesta', 'Llamada muda')
+            OR tipificacion_mejor_gestion_soul IS NULL
+        )
+),
+telefonos_excluidos AS (
+    SELECT phone
+    FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_asignacion_intermediacion_v2_coalesce
+    WHERE periodo = %(periodo)s
+        AND (excluir_vicidial = 1 OR excluir_soul = 1)
+    GROUP BY phone
+)
+SELECT
+    c.*
+FROM base c
+WHERE NOT EXISTS (
+        SELECT 1 FROM telefonos_excluidos e
+        WHERE e.phone <=> c.phone
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_mensajes_reporting r
+        WHERE r.codigo_unico_vacante = c.codigo_unico_vacante
+    )
+ORDER BY
+    CASE
+        WHEN c.tipo_phone = 'movil_1' AND (c.vicidial_calls <= 3 OR c.vicidial_calls IS NULL) THEN 1
+        WHEN c.tipo_phone IN ('movil_2', 'movil_3') THEN 2
+        WHEN c.tipo_phone = 'movil_4' AND c.vicidial_calls > 3 THEN 3
+        ELSE 4
+    END ASC,
+    c.vicidial_calls ASC;
@@ -0,0 +1,36 @@
+-- Asignaciones de un rango de fechas de un mes (mismos filtros que query_asignaciones_diarias.sql)
+-- Parámetros: periodo (YYYYMM), fecha_desde (incluida) y fecha_hasta (excluida),
+-- dentro del mismo periodo. Usada por backfill_scoring.py (una partición por rango);
+-- sin ORDER BY: el backfill no prioriza, solo puntúa
+-- Requiere sql/indices_asignaciones.sql aplicado antes (collation de codigo_unico_vacante)
+WITH base AS (
+    SELECT *
+    FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_asignacion_intermediacion_v2_coalesce
+    WHERE periodo = %(periodo)s
+        AND tipo_phone IN ('movil_1')
+        AND fecha_asignacion >= %(fecha_desde)s
+        AND fecha_asignacion < %(fecha_hasta)s
+        AND vicidial_calls >= 1
+        AND (
+            tipificacion_mejor_gestion_soul IN ('No contesta', 'Llamada muda')
+            OR tipificacion_mejor_gestion_soul IS NULL
+        )
+),
+telefonos_excluidos AS (
+    SELECT phone
+    FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_asignacion_intermediacion_v2_coalesce
+    WHERE periodo = %(periodo)s
+        AND (excluir_vicidial = 1 OR excluir_soul = 1)
+    GROUP BY phone
+)
+SELECT
+    c.*
+FROM base c
+WHERE NOT EXISTS (
+        SELECT 1 FROM telefonos_excluidos e
+        WHERE e.phone <=> c.phone
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_mensajes_reporting r
+        WHERE r.codigo_unico_vacante = c.codigo_unico_vacante
+    );
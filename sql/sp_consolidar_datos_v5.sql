@@ -6,6 +6,10 @@
 -- CAMBIOS: 
 -- - Fecha desde septiembre (cuando hay datos completos)
 -- - Excluye bases especiales
+-- - v5.1: CASE de categorización generados desde config/reglas_categorizacion.json,
+--   entre las marcas '>>> reglas_categorizacion' y '<<< reglas_categorizacion':
+--   no editar a mano. python scripts/categorizacion.py --actualizar-sql los
+--   regenera y --verificar-sql (o tests/test_reglas_sql.py) falla si difieren
 -- =====================================================
 
 USE bbdd_cos_bog_colsubsidio_agencia_empleo;
@@ -34,10 +38,10 @@ BEGIN
         fecha_asignacion,
         documentacion_requerida_original,
         rango_vacantes,
+        tiene_contacto_empresa,
         categoria_cargo,
         categoria_empresa,
         categoria_requisito,
-        tiene_contacto_empresa,
         franja_hora_entrevista,
         categoria_documentacion,
         Tipo_contacto,
@@ -74,7 +78,17 @@ BEGIN
             ELSE 'sin_informacion'
         END AS rango_vacantes,
         
-        -- CATEGORIZACIÓN: CARGO
+        -- TIENE CONTACTO EMPRESA
+        CASE 
+            WHEN a.persona_contacto_empresa IS NOT NULL 
+                 AND TRIM(a.persona_contacto_empresa) != '' 
+                 AND a.persona_contacto_empresa != '-' 
+            THEN 1 
+            ELSE 0 
+        END AS tiene_contacto_empresa,
+        
+        -- >>> reglas_categorizacion: generado con python scripts/categorizacion.py --actualizar-sql
+        -- CATEGORIZACIÓN: CATEGORIA_CARGO (reglas v5.1)
         CASE
             WHEN UPPER(a.cargo) REGEXP 'LIMPIEZA|ASEO|SERVICIOS GENERALES|DESINFECCION' THEN 'limpieza_aseo'
             WHEN UPPER(a.cargo) REGEXP 'SEGURIDAD|VIGILANTE|GUARDA' THEN 'seguridad'
@@ -91,8 +105,8 @@ BEGIN
             WHEN UPPER(a.cargo) REGEXP 'ARCHIVO|DIGITACION' THEN 'archivo_digitacion'
             ELSE 'otros'
         END AS categoria_cargo,
-        
-        -- CATEGORIZACIÓN: EMPRESA
+
+        -- CATEGORIZACIÓN: CATEGORIA_EMPRESA (reglas v5.1)
         CASE
             WHEN UPPER(a.empresa) REGEXP 'CASALIMPIA|ASEOS|PROLIMZA|ECOLIMPIEZA|LOGISTICA Y LIMPIEZA|NASE|EXPERIENZA|ASER ASEO|CASA LIMPIA|ADMIASEO' THEN 'limpieza'
             WHEN UPPER(a.empresa) REGEXP 'SECURITAS|VISE|SEGURIDAD NACIONAL|LIBERTADORA|PROSEGUR|COLVISEG|HONOR|TRANSBANK' THEN 'seguridad'
@@ -112,10 +126,10 @@ BEGIN
             WHEN UPPER(a.empresa) REGEXP 'AGROPECUARIA|FLORICULTOR|AVICOLA' THEN 'agropecuaria'
             ELSE 'otras'
         END AS categoria_empresa,
-        
-        -- CATEGORIZACIÓN: REQUISITO PROFESIONAL
+
+        -- CATEGORIZACIÓN: CATEGORIA_REQUISITO (reglas v5.1)
         CASE
-            WHEN a.requisito_profesional = '-' OR a.requisito_profesional IS NULL OR TRIM(a.requisito_profesional) = '' THEN 'sin_especificar'
+            WHEN a.requisito_profesional IS NULL OR TRIM(a.requisito_profesional) IN ('', '-') THEN 'sin_especificar'
             WHEN UPPER(a.requisito_profesional) REGEXP 'PROFESIONAL|LICENCIATURA|MEDICO|ODONTOLOGO|ARQUITECTO|INGENIERO' THEN 'profesional'
             WHEN UPPER(a.requisito_profesional) REGEXP 'TECNOLOGO' THEN 'tecnologo'
             WHEN UPPER(a.requisito_profesional) REGEXP 'TECNICO|CURSO.*VIGILANCIA|RETHUS' THEN 'tecnico'
@@ -124,33 +138,25 @@ BEGIN
             WHEN UPPER(a.requisito_profesional) REGEXP 'NO APLICA|SIN EXPERIENCIA' THEN 'sin_requisito'
             ELSE 'otros'
         END AS categoria_requisito,
-        
-        -- TIENE CONTACTO EMPRESA
-        CASE 
-            WHEN a.persona_contacto_empresa IS NOT NULL 
-                 AND TRIM(a.persona_contacto_empresa) != '' 
-                 AND a.persona_contacto_empresa != '-' 
-            THEN 1 
-            ELSE 0 
-        END AS tiene_contacto_empresa,
-        
-        -- CATEGORIZACIÓN: FRANJA HORARIA
+
+        -- CATEGORIZACIÓN: FRANJA_HORA_ENTREVISTA (reglas v5.1)
         CASE
-            WHEN a.hora_entrevista IS NULL OR TRIM(a.hora_entrevista) = '' OR a.hora_entrevista = '-' THEN 'sin_hora'
-            WHEN a.hora_entrevista REGEXP '-' THEN 'multiple'
-            WHEN UPPER(a.hora_entrevista) REGEXP '07:|08:|09:|10:|11:' OR UPPER(a.hora_entrevista) REGEXP 'AM' THEN 'manana'
-            WHEN UPPER(a.hora_entrevista) REGEXP '12:|01:|02:|03:|04:|05:' OR UPPER(a.hora_entrevista) REGEXP 'PM' THEN 'tarde'
+            WHEN a.hora_entrevista IS NULL OR TRIM(a.hora_entrevista) IN ('', '-') THEN 'sin_hora'
+            WHEN UPPER(a.hora_entrevista) REGEXP '-' THEN 'multiple'
+            WHEN UPPER(a.hora_entrevista) REGEXP '07:|08:|09:|10:|11:|AM' THEN 'manana'
+            WHEN UPPER(a.hora_entrevista) REGEXP '12:|01:|02:|03:|04:|05:|PM' THEN 'tarde'
             ELSE 'sin_hora'
         END AS franja_hora_entrevista,
-        
-        -- CATEGORIZACIÓN: DOCUMENTACIÓN
+
+        -- CATEGORIZACIÓN: CATEGORIA_DOCUMENTACION (reglas v5.1)
         CASE
-            WHEN a.documentacion_requerida = '-' OR a.documentacion_requerida IS NULL OR TRIM(a.documentacion_requerida) = '' THEN 'sin_especificar'
+            WHEN a.documentacion_requerida IS NULL OR TRIM(a.documentacion_requerida) IN ('', '-') THEN 'sin_especificar'
             WHEN UPPER(a.documentacion_requerida) REGEXP 'ANTECEDENTES|ADRES|LIBRETA|CERTIFICADO.*PENSION|CURSO' THEN 'completa'
             WHEN UPPER(a.documentacion_requerida) REGEXP 'HOJA.*VIDA.*CEDULA.*CERTIFICADO|SOPORTE' THEN 'media'
             WHEN UPPER(a.documentacion_requerida) REGEXP 'HOJA.*VIDA|CEDULA|DOCUMENTO' THEN 'basica'
             ELSE 'otros'
         END AS categoria_documentacion,
+        -- <<< reglas_categorizacion
         
         -- FEATURES DE INFORME
         i.Tipo_contacto,
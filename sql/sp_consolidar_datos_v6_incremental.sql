@@ -0,0 +1,469 @@
+-- =====================================================
+-- STORED PROCEDURE: CONSOLIDAR DATOS PARA MODELO (INCREMENTAL)
+-- Versión: 6.0
+-- Autor: Juan David Ramírez
+-- CAMBIOS respecto a v5:
+-- - Solo procesa las asignaciones/informes modificados desde la última
+--   ejecución (marca en tb_control_consolidacion) y reemplaza las filas de
+--   esas claves en una transacción: la tabla nunca queda a medio llenar
+-- - JOIN por la columna generada e indexada a.codigo_unico_vacante en
+--   lugar de CONCAT(a.no_documento, a.codigo_vacante) (no usaba índices)
+-- - La reconstrucción completa llena una tabla sombra y la intercambia con
+--   RENAME TABLE (atómico) en lugar de TRUNCATE + INSERT
+-- - Mismos filtros y columnas que v5 (vista vw_consolidado_modelo_conversion)
+-- - CASE de categorización generados desde config/reglas_categorizacion.json,
+--   entre las marcas '>>> reglas_categorizacion' y '<<< reglas_categorizacion':
+--   no editar a mano. python scripts/categorizacion.py --actualizar-sql los
+--   regenera y --verificar-sql (o tests/test_reglas_sql.py) falla si difieren
+--
+-- Uso:
+--   CALL sp_consolidar_datos_modelo_conversion_incremental(0);  -- diario
+--   CALL sp_consolidar_datos_modelo_conversion_incremental(1);  -- reconstrucción completa
+-- La primera ejecución (sin marca) siempre reconstruye. Las filas borradas
+-- en las tablas fuente solo se reflejan al reconstruir
+-- =====================================================
+
+USE bbdd_cos_bog_colsubsidio_agencia_empleo;
+
+-- =====================================================
+-- 1. PREPARACIÓN (una vez; se puede re-ejecutar)
+-- =====================================================
+-- - a.codigo_unico_vacante: columna generada persistida (STORED) con la
+--   misma collation que i.Codigo_unico_vacante, e indexada
+-- - fecha_actualizacion en ambas tablas fuente (la mantiene MySQL con ON
+--   UPDATE CURRENT_TIMESTAMP). Los procesos que cargan estas tablas deben
+--   usar INSERT con lista de columnas
+
+DROP PROCEDURE IF EXISTS tmp_agregar_columna;
+DROP PROCEDURE IF EXISTS tmp_crear_indice;
+
+DELIMITER $$
+
+CREATE PROCEDURE tmp_agregar_columna(IN p_tabla VARCHAR(64), IN p_columna VARCHAR(64), IN p_definicion VARCHAR(500))
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.COLUMNS
+         WHERE TABLE_SCHEMA = DATABASE()
+           AND TABLE_NAME = p_tabla
+           AND COLUMN_NAME = p_columna
+    ) THEN
+        SET @ddl = CONCAT('ALTER TABLE ', p_tabla, ' ADD COLUMN ', p_columna, ' ', p_definicion);
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+CREATE PROCEDURE tmp_crear_indice(IN p_tabla VARCHAR(64), IN p_indice VARCHAR(64), IN p_columnas VARCHAR(255))
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.STATISTICS
+         WHERE TABLE_SCHEMA = DATABASE()
+           AND TABLE_NAME = p_tabla
+           AND INDEX_NAME = p_indice
+    ) THEN
+        SET @ddl = CONCAT('CREATE INDEX ', p_indice, ' ON ', p_tabla, ' (', p_columnas, ')');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+SELECT CONCAT('VARCHAR(100) CHARACTER SET ', CHARACTER_SET_NAME, ' COLLATE ', COLLATION_NAME,
+              ' AS (CONCAT(no_documento, codigo_vacante)) STORED')
+  INTO @definicion_codigo
+  FROM information_schema.COLUMNS
+ WHERE TABLE_SCHEMA = DATABASE()
+   AND TABLE_NAME = 'tb_informe_intermediacion'
+   AND COLUMN_NAME = 'Codigo_unico_vacante';
+
+CALL tmp_agregar_columna('tb_asignacion_intermediacion_v2', 'codigo_unico_vacante', @definicion_codigo);
+CALL tmp_agregar_columna('tb_asignacion_intermediacion_v2', 'fecha_actualizacion',
+                         'TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP');
+CALL tmp_agregar_columna('tb_informe_intermediacion', 'fecha_actualizacion',
+                         'TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP');
+
+CALL tmp_crear_indice('tb_asignacion_intermediacion_v2', 'idx_asig_v2_codigo_unico_vacante', 'codigo_unico_vacante');
+CALL tmp_crear_indice('tb_asignacion_intermediacion_v2', 'idx_asig_v2_fecha_actualizacion', 'fecha_actualizacion');
+CALL tmp_crear_indice('tb_informe_intermediacion', 'idx_informe_codigo_unico_vacante', 'Codigo_unico_vacante');
+CALL tmp_crear_indice('tb_informe_intermediacion', 'idx_informe_fecha_actualizacion', 'fecha_actualizacion');
+CALL tmp_crear_indice('tb_modelo_conversion_intermediacion', 'idx_modelo_codigo_unico_vacante', 'codigo_unico_vacante');
+
+DROP PROCEDURE tmp_agregar_columna;
+DROP PROCEDURE tmp_crear_indice;
+
+CREATE TABLE IF NOT EXISTS tb_control_consolidacion (
+    proceso VARCHAR(64) NOT NULL PRIMARY KEY,
+    marca DATETIME NOT NULL,
+    modo VARCHAR(20) NOT NULL,
+    filas INT NOT NULL,
+    segundos DECIMAL(10, 2) NOT NULL,
+    fecha_ejecucion DATETIME NOT NULL
+);
+
+-- =====================================================
+-- 2. VISTA: FILAS CONSOLIDADAS (filtros y columnas de v5)
+-- =====================================================
+-- Sin agregaciones: MySQL la fusiona con el query que la usa, así el JOIN
+-- por claves modificadas llega hasta el índice de a.codigo_unico_vacante
+
+CREATE OR REPLACE ALGORITHM = MERGE VIEW vw_consolidado_modelo_conversion AS
+    SELECT 
+        a.no_documento,
+        a.codigo_unico_vacante,
+        a.tipo_de_gestion,
+        a.numero_de_vacantes AS numero_de_vacantes_original,
+        a.cargo AS cargo_original,
+        a.empresa AS empresa_original,
+        a.requisito_profesional AS requisito_profesional_original,
+        a.persona_contacto_empresa,
+        a.hora_entrevista AS hora_entrevista_original,
+        a.fecha_asignacion,
+        a.documentacion_requerida AS documentacion_requerida_original,
+        
+        -- CATEGORIZACIÓN: RANGO DE VACANTES
+        CASE
+            WHEN a.numero_de_vacantes < 100 THEN '1-100'
+            WHEN a.numero_de_vacantes < 200 THEN '100-200'
+            WHEN a.numero_de_vacantes < 300 THEN '200-300'
+            WHEN a.numero_de_vacantes >= 300 THEN '300+'
+            ELSE 'sin_informacion'
+        END AS rango_vacantes,
+        
+        -- TIENE CONTACTO EMPRESA
+        CASE 
+            WHEN a.persona_contacto_empresa IS NOT NULL 
+                 AND TRIM(a.persona_contacto_empresa) != '' 
+                 AND a.persona_contacto_empresa != '-' 
+            THEN 1 
+            ELSE 0 
+        END AS tiene_contacto_empresa,
+        
+        -- >>> reglas_categorizacion: generado con python scripts/categorizacion.py --actualizar-sql
+        -- CATEGORIZACIÓN: CATEGORIA_CARGO (reglas v5.1)
+        CASE
+            WHEN UPPER(a.cargo) REGEXP 'LIMPIEZA|ASEO|SERVICIOS GENERALES|DESINFECCION' THEN 'limpieza_aseo'
+            WHEN UPPER(a.cargo) REGEXP 'SEGURIDAD|VIGILANTE|GUARDA' THEN 'seguridad'
+            WHEN UPPER(a.cargo) REGEXP 'BODEGA|LOGISTIC|ALMACEN' THEN 'bodega_logistica'
+            WHEN UPPER(a.cargo) REGEXP 'PRODUCCION|OPERARIO|EMPAQUE|MANUFACTUR' THEN 'produccion'
+            WHEN UPPER(a.cargo) REGEXP 'COMERCIAL|VENTAS|ASESOR.*COMERCIAL|EJECUTIVO.*VENTAS|IMPULSA' THEN 'ventas_comercial'
+            WHEN UPPER(a.cargo) REGEXP 'CALL CENTER|CONTACT CENTER|TELEMARKETING' THEN 'call_center'
+            WHEN UPPER(a.cargo) REGEXP 'COCINA|COCINERO|MESERO|PANADERO' THEN 'cocina_alimentos'
+            WHEN UPPER(a.cargo) REGEXP 'CONDUCTOR|MOTORIZADO|DOMICILIARIO|TRANSPORTA' THEN 'conductor_transporte'
+            WHEN UPPER(a.cargo) REGEXP 'TECNICO|ELECTRICISTA|MECANICO|MANTENIMIENTO' THEN 'tecnico'
+            WHEN UPPER(a.cargo) REGEXP 'MEDICO|ODONTOLOGO|ENFERMERA|TERAPEUTA|OPTOMETRA' THEN 'profesional_salud'
+            WHEN UPPER(a.cargo) REGEXP 'AUXILIAR' AND NOT UPPER(a.cargo) REGEXP 'BODEGA|LOGISTIC|PRODUCCION|LIMPIEZA' THEN 'auxiliar_general'
+            WHEN UPPER(a.cargo) REGEXP 'CAJERO' THEN 'cajero'
+            WHEN UPPER(a.cargo) REGEXP 'ARCHIVO|DIGITACION' THEN 'archivo_digitacion'
+            ELSE 'otros'
+        END AS categoria_cargo,
+
+        -- CATEGORIZACIÓN: CATEGORIA_EMPRESA (reglas v5.1)
+        CASE
+            WHEN UPPER(a.empresa) REGEXP 'CASALIMPIA|ASEOS|PROLIMZA|ECOLIMPIEZA|LOGISTICA Y LIMPIEZA|NASE|EXPERIENZA|ASER ASEO|CASA LIMPIA|ADMIASEO' THEN 'limpieza'
+            WHEN UPPER(a.empresa) REGEXP 'SECURITAS|VISE|SEGURIDAD NACIONAL|LIBERTADORA|PROSEGUR|COLVISEG|HONOR|TRANSBANK' THEN 'seguridad'
+            WHEN UPPER(a.empresa) REGEXP 'MANPOWER|ADECCO|PRODUCTIVIDAD EMPRESARIAL|TEMPORAL|SOLUCIONES LABORALES|GOLD RH|FLEXITEMP|GESTION TEMPORAL|ACTIVOS|MULTIEMPLEOS|COMPLEMENTOS HUMANOS|ELITE|GRUPO SOLUCIONES|INTEGRITY|SOLUCIONES INMEDIATAS|QUICK HELP|JOB AND TALENT|JOBANDTALENT' THEN 'servicios_temporales'
+            WHEN UPPER(a.empresa) REGEXP 'D1|ARA|JERONIMO MARTINS|ALKOSTO|EXITO|GRUPO EXITO|MINISO' THEN 'retail'
+            WHEN UPPER(a.empresa) REGEXP 'ATENTO|DICO|TELEPERFORMANCE|ATECH BPO|IMAGE QUALITY|BRM|MANEJO TECNICO' THEN 'bpo_callcenter'
+            WHEN UPPER(a.empresa) REGEXP 'HERMECO|OFFCORSS|AJOVER|DARNEL|CASA LUKER|PERMODA|KOAJ|MODANOVA|MANUFACTURAS ELIOT' THEN 'manufactura_textil'
+            WHEN UPPER(a.empresa) REGEXP 'LADRILLERA|PROTELA|FORTOX|COLOMBIANA DE PINTURAS|FERROALUMINIOS|FLEXO SPRING|ESTIBAS' THEN 'manufactura_industrial'
+            WHEN UPPER(a.empresa) REGEXP 'FRISBY|HORNITOS|LISTOS|QUALA|GOYURT|TABASCO|GATE GOURMET|GATEGOURMET' THEN 'alimentos'
+            WHEN UPPER(a.empresa) REGEXP 'CONSORCIO EXPRESS|GMOVIL|DITRANSA|COTRANSCOPETROL|ANAVA TRANSPORT|DISTRIBUCIONES AXA|MEGALINEA' THEN 'transporte_logistica'
+            WHEN UPPER(a.empresa) REGEXP 'EMERMEDICA|KERALTY|AGM SALUD|GLOBAL LIFE' THEN 'salud'
+            WHEN UPPER(a.empresa) REGEXP 'RECUPERAR|RECAUDO|CONSULTORA.*CARTERA' THEN 'cobranza'
+            WHEN UPPER(a.empresa) REGEXP 'CONSTRUCTORA|CONSTRUELECTRICOS|CONSTRUCCION Y MANTENIMIENTO' THEN 'construccion'
+            WHEN UPPER(a.empresa) REGEXP 'THOMAS GREG|TAESCOL|OPTICENTRO|SERDAN|RECORDAR|PREVISION EXEQUIAL|FUMIGACION|QUALITY CARWASH|SIMONIZ' THEN 'servicios_especializados'
+            WHEN UPPER(a.empresa) REGEXP 'INVERSIONES EL CARNAL|VENTAS Y SERVICIOS|CALZATODO|KARROMANIA' THEN 'ventas_comercial'
+            WHEN UPPER(a.empresa) REGEXP 'COLSUBSIDIO' THEN 'colsubsidio'
+            WHEN UPPER(a.empresa) REGEXP 'AGROPECUARIA|FLORICULTOR|AVICOLA' THEN 'agropecuaria'
+            ELSE 'otras'
+        END AS categoria_empresa,
+
+        -- CATEGORIZACIÓN: CATEGORIA_REQUISITO (reglas v5.1)
+        CASE
+            WHEN a.requisito_profesional IS NULL OR TRIM(a.requisito_profesional) IN ('', '-') THEN 'sin_especificar'
+            WHEN UPPER(a.requisito_profesional) REGEXP 'PROFESIONAL|LICENCIATURA|MEDICO|ODONTOLOGO|ARQUITECTO|INGENIERO' THEN 'profesional'
+            WHEN UPPER(a.requisito_profesional) REGEXP 'TECNOLOGO' THEN 'tecnologo'
+            WHEN UPPER(a.requisito_profesional) REGEXP 'TECNICO|CURSO.*VIGILANCIA|RETHUS' THEN 'tecnico'
+            WHEN UPPER(a.requisito_profesional) REGEXP 'BACHILLER' THEN 'bachiller'
+            WHEN UPPER(a.requisito_profesional) REGEXP 'PRIMARIA|LECTO|NOVENO|9' THEN 'basica'
+            WHEN UPPER(a.requisito_profesional) REGEXP 'NO APLICA|SIN EXPERIENCIA' THEN 'sin_requisito'
+            ELSE 'otros'
+        END AS categoria_requisito,
+
+        -- CATEGORIZACIÓN: FRANJA_HORA_ENTREVISTA (reglas v5.1)
+        CASE
+            WHEN a.hora_entrevista IS NULL OR TRIM(a.hora_entrevista) IN ('', '-') THEN 'sin_hora'
+            WHEN UPPER(a.hora_entrevista) REGEXP '-' THEN 'multiple'
+            WHEN UPPER(a.hora_entrevista) REGEXP '07:|08:|09:|10:|11:|AM' THEN 'manana'
+            WHEN UPPER(a.hora_entrevista) REGEXP '12:|01:|02:|03:|04:|05:|PM' THEN 'tarde'
+            ELSE 'sin_hora'
+        END AS franja_hora_entrevista,
+
+        -- CATEGORIZACIÓN: CATEGORIA_DOCUMENTACION (reglas v5.1)
+        CASE
+            WHEN a.documentacion_requerida IS NULL OR TRIM(a.documentacion_requerida) IN ('', '-') THEN 'sin_especificar'
+            WHEN UPPER(a.documentacion_requerida) REGEXP 'ANTECEDENTES|ADRES|LIBRETA|CERTIFICADO.*PENSION|CURSO' THEN 'completa'
+            WHEN UPPER(a.documentacion_requerida) REGEXP 'HOJA.*VIDA.*CEDULA.*CERTIFICADO|SOPORTE' THEN 'media'
+            WHEN UPPER(a.documentacion_requerida) REGEXP 'HOJA.*VIDA|CEDULA|DOCUMENTO' THEN 'basica'
+            ELSE 'otros'
+        END AS categoria_documentacion,
+        -- <<< reglas_categorizacion
+        
+        -- FEATURES DE INFORME
+        i.Tipo_contacto,
+        i.Homologacion_tipificacion,
+        i.Contacto,
+        i.Gestionado,
+        i.Sin_gestion,
+        i.No_contacto,
+        i.Efectividad,
+        i.intentos,
+        i.duracion_llamada,
+        i.Fuente,
+        
+        -- VARIABLE OBJETIVO
+        i.Conversion AS conversion
+        
+    FROM 
+        bbdd_cos_bog_colsubsidio_agencia_empleo.tb_asignacion_intermediacion_v2 a
+    INNER JOIN 
+        bbdd_cos_bog_colsubsidio_agencia_empleo.tb_informe_intermediacion i
+        ON a.codigo_unico_vacante = i.Codigo_unico_vacante
+    WHERE 
+        a.fecha_asignacion >= '2025-09-01'  -- ✅ DESDE SEPTIEMBRE (datos completos)
+        AND i.nombre_base <> 'BASES ESPECIALES'  -- ✅ EXCLUIR BASES ESPECIALES
+        AND i.Conversion IS NOT NULL  
+        AND i.razon_no_apto IS NULL;
+
+-- =====================================================
+-- 3. PROCEDIMIENTO
+-- =====================================================
+
+DROP PROCEDURE IF EXISTS sp_consolidar_datos_modelo_conversion_incremental;
+
+DELIMITER $$
+
+CREATE PROCEDURE sp_consolidar_datos_modelo_conversion_incremental(IN p_reconstruir TINYINT)
+BEGIN
+    DECLARE v_desde DATETIME;
+    DECLARE v_inicio DATETIME DEFAULT NOW();
+    DECLARE v_inicio_reloj DATETIME(6) DEFAULT NOW(6);
+    DECLARE v_modo VARCHAR(20);
+    DECLARE v_filas INT DEFAULT 0;
+    
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DROP TEMPORARY TABLE IF EXISTS tmp_claves_modificadas;
+        DROP TABLE IF EXISTS tb_modelo_conversion_intermediacion_nueva;
+        RESIGNAL;
+    END;
+    
+    -- Marca de la última ejecución: lo modificado desde entonces se vuelve a procesar
+    SET v_desde = (SELECT marca FROM tb_control_consolidacion WHERE proceso = 'modelo_conversion');
+    
+    IF p_reconstruir = 1 OR v_desde IS NULL THEN
+        
+        -- RECONSTRUCCIÓN: tabla sombra + intercambio atómico
+        SET v_modo = 'completo';
+        DROP TABLE IF EXISTS tb_modelo_conversion_intermediacion_nueva;
+        DROP TABLE IF EXISTS tb_modelo_conversion_intermediacion_anterior;
+        CREATE TABLE tb_modelo_conversion_intermediacion_nueva LIKE tb_modelo_conversion_intermediacion;
+        
+        INSERT INTO tb_modelo_conversion_intermediacion_nueva (
+            no_documento,
+            codigo_unico_vacante,
+            tipo_de_gestion,
+            numero_de_vacantes_original,
+            cargo_original,
+            empresa_original,
+            requisito_profesional_original,
+            persona_contacto_empresa,
+            hora_entrevista_original,
+            fecha_asignacion,
+            documentacion_requerida_original,
+            rango_vacantes,
+            categoria_cargo,
+            categoria_empresa,
+            categoria_requisito,
+            tiene_contacto_empresa,
+            franja_hora_entrevista,
+            categoria_documentacion,
+            Tipo_contacto,
+            Homologacion_tipificacion,
+            Contacto,
+            Gestionado,
+            Sin_gestion,
+            No_contacto,
+            Efectividad,
+            intentos,
+            duracion_llamada,
+            Fuente,
+            conversion
+        )
+        SELECT 
+            no_documento,
+            codigo_unico_vacante,
+            tipo_de_gestion,
+            numero_de_vacantes_original,
+            cargo_original,
+            empresa_original,
+            requisito_profesional_original,
+            persona_contacto_empresa,
+            hora_entrevista_original,
+            fecha_asignacion,
+            documentacion_requerida_original,
+            rango_vacantes,
+            categoria_cargo,
+            categoria_empresa,
+            categoria_requisito,
+            tiene_contacto_empresa,
+            franja_hora_entrevista,
+            categoria_documentacion,
+            Tipo_contacto,
+            Homologacion_tipificacion,
+            Contacto,
+            Gestionado,
+            Sin_gestion,
+            No_contacto,
+            Efectividad,
+            intentos,
+            duracion_llamada,
+            Fuente,
+            conversion
+        FROM vw_consolidado_modelo_conversion;
+        SET v_filas = ROW_COUNT();
+        
+        RENAME TABLE tb_modelo_conversion_intermediacion TO tb_modelo_conversion_intermediacion_anterior,
+                     tb_modelo_conversion_intermediacion_nueva TO tb_modelo_conversion_intermediacion;
+        DROP TABLE tb_modelo_conversion_intermediacion_anterior;
+        
+    ELSE
+        
+        -- INCREMENTAL: claves con asignación o informe modificado desde la marca
+        SET v_modo = 'incremental';
+        DROP TEMPORARY TABLE IF EXISTS tmp_claves_modificadas;
+        CREATE TEMPORARY TABLE tmp_claves_modificadas (PRIMARY KEY (codigo_unico_vacante))
+            SELECT a.codigo_unico_vacante
+            FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_asignacion_intermediacion_v2 a
+            WHERE a.fecha_actualizacion >= v_desde
+                AND a.codigo_unico_vacante IS NOT NULL
+            UNION
+            SELECT i.Codigo_unico_vacante
+            FROM bbdd_cos_bog_colsubsidio_agencia_empleo.tb_informe_intermediacion i
+            WHERE i.fecha_actualizacion >= v_desde
+                AND i.Codigo_unico_vacante IS NOT NULL;
+        
+        -- Upsert por clave: las filas de cada clave modificada se reemplazan
+        -- (si ya no cumple los filtros, solo se borra). Una sola transacción
+        START TRANSACTION;
+        
+        DELETE t
+        FROM tb_modelo_conversion_intermediacion t
+        INNER JOIN tmp_claves_modificadas k
+            ON t.codigo_unico_vacante = k.codigo_unico_vacante;
+        
+        INSERT INTO tb_modelo_conversion_intermediacion (
+            no_documento,
+            codigo_unico_vacante,
+            tipo_de_gestion,
+            numero_de_vacantes_original,
+            cargo_original,
+            empresa_original,
+            requisito_profesional_original,
+            persona_contacto_empresa,
+            hora_entrevista_original,
+            fecha_asignacion,
+            documentacion_requerida_original,
+            rango_vacantes,
+            categoria_cargo,
+            categoria_empresa,
+            categoria_requisito,
+            tiene_contacto_empresa,
+            franja_hora_entrevista,
+            categoria_documentacion,
+            Tipo_contacto,
+            Homologacion_tipificacion,
+            Contacto,
+            Gestionado,
+            Sin_gestion,
+            No_contacto,
+            Efectividad,
+            intentos,
+            duracion_llamada,
+            Fuente,
+            conversion
+        )
+        SELECT 
+            v.no_documento,
+            v.codigo_unico_vacante,
+            v.tipo_de_gestion,
+            v.numero_de_vacantes_original,
+            v.cargo_original,
+            v.empresa_original,
+            v.requisito_profesional_original,
+            v.persona_contacto_empresa,
+            v.hora_entrevista_original,
+            v.fecha_asignacion,
+            v.documentacion_requerida_original,
+            v.rango_vacantes,
+            v.categoria_cargo,
+            v.categoria_empresa,
+            v.categoria_requisito,
+            v.tiene_contacto_empresa,
+            v.franja_hora_entrevista,
+            v.categoria_documentacion,
+            v.Tipo_contacto,
+            v.Homologacion_tipificacion,
+            v.Contacto,
+            v.Gestionado,
+            v.Sin_gestion,
+            v.No_contacto,
+            v.Efectividad,
+            v.intentos,
+            v.duracion_llamada,
+            v.Fuente,
+            v.conversion
+        FROM tmp_claves_modificadas k
+        INNER JOIN vw_consolidado_modelo_conversion v
+            ON v.codigo_unico_vacante = k.codigo_unico_vacante;
+        SET v_filas = ROW_COUNT();
+        
+        COMMIT;
+        DROP TEMPORARY TABLE tmp_claves_modificadas;
+        
+    END IF;
+    
+    -- La nueva marca es el inicio de esta ejecución (lo modificado durante
+    -- la ejecución se vuelve a procesar en la siguiente)
+    INSERT INTO tb_control_consolidacion (proceso, marca, modo, filas, segundos, fecha_ejecucion)
+    VALUES ('modelo_conversion', v_inicio, v_modo, v_filas,
+            TIMESTAMPDIFF(MICROSECOND, v_inicio_reloj, NOW(6)) / 1000000, NOW())
+    ON DUPLICATE KEY UPDATE
+        marca = VALUES(marca),
+        modo = VALUES(modo),
+        filas = VALUES(filas),
+        segundos = VALUES(segundos),
+        fecha_ejecucion = VALUES(fecha_ejecucion);
+    
+    -- Mostrar resumen
+    SELECT 
+        v_modo AS modo,
+        v_desde AS modificados_desde,
+        v_filas AS registros_insertados,
+        COUNT(*) AS total_registros,
+        SUM(conversion) AS total_conversiones,
+        ROUND(AVG(conversion) * 100, 2) AS tasa_conversion_porcentaje
+    FROM tb_modelo_conversion_intermediacion;
+    
+END$$
+
+DELIMITER ;
+
+-- =====================================================
+-- EJECUCIÓN
+-- =====================================================
+-- CALL sp_consolidar_datos_modelo_conversion_incremental(0);
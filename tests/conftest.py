@@ -0,0 +1,39 @@
+"""
+Fixtures de las pruebas: corren sin base de datos, sobre asignaciones
+sintéticas (benchmarks/datos_sinteticos.py)
+"""
+
+import os
+import sys
+import pytest
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+sys.path[:0] = [os.path.join(RAIZ, 'scripts'), os.path.join(RAIZ, 'benchmarks')]
+
+from datos_sinteticos import generar_asignaciones_coalesce
+from esquema import columnas_requeridas, compactar_tipos
+from artefacto_modelo import cargar_modelo_scoring
+from pipeline_features import crear_pipeline
+
+FILAS = 20_000
+
+
+@pytest.fixture(scope='session')
+def asignaciones():
+    """Asignaciones crudas con los tipos compactos de la carga (no modificar: usar .copy())"""
+    return compactar_tipos(generar_asignaciones_coalesce(FILAS, semilla=7)[columnas_requeridas()])
+
+
+@pytest.fixture(scope='session')
+def features(asignaciones):
+    """Asignaciones con las features del modelo (no modificar: usar .copy())"""
+    return crear_pipeline().transform(asignaciones.copy())
+
+
+@pytest.fixture(scope='session')
+def modelo():
+    """(modelo, columnas) del bundle de scoring; se omite la prueba si no hay modelo entrenado"""
+    modelo, columnas = cargar_modelo_scoring(diferido=False)
+    if modelo is None:
+        pytest.skip('sin modelo entrenado en models/')
+    return modelo, columnas
@@ -0,0 +1,53 @@
+"""Backfill en particiones y procesos contra puntuar todo el mes de una vez"""
+
+import os
+
+import numpy as np
+import pytest
+
+from datos_sinteticos import generar_asignaciones_coalesce
+from esquema import columnas_requeridas, compactar_tipos
+from inferencia import InferenciaTabla
+from pipeline_features import crear_pipeline
+from prediccion_diaria import preprocesar_datos, generar_predicciones
+from analisis_parquet import leer_consolidado
+from backfill_scoring import particiones_fecha, ejecutar_backfill
+
+COLUMNAS = ['fecha_asignacion', 'codigo_unico_vacante', 'probabilidad_conversion', 'score_priorizacion']
+
+
+def ordenar(df):
+    return df.sort_values(COLUMNAS[:3], kind='stable', ignore_index=True)
+
+
+@pytest.fixture(scope='module')
+def entrada(tmp_path_factory):
+    """Un mes de asignaciones crudas en un Parquet ordenado por fecha (como --entrada)"""
+    df = generar_asignaciones_coalesce(6000, semilla=11, fecha_ejecucion='2026-01-31')[columnas_requeridas()]
+    df = df.sort_values('fecha_asignacion', kind='stable', ignore_index=True)
+    ruta = os.path.join(tmp_path_factory.mktemp('backfill'), 'enero.parquet')
+    df.to_parquet(ruta, index=False, row_group_size=1000)
+    return ruta, df
+
+
+@pytest.mark.parametrize('procesos', [1, 2])
+def test_particiones_iguales_a_una_pasada(entrada, modelo, procesos, tmp_path):
+    ruta_entrada, df = entrada
+    modelo, columnas = modelo
+    referencia = generar_predicciones(preprocesar_datos(compactar_tipos(df.copy()), crear_pipeline(), verbose=False),
+                                      InferenciaTabla(modelo, columnas), columnas, verbose=False)
+    referencia = ordenar(referencia[COLUMNAS])
+
+    particiones = particiones_fecha('2026-01-01', '2026-02-01', dias=7)
+    ruta = str(tmp_path / 'dataset')
+    resumen = ejecutar_backfill(particiones, modelo, columnas, entrada=ruta_entrada, max_workers=procesos,
+                                ruta_parquet=ruta, fecha='2026-02-01')
+    resultado = ordenar(leer_consolidado(ruta=ruta, columnas=COLUMNAS[:3] + ['score_priorizacion']))
+
+    assert not resumen['errores']
+    assert resumen['procesos'] == procesos
+    assert resumen['filas'] == len(df) == len(resultado)
+    assert resultado['codigo_unico_vacante'].tolist() == referencia['codigo_unico_vacante'].tolist()
+    np.testing.assert_array_equal(resultado['probabilidad_conversion'].to_numpy(),
+                                  referencia['probabilidad_conversion'].to_numpy())
+    assert resultado['score_priorizacion'].astype(str).tolist() == referencia['score_priorizacion'].astype(str).tolist()
@@ -0,0 +1,80 @@
+"""Categorización de Python contra los CASE de los SP (categorizacion.RUTAS_SQL_GENERADO)"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from categorizacion import RUTAS_SQL_GENERADO, MARCA_INICIO_SQL, MARCA_FIN_SQL, cargar_reglas
+
+LITERAL = r"'((?:[^'\\]|''|\\.)*)'"
+# Casos borde además de los valores de las asignaciones sintéticas
+EXTRA = [None, '', '-', '  -  ', 'Auxiliar de aseo', 'ingeniero de sistemas', "O'BRIEN & CIA"]
+
+
+def _literal(texto):
+    return re.sub(r"''|\\(.)", lambda m: m.group(1) or "'", texto)
+
+
+def condiciones_sp(ruta):
+    """{feature: [(tipo, patron, exclusion, categoria)]} leídos del bloque generado del SP"""
+    with open(ruta, encoding='utf-8') as f:
+        contenido = f.read()
+    bloque = contenido[contenido.index(MARCA_INICIO_SQL):contenido.index(MARCA_FIN_SQL)]
+    features = {}
+    for cuerpo, feature in re.findall(r'CASE\n(.*?)\n\s*END AS (\w+)', bloque, re.S):
+        condiciones = []
+        for linea in cuerpo.strip().splitlines():
+            linea = linea.strip()
+            if m := re.fullmatch(rf"WHEN \S+ IS NULL OR TRIM\(\S+\) IN \('', '-'\) THEN {LITERAL}", linea):
+                condiciones.append(('vacio', None, None, _literal(m[1])))
+            elif m := re.fullmatch(rf"WHEN \S+ IS NULL THEN {LITERAL}", linea):
+                condiciones.append(('nulo', None, None, _literal(m[1])))
+            elif m := re.fullmatch(rf"WHEN UPPER\(\S+\) REGEXP {LITERAL}"
+                                   rf"(?: AND NOT UPPER\(\S+\) REGEXP {LITERAL})? THEN {LITERAL}", linea):
+                condiciones.append(('regexp', _literal(m[1]), m[2] and _literal(m[2]), _literal(m[3])))
+            elif m := re.fullmatch(rf"ELSE {LITERAL}", linea):
+                condiciones.append(('else', None, None, _literal(m[1])))
+            else:
+                raise AssertionError(f'línea del SP no reconocida: {linea}')
+        features[feature] = condiciones
+    return features
+
+
+def evaluar_case(condiciones, valor):
+    """Lo que devuelve MySQL para `valor`: primer WHEN verdadero (UPPER(NULL) REGEXP ... es NULL)"""
+    nulo = valor is None or (isinstance(valor, float) and np.isnan(valor))
+    for tipo, patron, exclusion, categoria in condiciones:
+        if tipo == 'vacio' and (nulo or valor.strip(' ') in ('', '-')):
+            return categoria
+        if tipo == 'nulo' and nulo:
+            return categoria
+        if tipo == 'regexp' and not nulo and re.search(patron, valor.upper()) and not (
+                exclusion and re.search(exclusion, valor.upper())):
+            return categoria
+        if tipo == 'else':
+            return categoria
+
+
+@pytest.mark.parametrize('ruta', RUTAS_SQL_GENERADO)
+@pytest.mark.parametrize('feature', list(cargar_reglas().categorizadores))
+def test_misma_categoria_que_el_sp(feature, ruta, asignaciones):
+    reglas = cargar_reglas()
+    condiciones = condiciones_sp(ruta)[feature]
+    valores = pd.Series(list(asignaciones[reglas.columnas[feature]].astype(object).unique()) + EXTRA, dtype=object)
+    valores = valores.where(valores.notna(), None)
+
+    python = reglas[feature].categorizar(valores)
+    sp = [evaluar_case(condiciones, v) for v in valores]
+
+    diferentes = [(v, p, s) for v, p, s in zip(valores, python, sp) if p != s]
+    assert not diferentes, diferentes[:10]
+
+
+def test_categorizar_vectorizado_igual_a_regla_por_regla(asignaciones):
+    reglas = cargar_reglas()
+    for feature, categorizador in reglas.categorizadores.items():
+        serie = asignaciones[reglas.columnas[feature]]
+        esperado = serie.astype(object).map(categorizador.categorizar_valor)
+        assert categorizador.categorizar(serie).astype(object).tolist() == esperado.tolist(), feature
@@ -0,0 +1,42 @@
+"""CodificadorOneHot contra el preprocesamiento original con pd.get_dummies"""
+
+import numpy as np
+import pandas as pd
+
+from codificador import CodificadorOneHot
+from esquema import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+
+def features_texto(df):
+    """Features como las usaba el notebook: categóricas como texto, no category"""
+    df = df[CATEGORICAL_FEATURES + NUMERIC_FEATURES].copy()
+    for col in CATEGORICAL_FEATURES:
+        df[col] = df[col].astype(object).where(df[col].notna(), None)
+    return df
+
+
+def test_columnas_entrenamiento_iguales_a_get_dummies_drop_first(features):
+    # Entrenamiento original: get_dummies(drop_first=True) define las columnas del modelo
+    referencia = pd.get_dummies(features_texto(features), columns=CATEGORICAL_FEATURES, drop_first=True)
+    columnas_modelo = list(referencia.columns)
+
+    codificador = CodificadorOneHot(columnas_modelo)
+    X = codificador.transformar_df(features)
+
+    assert list(X.columns) == columnas_modelo
+    np.testing.assert_array_equal(X.to_numpy(), referencia.to_numpy(dtype=np.float32))
+
+
+def test_lote_nuevo_igual_a_get_dummies_con_reindex(features):
+    columnas_modelo = list(pd.get_dummies(features_texto(features), columns=CATEGORICAL_FEATURES,
+                                          drop_first=True).columns)
+    # Lote de scoring sin algunos niveles y con un valor que el modelo no vio
+    lote = features_texto(features.head(500))
+    lote.loc[lote.index[:10], 'tipo_de_gestion'] = 'NO VISTO'
+
+    # Scoring original: get_dummies del lote + columnas faltantes en 0, en el orden del modelo
+    referencia = pd.get_dummies(lote, columns=CATEGORICAL_FEATURES).reindex(columns=columnas_modelo, fill_value=0)
+    X = CodificadorOneHot(columnas_modelo).transformar_df(lote)
+
+    assert list(X.columns) == columnas_modelo
+    np.testing.assert_array_equal(X.to_numpy(), referencia.to_numpy(dtype=np.float32))
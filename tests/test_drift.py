@@ -0,0 +1,61 @@
+"""Monitor de drift: un lote comparado contra el perfil construido con él mismo"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from drift import MonitorDrift, PROBABILIDAD
+from entrenamiento import TARGET, columnas_auxiliares, construir_matriz, construir_perfil, guardar_matriz, split_ventana
+
+# Por debajo de 0.1 es drift "estable"; el mismo lote debería dar prácticamente 0
+PSI_MAXIMO = 1e-6
+
+
+@pytest.fixture(scope='module')
+def matriz(features, tmp_path_factory):
+    """Matriz de entrenamiento en caché armada con el mismo lote (tabla del SP con conversion)"""
+    df = features.copy()
+    df[TARGET] = np.random.default_rng(7).integers(0, 2, len(df))
+    archivo = os.path.join(tmp_path_factory.mktemp('matriz'), 'matriz.npz')
+    X, y, columnas = construir_matriz(df)
+    guardar_matriz(archivo, X, y, columnas, columnas_auxiliares(df))
+    return archivo, X, y, columnas
+
+
+class ModeloFijo:
+    """Probabilidad determinística por fila, para comparar el histograma de probabilidades"""
+
+    def predict_proba(self, X):
+        p = (np.asarray(X, dtype=np.float64) @ np.linspace(0.01, 0.03, X.shape[1])) % 1.0
+        return np.vstack((1.0 - p, p)).T
+
+
+def test_psi_cercano_a_cero_contra_si_mismo(features, matriz):
+    archivo, X, _, columnas = matriz
+    perfil = construir_perfil(archivo, ModeloFijo())
+
+    monitor = MonitorDrift(perfil)
+    monitor.agregar(features)
+    df_drift = monitor.calcular()
+    assert set(df_drift['feature']) == set(monitor.features)
+    assert (df_drift['psi'] < PSI_MAXIMO).all(), df_drift
+    assert (df_drift['nivel'] == 'estable').all()
+
+    # Probabilidades: el perfil guarda las del test
+    _, test = split_ventana(archivo)
+    monitor = MonitorDrift(perfil)
+    monitor.agregar(features.iloc[test], ModeloFijo().predict_proba(pd.DataFrame(X[test], columns=columnas))[:, 1])
+    psi = monitor.calcular().set_index('feature').loc[PROBABILIDAD, 'psi']
+    assert psi < PSI_MAXIMO
+
+
+def test_lote_distinto_se_detecta(features, matriz):
+    archivo = matriz[0]
+    perfil = construir_perfil(archivo, ModeloFijo())
+
+    monitor = MonitorDrift(perfil)
+    monitor.agregar(features[features['tipo_de_gestion'] == features['tipo_de_gestion'].mode()[0]])
+    df_drift = monitor.calcular().set_index('feature')
+    assert df_drift.loc['tipo_de_gestion', 'nivel'] == 'alto'
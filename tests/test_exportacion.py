@@ -0,0 +1,38 @@
+"""ExportadorIncremental: el límite de filas de Excel no corta los CSV"""
+
+import os
+
+import openpyxl
+import pandas as pd
+
+from esquema import COLUMNAS_EXPORTACION
+from exportacion import ExportadorIncremental
+
+
+def lote(n, desde=0):
+    df = pd.DataFrame({c: [f'{c}_{i}' for i in range(desde, desde + n)] for c in COLUMNAS_EXPORTACION})
+    df['probabilidad_conversion'] = 0.5
+    df['score_priorizacion'] = ['Alto' if i % 3 else 'Bajo' for i in range(desde, desde + n)]
+    return df
+
+
+def filas_excel(archivos, nombre):
+    ruta = next(a for a in archivos if a.endswith('.xlsx') and nombre in os.path.basename(a))
+    return sum(1 for _ in openpyxl.load_workbook(ruta, read_only=True).active.iter_rows()) - 1
+
+
+def test_excel_hasta_el_limite_y_csv_completos(tmp_path):
+    exportador = ExportadorIncremental(directorios=(str(tmp_path),) * 3, max_filas_excel=10)
+    exportador.agregar(lote(6))
+    exportador.agregar(lote(12, desde=6))
+    archivos = exportador.cerrar()
+
+    assert filas_excel(archivos, 'Consolidado') == 10
+    assert filas_excel(archivos, 'Score_Alto') == 10
+    assert filas_excel(archivos, 'Score_Bajo') == 6
+    assert exportador.excel_incompletos == [None, 'Alto']
+
+    csv = {score: pd.read_csv(next(a for a in archivos if a.endswith(f'Score_{score}_{exportador.fecha_str}.csv')))
+           for score in ('Alto', 'Bajo')}
+    assert (len(csv['Alto']), len(csv['Bajo'])) == (12, 6)
+    assert exportador.conteos == {'Alto': 12, 'Medio': 0, 'Bajo': 6}
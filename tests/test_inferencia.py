@@ -0,0 +1,31 @@
+"""InferenciaTabla contra predict_proba directo del modelo"""
+
+import numpy as np
+
+from pipeline_features import crear_pipeline
+from inferencia import InferenciaTabla
+
+
+def test_mismas_probabilidades_que_predict_proba(asignaciones, modelo):
+    modelo, columnas = modelo
+    X = crear_pipeline(columnas_modelo=columnas).transform(asignaciones.copy())
+    directo = modelo.predict_proba(X)
+
+    tabla = InferenciaTabla(modelo, columnas)
+    np.testing.assert_array_equal(tabla.predict_proba(X), directo)
+    assert tabla.puntuadas < len(X)
+
+    # Segundo lote: todas las combinaciones ya están en la tabla
+    puntuadas = tabla.puntuadas
+    np.testing.assert_array_equal(tabla.predict_proba(X[::-1]), directo[::-1])
+    assert tabla.puntuadas == puntuadas
+
+
+def test_numericas_fuera_de_rango_van_directo_al_modelo(asignaciones, modelo):
+    modelo, columnas = modelo
+    X = np.array(crear_pipeline(columnas_modelo=columnas).transform(asignaciones.head(100).copy()))
+    X[:10, columnas.index('dia_semana')] = 0.5
+
+    tabla = InferenciaTabla(modelo, columnas)
+    np.testing.assert_array_equal(tabla.predict_proba(X), modelo.predict_proba(X))
+    assert tabla.directas == 10
@@ -0,0 +1,27 @@
+"""Columnas derivadas que el DataFrame ya trae: se recalculan salvo reutilizar_existentes"""
+
+import pandas as pd
+
+from pipeline_features import crear_pipeline
+
+
+def test_recalcula_columnas_existentes_por_defecto(asignaciones, features):
+    df = asignaciones.copy()
+    df['categoria_cargo'] = 'viene_de_afuera'
+    df['mes'] = 0
+
+    resultado = crear_pipeline().transform(df)
+
+    pd.testing.assert_series_equal(resultado['categoria_cargo'], features['categoria_cargo'])
+    pd.testing.assert_series_equal(resultado['mes'], features['mes'])
+
+
+def test_reutilizar_existentes_solo_agrega_las_que_faltan(asignaciones, features):
+    df = asignaciones.copy()
+    df['categoria_cargo'] = 'del_sp'
+
+    resultado = crear_pipeline(reutilizar_existentes=True).transform(df)
+
+    assert (resultado['categoria_cargo'] == 'del_sp').all()
+    pd.testing.assert_series_equal(resultado['categoria_empresa'], features['categoria_empresa'])
+    pd.testing.assert_series_equal(resultado['mes'], features['mes'])
@@ -0,0 +1,23 @@
+"""Los CASE generados de los SP coinciden con config/reglas_categorizacion.json"""
+
+import pytest
+
+from categorizacion import RUTAS_SQL_GENERADO, cargar_reglas, sincronizar_sql
+
+
+@pytest.mark.parametrize('ruta', RUTAS_SQL_GENERADO)
+def test_sp_al_dia_con_las_reglas(ruta):
+    # Si falla: python scripts/categorizacion.py --actualizar-sql
+    assert sincronizar_sql(ruta, cargar_reglas())
+
+
+def test_edicion_a_mano_se_detecta_y_se_regenera(tmp_path):
+    reglas = cargar_reglas()
+    with open(RUTAS_SQL_GENERADO[0], encoding='utf-8') as f:
+        original = f.read()
+    ruta = tmp_path / 'sp.sql'
+    ruta.write_text(original.replace("THEN 'limpieza_aseo'", "THEN 'aseo'", 1), encoding='utf-8')
+
+    assert not sincronizar_sql(ruta, reglas)
+    assert not sincronizar_sql(ruta, reglas, escribir=True)
+    assert ruta.read_text(encoding='utf-8') == original